@@ -3,6 +3,7 @@ import platform
 import os
 import json
 import dataclasses
+import sqlite3
 
 from datetime import datetime
 from time import time
@@ -18,29 +19,39 @@ from PyQt5.QtWidgets import (
   QGridLayout,
   QFrame,
   QTextEdit,
+  QPlainTextEdit,
   QDialog, 
   QHBoxLayout, 
   QSpacerItem, 
   QSizePolicy,
   QCheckBox,
+  QComboBox,
   QStyle
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QEvent
 from PyQt5.QtGui import QFont
-import pyqtgraph as pg
+import numpy as np
 
 from models.NodeInfo import NodeInfo
-from models.NodeHistory import NodeHistory
+from models.NodeHistory import NodeHistory, NodeHistoryBuffer
+from models.DashboardSnapshot import DashboardSnapshot
 from widgets.ToastWidget import ToastWidget, NotificationType
 from utils.const import *
-from utils.docker import _DockerUtilsMixin
+from utils.docker import _DockerUtilsMixin, get_user_folder
 from utils.docker_commands import DockerCommandHandler
+from utils.container_lifecycle import TRANSITION_STATES
+from utils.log_pipeline import LogPipeline
+from utils.refresh_scheduler import RefreshScheduler
+from utils.ssh_pool import ssh_control_pool
+from utils.instrumentation import instrumentation, timer
+from utils.startup import StartupProbeThread, startup_profiler
+from utils.telemetry_archive import TelemetryArchive
 from utils.updater import _UpdaterMixin
 
 from utils.icon import ICON_BASE64
 
 from app_forms.frm_utils import (
-  get_icon_from_base64, DateAxisItem
+  get_icon_from_base64
 )
 
 from ver import __VER__ as __version__
@@ -80,8 +91,16 @@ def log_with_color(message, color="gray"):
 class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
   def __init__(self):
     self.logView = None
-    self.log_buffer = []
+    self.log_pipeline = LogPipeline(
+      max_lines=LOG_VIEW_MAX_LINES,
+      flush_interval=LOG_FLUSH_INTERVAL,
+      max_batch=LOG_FLUSH_MAX_BATCH,
+      log_file=get_user_folder() / LOG_FILE_NAME if LOG_TO_FILE else None,
+      max_file_bytes=LOG_FILE_MAX_BYTES,
+      file_backups=LOG_FILE_BACKUPS,
+    )
     self.__force_debug = False
+    self.__pending_host_check = None  # (host, ssh command) waiting for its status check
     super().__init__()
 
     # Set current environment (you'll need to get this from your configuration)
@@ -96,19 +115,23 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
 
     self._current_stylesheet = DARK_STYLESHEET
     self.__last_plot_data = None
-    self.__last_auto_update_check = 0
+    self.__auto_update_checked = False
+    self.__refresh_started = 0
     
     self.__version__ = __version__
-    self.__last_timesteps = []
+    self.__history_buffer = NodeHistoryBuffer(HISTORY_BUFFER_CAPACITY)
     self._icon = get_icon_from_base64(ICON_BASE64)
     
     self.runs_in_production = self.is_running_in_production()
+    self.telemetry_archive = self.__open_telemetry_archive()
     
-    self.initUI()
+    with startup_profiler.phase('ui'):
+      self.initUI()
 
     self.__cwd = os.getcwd()
     
     self.showMaximized()
+    startup_profiler.mark('window shown')
     self.add_log(f'Edge Node Launcher v{self.__version__} started. Running in production: {self.runs_in_production}, running with debugger: {self.runs_with_debugger()}, running in ipython: {self.runs_from_ipython()},  running from exe: {not self.not_running_from_exe()}')
     self.add_log(f'Running from: {self.__cwd}')
 
@@ -117,26 +140,72 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     self.add_log(f'Platform: {platform_info}')
     self.add_log(f'OS: {os_name} {os_version}')
 
-    if not self.check_docker():
-      sys.exit(1)    
+    self.docker_handler = DockerCommandHandler(
+      DOCKER_CONTAINER_NAME, api_client=self.docker_api,
+      max_workers=DOCKER_COMMAND_WORKERS, max_pending=DOCKER_COMMAND_MAX_PENDING,
+      cache_ttl=DOCKER_COMMAND_CACHE_TTL, container_started_at=lambda: self.container_state.started_at,
+      timeout=DOCKER_EXEC_TIMEOUT,
+    )
+    self.toast = ToastWidget(self)
 
-    self.docker_initialize()
-    self.docker_handler = DockerCommandHandler(DOCKER_CONTAINER_NAME)
+    # every data source is refreshed on its own adaptive interval, started once docker is known to work
+    self.refresh_scheduler = RefreshScheduler(jitter=REFRESH_JITTER, parent=self)
+    # node info and history are read together, in one snapshot round trip
+    self.refresh_scheduler.add_source(
+      'dashboard', self.refresh_all, DASHBOARD_REFRESH_INTERVAL,
+      fast_interval=DASHBOARD_REFRESH_FAST_INTERVAL, max_interval=DASHBOARD_REFRESH_MAX_INTERVAL,
+    )
+    self.refresh_scheduler.add_source(
+      'container_state', self.container_state.resync, CONTAINER_STATE_RESYNC_INTERVAL,
+      fast_interval=CONTAINER_STATE_RESYNC_FAST_INTERVAL,
+    )
+    self.refresh_scheduler.add_source(
+      'update_check', self.auto_check_for_updates, AUTO_UPDATE_CHECK_INTERVAL,
+      first_delay=DASHBOARD_REFRESH_INTERVAL,
+    )
 
-    if self.is_container_running():
-      self.post_launch_setup()
-      self.refresh_local_address()
-      self.plot_data()  # Initial plot
+    # docker and the GPU are probed in the background: the window is usable right away,
+    # the launch button waits for the result
+    self.toggleButton.setEnabled(False)
+    self.toggleButton.setText(LIFECYCLE_BUTTON_TEXT['checking'])
+    self.toggleButton.setStyleSheet("background-color: gray; color: white;")
+    self.startup_probe_thread = StartupProbeThread(self.docker_api, timeout=STARTUP_PROBE_TIMEOUT)
+    self.startup_probe_thread.probes_finished.connect(self._on_startup_probes)
+    self.startup_probe_thread.start()
 
-    self.update_toggle_button_text()
+    # the plots (and pyqtgraph) are loaded after the window is painted
+    QTimer.singleShot(0, self._init_plots)
+    return
 
-    self.timer = QTimer(self)
-    self.timer.timeout.connect(self.refresh_all)
-    self.timer.start(REFRESH_TIME)  # Refresh every 10 seconds
-    self.toast = ToastWidget(self)
+  def _on_startup_probes(self, probes):
+    self.add_log('Checking Docker status...')
+    if not self.show_docker_probe(probes.docker):
+      self.close()
+      QApplication.instance().exit(1)
+      return
+    self.add_log(f'NVIDIA GPU available: {probes.gpu_available} ({probes.gpu_output})')
+    self.docker_initialize(use_gpus=probes.gpu_available)
 
+    # initial info and plots are loaded when the container state service reports the container
+    self.toggleButton.setEnabled(True)
+    self.update_toggle_button_text()
+    self.refresh_scheduler.start()
+
+    startup_profiler.set_ready()
+    self.add_log(startup_profiler.report())
+    startup_profiler.save(get_user_folder() / STARTUP_PROFILE_FILE)
     return
 
+  def __open_telemetry_archive(self):
+    if not TELEMETRY_ARCHIVE:
+      return None
+    path = get_user_folder() / TELEMETRY_ARCHIVE_FILE
+    try:
+      return TelemetryArchive(path, TELEMETRY_RETENTION)
+    except (OSError, sqlite3.Error) as e:
+      self.add_log(f'Telemetry archive disabled, could not open {path}: {e}')
+      return None
+
   @staticmethod
   def not_running_from_exe():
     """
@@ -175,11 +244,8 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     if show:      
       timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
       line = f'{timestamp} {line}'
-      if self.logView is not None:
-        self.logView.append(line)
-      else:
-        self.log_buffer.append(line)
-      QApplication.processEvents()  # Flush the event queue
+      # queued and shown in batches by the log pipeline timer, safe from any thread
+      self.log_pipeline.put(line)
       if debug or self.__force_debug:
         log_with_color(line, color=color)
     return  
@@ -217,8 +283,17 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     self.host_selector = HostSelector()
     self.host_selector.host_selected.connect(self._on_host_selected)
     self.host_selector.mode_changed.connect(self._on_mode_changed)
+    self.host_selector.host_status_changed.connect(self._on_host_status_changed)
     self.host_selector.apply_stylesheet(self._current_stylesheet == DARK_STYLESHEET)  # Set initial theme
     menu_layout.addWidget(self.host_selector)
+
+    # Fleet dashboard, only meaningful with multiple hosts
+    self.fleet_dashboard = None
+    self.fleet_dashboard_button = QPushButton('Fleet Dashboard')
+    self.fleet_dashboard_button.setToolTip('Monitor the edge nodes of all hosts at once')
+    self.fleet_dashboard_button.clicked.connect(self.open_fleet_dashboard)
+    self.fleet_dashboard_button.setVisible(False)
+    menu_layout.addWidget(self.fleet_dashboard_button)
     
     top_button_area = QVBoxLayout()
 
@@ -350,6 +425,14 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     self.force_debug_checkbox.stateChanged.connect(self.toggle_force_debug)
     bottom_button_area.addWidget(self.force_debug_checkbox)
 
+    # operation timings, shown in debug mode
+    self.performance_panel = None
+    self.performance_button = QPushButton('Performance')
+    self.performance_button.setToolTip('Timings of the Docker, SSH and UI operations')
+    self.performance_button.clicked.connect(self.open_performance_panel)
+    self.performance_button.setVisible(not self.runs_in_production)
+    bottom_button_area.addWidget(self.performance_button)
+
     bottom_button_area.addStretch()
     menu_layout.addLayout(bottom_button_area)
     
@@ -359,35 +442,37 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     self.left_panel = QWidget()
     left_panel_layout = QVBoxLayout()
     
-    # the graph area
+    # plot time range, the long ranges are read from the telemetry archive
+    range_layout = QHBoxLayout()
+    range_layout.addStretch()
+    range_layout.addWidget(QLabel('Time range:'))
+    self.plot_range_combo = QComboBox()
+    for label, span in PLOT_TIME_RANGES.items():
+      self.plot_range_combo.addItem(label, span)
+    self.plot_range_combo.setEnabled(self.telemetry_archive is not None)
+    self.plot_range_combo.currentIndexChanged.connect(lambda _: self.plot_graphs())
+    range_layout.addWidget(self.plot_range_combo)
+    left_panel_layout.addLayout(range_layout)
+
+    # the graph area, its plots are created by _init_plots once the window is shown
     self.graphView = QWidget()
-    graph_layout = QGridLayout()
+    self.graph_layout = QGridLayout()
+    self.cpu_plot = self.memory_plot = self.gpu_plot = self.gpu_memory_plot = None
+    self.cpu_metric_plot = self.memory_metric_plot = self.gpu_metric_plot = self.gpu_memory_metric_plot = None
+    self.metric_plots = []
     
-    self.cpu_plot = pg.PlotWidget() #background='#243447')
-    self.memory_plot = pg.PlotWidget() #background='#243447')
-    self.gpu_plot = pg.PlotWidget() #background='#243447')
-    self.gpu_memory_plot = pg.PlotWidget() #background='#243447')
-    
-    graph_layout.addWidget(self.cpu_plot, 0, 0)
-    graph_layout.addWidget(self.memory_plot, 0, 1)
-    graph_layout.addWidget(self.gpu_plot, 1, 0)
-    graph_layout.addWidget(self.gpu_memory_plot, 1, 1)
-    
-    self.graphView.setLayout(graph_layout)
+    self.graphView.setLayout(self.graph_layout)
     left_panel_layout.addWidget(self.graphView)
     
     # the log scroll text area
-    self.logView = QTextEdit()
+    self.logView = QPlainTextEdit()
     self.logView.setReadOnly(True)
     self.logView.setStyleSheet(self._current_stylesheet)
     self.logView.setFixedHeight(150)
     self.logView.setFont(QFont("Courier New"))
     left_panel_layout.addWidget(self.logView)
-    if self.log_buffer:
-      for line in self.log_buffer:
-        self.logView.append(line)
-      self.log_buffer = []
-    # endif log buffer is populated
+    # lines logged before the view existed are still queued and shown on the first flush
+    self.log_pipeline.attach(self.logView)
     
     self.left_panel.setLayout(left_panel_layout)
     main_layout.addWidget(self.left_panel)
@@ -399,6 +484,34 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     self.set_windows_taskbar_icon()
 
     return
+
+  def _init_plots(self):
+    """Create the plots; pyqtgraph is imported here so it does not delay the first paint."""
+    with startup_profiler.phase('plots'):
+      import pyqtgraph as pg
+      from app_forms.frm_plots import MetricPlot
+
+      self.cpu_plot = pg.PlotWidget() #background='#243447')
+      self.memory_plot = pg.PlotWidget() #background='#243447')
+      self.gpu_plot = pg.PlotWidget() #background='#243447')
+      self.gpu_memory_plot = pg.PlotWidget() #background='#243447')
+      
+      self.graph_layout.addWidget(self.cpu_plot, 0, 0)
+      self.graph_layout.addWidget(self.memory_plot, 0, 1)
+      self.graph_layout.addWidget(self.gpu_plot, 1, 0)
+      self.graph_layout.addWidget(self.gpu_memory_plot, 1, 1)
+
+      # curves and axes are created once and refreshed in place by plot_graphs
+      self.cpu_metric_plot = MetricPlot(self.cpu_plot, 'CPU Load', 'CPU Load', 'cpu')
+      self.memory_metric_plot = MetricPlot(self.memory_plot, 'Memory Load', 'Occupied Memory', 'mem')
+      self.gpu_metric_plot = MetricPlot(self.gpu_plot, 'GPU Load', 'GPU Load', 'gpu')
+      self.gpu_memory_metric_plot = MetricPlot(self.gpu_memory_plot, 'GPU Memory Load', 'Occupied GPU Memory', 'gpu_mem')
+      self.metric_plots = [self.cpu_metric_plot, self.memory_metric_plot, self.gpu_metric_plot, self.gpu_memory_metric_plot]
+    
+    self.apply_stylesheet()
+    # data that arrived before the plots existed
+    self.plot_graphs()
+    return
   
   def toggle_theme(self):
     if self._current_stylesheet == DARK_STYLESHEET:
@@ -424,23 +537,87 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
   def apply_stylesheet(self):
     self.setStyleSheet(self._current_stylesheet)
     self.logView.setStyleSheet(self._current_stylesheet)
-    self.cpu_plot.setBackground(None)  # Reset the background to let the stylesheet take effect
-    self.memory_plot.setBackground(None)
-    self.gpu_plot.setBackground(None)
-    self.gpu_memory_plot.setBackground(None)
+    for metric_plot in self.metric_plots:
+      metric_plot.widget.setBackground(None)  # Reset the background to let the stylesheet take effect
     return
 
   def toggle_container(self):
+    if self.is_lifecycle_busy():
+      return
     if self.is_container_running():
       self.add_log('Edge Node is running, user requested stopping the container...')
       self.stop_container()
     else:
       self.launch_container()
+    return
+
+  def _on_lifecycle_state_changed(self, state):
+    super()._on_lifecycle_state_changed(state)
+    # transitions show up faster when the container state and history are polled often
+    self.refresh_scheduler.set_fast(state in TRANSITION_STATES)
+    if state.value in LIFECYCLE_BUTTON_TEXT:
+      # the button shows the current step until the lifecycle finishes
+      self.toggleButton.setEnabled(False)
+      self.toggleButton.setText(LIFECYCLE_BUTTON_TEXT[state.value])
+      self.toggleButton.setStyleSheet("background-color: gray; color: white;")
+    return
+
+  def _on_lifecycle_finished(self, action, success, message):
+    self.refresh_scheduler.set_fast(False)
+    self.toggleButton.setEnabled(True)
     self.update_toggle_button_text()
+    super()._on_lifecycle_finished(action, success, message)
+    return
+
+  def _on_container_state_changed(self, container_running, status):
+    self.set_container_run_status(container_running, status)
+    if not self.toggleButton.isEnabled():
+      # host checks own the button until they enable it again
+      self.add_log(f'Container state: running={container_running} ({status})', debug=True)
+    else:
+      self._set_toggle_button_state(container_running)
+    if container_running:
+      self.refresh_all()
+    else:
+      self._show_node_not_running()
+    self.maybe_refresh_uptime()
+    return
+
+  def changeEvent(self, event):
+    if event.type() == QEvent.WindowStateChange:
+      if getattr(self, 'refresh_scheduler', None) is not None:
+        # poll less while minimized, overdue sources refresh as soon as the window is back
+        self.refresh_scheduler.set_hidden(self.isMinimized())
+      if not self.isMinimized() and getattr(self, 'metric_plots', None):
+        # plots are not refreshed while minimized, catch up with the latest data
+        self.plot_graphs()
+    super().changeEvent(event)
+    return
+
+  def closeEvent(self, event):
+    self.refresh_scheduler.stop()
+    self.container_state.stop()
+    self.docker_handler.close()
+    self.docker_commands.close()
+    if self.docker_api is not None:
+      self.docker_api.close()
+    self.host_selector.shutdown()
+    if self.fleet_dashboard is not None:
+      self.fleet_dashboard.shutdown()
+    ssh_control_pool.close_all()
+    instrumentation.save(get_user_folder() / INSTRUMENTATION_REPORT_FILE, startup=startup_profiler.to_dict())
+    if self.telemetry_archive is not None:
+      self.telemetry_archive.close()
+    self.log_pipeline.close()
+    super().closeEvent(event)
     return
 
   def update_toggle_button_text(self):
-    if self.is_container_running():
+    self._set_toggle_button_state(self.is_container_running())
+    return
+
+  def _set_toggle_button_state(self, container_running):
+    if container_running:
       self.toggleButton.setText(STOP_CONTAINER_BUTTON_TEXT)
       self.toggleButton.setStyleSheet("background-color: red; color: white;")
     else:
@@ -732,175 +909,121 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     return
 
   
-  def check_data(self, data):
-    result = False
-    if 'timestamps' in data:
-      self.__current_node_epoch = data.pop('epoch', -1)
-      self.__current_node_epoch_avail = data.pop('epoch_avail', -1)
-      self.__current_node_uptime = data.pop('uptime', -1)
-      self.__current_node_ver = data.pop('version', '')
-              
-      start_time = data['timestamps'][0] 
-      end_time = data['timestamps'][-1]
-      current_timestamps = data['timestamps'].copy()
-      if current_timestamps != self.__last_timesteps:
-        self.__last_timesteps = current_timestamps
-        data_size = len(data['timestamps'])
-        if data_size > 0 and data_size > MAX_HISTORY_QUEUE:
-          for key in data:
-            if isinstance(data[key], list):
-              data[key] = data[key][-MAX_HISTORY_QUEUE:]
-        start_time = data['timestamps'][0] 
-        end_time = data['timestamps'][-1]
-        self.add_log('Data loaded & cleaned: {} timestamps from {} to {}'.format(
-          len(data['timestamps']), start_time, end_time), debug=True
-        )
-        result = True
-      else:
-        self.add_log('Data already up-to-date. No new data.', debug=True)
+  def _on_node_history(self, history: NodeHistory) -> int:
+    """Merge the (delta) history and return the number of new samples."""
+    # history may be a delta (only samples newer than the buffer), scalars are always current
+    self.__current_node_epoch = history.current_epoch
+    self.__current_node_epoch_avail = history.current_epoch_avail
+    self.__current_node_uptime = history.uptime
+    self.__current_node_ver = history.version
+
+    new_samples = self.__history_buffer.merge(history)
+    if new_samples > 0 and self.telemetry_archive is not None:
+      self.telemetry_archive.append(history.address, history.alias, *self.__history_buffer.tail(new_samples))
+    if new_samples > 0:
+      self.add_log(f'Data merged: {new_samples} new, {len(self.__history_buffer)} timestamps buffered', debug=True)
+      self.plot_graphs(self.__history_buffer)
     else:
-      self.add_log('No timestamps data found in the file.', debug=True)
-    return result
-
-  def plot_data(self):
-    def on_success(history: NodeHistory) -> None:
-      self.__current_node_epoch = history.current_epoch
-      self.__current_node_epoch_avail = history.current_epoch_avail
-      self.__current_node_uptime = history.uptime
-      self.__current_node_ver = history.version
-
-      if history.timestamps != self.__last_timesteps:
-        self.__last_timesteps = history.timestamps.copy()
-        if len(history.timestamps) > MAX_HISTORY_QUEUE:
-          history.timestamps = history.timestamps[-MAX_HISTORY_QUEUE:]
-          history.cpu_load = history.cpu_load[-MAX_HISTORY_QUEUE:]
-          history.occupied_memory = history.occupied_memory[-MAX_HISTORY_QUEUE:]
-          if history.gpu_load:
-            history.gpu_load = history.gpu_load[-MAX_HISTORY_QUEUE:]
-          if history.gpu_occupied_memory:
-            history.gpu_occupied_memory = history.gpu_occupied_memory[-MAX_HISTORY_QUEUE:]
-
-        self.add_log(f'Data loaded & cleaned: {len(history.timestamps)} timestamps', debug=True)
-        self.plot_graphs(history)
-      else:
-        self.add_log('Data already up-to-date. No new data.', debug=True)
-
-    def on_error(error: str) -> None:
-      self.add_log(f'Error getting history: {error}', debug=True)
-      self.plot_graphs(None)
+      self.add_log('Data already up-to-date. No new data.', debug=True)
+    return new_samples
 
-    self.docker_handler.get_node_history(on_success, on_error)
+  def _on_node_history_error(self, error: str) -> None:
+    self.add_log(f'Error getting history: {error}', debug=True)
+    self.plot_graphs(None)
+    return
 
-  def plot_graphs(self, history: Optional[NodeHistory] = None, limit: int = 100) -> None:
+  @timer()
+  def plot_graphs(self, history: Optional[NodeHistoryBuffer] = None, limit: int = MAX_HISTORY_QUEUE) -> None:
     if history is None:
-      data = self.__last_plot_data
+      history = self.__last_plot_data
     else:
       self.__last_plot_data = history
-
-    timestamps = [
-      datetime.fromisoformat(ts).timestamp()
-      for ts in history.timestamps[-limit:]
-    ] if history else [datetime.now().timestamp()]
+    if not self.metric_plots:
+      return  # not created yet, _init_plots draws the latest data
+
+    series = None
+    resolution = ''
+    if history is not None and len(history) > 0:
+      span = self.plot_range_combo.currentData()
+      stamps_us = history.timestamps.view()
+      if span and stamps_us[0] <= stamps_us[-1] - span * 1_000_000:
+        # the in-memory history covers the range: drawn from it, downsampled to the plot width
+        limit = len(stamps_us) - int(np.searchsorted(stamps_us, stamps_us[-1] - span * 1_000_000))
+      elif span and self.telemetry_archive is not None:
+        # longer ranges are read from the archive, pre-aggregated to at most TELEMETRY_MAX_PLOT_POINTS
+        archived = self.telemetry_archive.query(history.latest.address, span, TELEMETRY_MAX_PLOT_POINTS)
+        if len(archived) > 0:
+          timestamps, series = archived.timestamps, archived.values
+          key = ('archive', span, archived.resolution, id(history), history.version)
+          resolution = f', {archived.label} averages' if archived.resolution else ''
+      if series is None:
+        timestamps = history.epoch_seconds(limit)
+        series = {field: history.window(field, limit) for field in ['cpu_load', 'occupied_memory', 'gpu_load', 'gpu_occupied_memory']}
+        key = (id(history), history.version, limit)
+    else:
+      timestamps = np.array([datetime.now().timestamp()])
+      key = None
 
     start_time = datetime.fromtimestamp(timestamps[0]).strftime('%Y-%m-%d %H:%M:%S')
     end_time = datetime.fromtimestamp(timestamps[-1]).strftime('%Y-%m-%d %H:%M:%S')
+    time_range = f"{start_time} to {end_time}{resolution}"
+    color = 'white' if self._current_stylesheet == DARK_STYLESHEET else 'black'
 
-    def update_plot(plot, timestamps, values, label, color):
-      plot.clear()
-      plot.addLegend()
-      values = [x for x in values if x is not None]
-      if values:
-        values = values[-limit:]
-        plot.plot(timestamps, values, pen=pg.mkPen(color=color, width=2), name=label)
-      else:
-        plot.plot([0], [0], pen=None, symbol='o', symbolBrush=color, name='NO DATA')
-      plot.setLabel('left', text=label, color=color)
-      plot.setLabel('bottom', text='Time', color=color)
-      if timestamps:
-        plot.setLabel('bottom', f"Time ({start_time} to {end_time})", color=color)
-      plot.getAxis('bottom').autoVisible = False
-      plot.getAxis('bottom').enableAutoSIPrefix(False)
+    redrawn = []
+    for metric_plot, field, optional in [
+      (self.cpu_metric_plot, 'cpu_load', False),
+      (self.memory_metric_plot, 'occupied_memory', False),
+      (self.gpu_metric_plot, 'gpu_load', True),
+      (self.gpu_memory_metric_plot, 'gpu_occupied_memory', True),
+    ]:
+      if optional and not (series and np.isfinite(series[field]).any()):
+        # GPU plots are only shown when the node reports GPU data
+        continue
+      values = series[field] if series else None
+      if metric_plot.update(timestamps, values, color, key=key, time_range=time_range):
+        redrawn.append(metric_plot.name)
+
+    self.add_log(f'Plotting data: {len(timestamps)} timestamps with color: {color}, redrawn: {redrawn}')
+    return
 
-    color = 'white' if self._current_stylesheet == DARK_STYLESHEET else 'black'
-    self.add_log(f'Plotting data: {len(timestamps)} timestamps with color: {color}')
-
-    # CPU Load
-    cpu_data = history.cpu_load if history else []
-    cpu_date_axis = DateAxisItem(orientation='bottom')
-    cpu_date_axis.setTimestamps(timestamps, parent="cpu")
-    self.cpu_plot.getAxis('bottom').setTickSpacing(60, 10)
-    self.cpu_plot.getAxis('bottom').setStyle(tickTextOffset=10)
-    self.cpu_plot.setAxisItems({'bottom': cpu_date_axis})
-    self.cpu_plot.setTitle('CPU Load')
-    update_plot(self.cpu_plot, timestamps, cpu_data, 'CPU Load', color)
-
-    # Memory Load
-    mem_data = history.occupied_memory if history else []
-    mem_date_axis = DateAxisItem(orientation='bottom')
-    mem_date_axis.setTimestamps(timestamps, parent="mem")
-    self.memory_plot.getAxis('bottom').setTickSpacing(60, 10)
-    self.memory_plot.getAxis('bottom').setStyle(tickTextOffset=10)
-    self.memory_plot.setAxisItems({'bottom': mem_date_axis})
-    self.memory_plot.setTitle('Memory Load')
-    update_plot(self.memory_plot, timestamps, mem_data, 'Occupied Memory', color)
-
-    # GPU Load if available
-    if history and history.gpu_load:
-      gpu_date_axis = DateAxisItem(orientation='bottom')
-      gpu_date_axis.setTimestamps(timestamps, parent="gpu")
-      self.gpu_plot.getAxis('bottom').setTickSpacing(60, 10)
-      self.gpu_plot.getAxis('bottom').setStyle(tickTextOffset=10)
-      self.gpu_plot.setAxisItems({'bottom': gpu_date_axis})
-      self.gpu_plot.setTitle('GPU Load')
-      update_plot(self.gpu_plot, timestamps, history.gpu_load, 'GPU Load', color)
-
-    # GPU Memory if available
-    if history and history.gpu_occupied_memory:
-      gpumem_date_axis = DateAxisItem(orientation='bottom')
-      gpumem_date_axis.setTimestamps(timestamps, parent="gpu_mem")
-      self.gpu_memory_plot.getAxis('bottom').setTickSpacing(60, 10)
-      self.gpu_memory_plot.getAxis('bottom').setStyle(tickTextOffset=10)
-      self.gpu_memory_plot.setAxisItems({'bottom': gpumem_date_axis})
-      self.gpu_memory_plot.setTitle('GPU Memory Load')
-      update_plot(self.gpu_memory_plot, timestamps, history.gpu_occupied_memory, 'Occupied GPU Memory', color)
-
-  def refresh_local_address(self):
-    if not self.is_container_running():
-        self.addressDisplay.setText('Address: Node not running')
-        self.ethAddressDisplay.setText('ETH Address: Not available')
-        self.nameDisplay.setText('')
-        self.copyAddrButton.hide()
-        self.copyEthButton.hide()
-        return
+  def _show_node_not_running(self):
+    self.addressDisplay.setText('Address: Node not running')
+    self.ethAddressDisplay.setText('ETH Address: Not available')
+    self.nameDisplay.setText('')
+    self.copyAddrButton.hide()
+    self.copyEthButton.hide()
+    return
 
-    def on_success(node_info: NodeInfo) -> None:
-        self.node_name = node_info.alias
-        self.nameDisplay.setText('Name: ' + node_info.alias)
+  def _show_node_info(self, node_info: NodeInfo) -> bool:
+    """Show the node address and alias, return whether they changed."""
+    changed = (node_info.address, node_info.alias) != (self.node_addr, getattr(self, 'node_name', None))
+    self.node_name = node_info.alias
+    self.nameDisplay.setText('Name: ' + node_info.alias)
 
-        if node_info.address != self.node_addr:
-            self.node_addr = node_info.address
-            self.node_eth_address = node_info.eth_address
+    if node_info.address != self.node_addr:
+      self.node_addr = node_info.address
+      self.node_eth_address = node_info.eth_address
 
-            # Format addresses with clear labels and truncated values
-            str_display = f"Address: {node_info.address[:16]}...{node_info.address[-8:]}"
-            self.addressDisplay.setText(str_display)
-            self.copyAddrButton.setVisible(bool(node_info.address))
-            
-            str_eth_display = f"ETH Address: {node_info.eth_address[:16]}...{node_info.eth_address[-8:]}"
-            self.ethAddressDisplay.setText(str_eth_display)
-            self.copyEthButton.setVisible(bool(node_info.eth_address))
-            
-            self.add_log(f'Node info updated: {self.node_addr} : {self.node_name}, ETH: {self.node_eth_address}')
+      # Format addresses with clear labels and truncated values
+      str_display = f"Address: {node_info.address[:16]}...{node_info.address[-8:]}"
+      self.addressDisplay.setText(str_display)
+      self.copyAddrButton.setVisible(bool(node_info.address))
 
-    def on_error(error):
-        self.add_log(f'Error getting node info: {error}', debug=True)
-        self.addressDisplay.setText('Address: Error getting node info')
-        self.ethAddressDisplay.setText('ETH Address: Not available')
-        self.nameDisplay.setText('')
-        self.copyAddrButton.hide()
-        self.copyEthButton.hide()
+      str_eth_display = f"ETH Address: {node_info.eth_address[:16]}...{node_info.eth_address[-8:]}"
+      self.ethAddressDisplay.setText(str_eth_display)
+      self.copyEthButton.setVisible(bool(node_info.eth_address))
 
-    self.docker_handler.get_node_info(on_success, on_error)
+      self.add_log(f'Node info updated: {self.node_addr} : {self.node_name}, ETH: {self.node_eth_address}')
+    return changed
+
+  def _show_node_info_error(self, error: str) -> None:
+    self.add_log(f'Error getting node info: {error}', debug=True)
+    self.addressDisplay.setText('Address: Error getting node info')
+    self.ethAddressDisplay.setText('ETH Address: Not available')
+    self.nameDisplay.setText('')
+    self.copyAddrButton.hide()
+    self.copyEthButton.hide()
+    return
 
 
   def maybe_refresh_uptime(self):
@@ -958,31 +1081,63 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     return
 
   def refresh_all(self):
-    t_t1 = time()
-    self.update_toggle_button_text()
-    t_te = time() - t_t1
     if not self.is_container_running():
       self.add_log('Edge Node is not running. Skipping refresh.')
+      self.refresh_scheduler.report('dashboard', changed=False)
     else:
-      t0 = time()
-      self.refresh_local_address()    
-      t1 = time()
-      self.plot_data()
-      t2 = time()
-      #
-      t3 = time()
-      self.maybe_refresh_uptime()
-      t4 = time()
-      self.add_log(
-        f'{t1 - t0:.2f}s (refresh_local_address), {t2 - t1:.2f}s (plot_data), {t_te:.2f}s (update_toggle_button_text), {t4 - t3:.2f}s (maybe_refresh_uptime)',
-        debug=True
+      self.__refresh_started = time()
+      self.docker_handler.get_dashboard_snapshot(
+        self._on_dashboard_snapshot, self._on_dashboard_snapshot_error,
+        history_since=self.__history_buffer.last_timestamp
       )
     #endif container is running
-    if (time() - self.__last_auto_update_check) > AUTO_UPDATE_CHECK_INTERVAL:
-      verbose = self.__last_auto_update_check == 0
-      self.__last_auto_update_check = time()
-      self.check_for_updates(verbose=verbose or FULL_DEBUG)
-    return    
+    return
+
+  def auto_check_for_updates(self):
+    verbose = not self.__auto_update_checked
+    self.__auto_update_checked = True
+    self.check_for_updates(verbose=verbose or FULL_DEBUG)
+    return
+
+  def _on_dashboard_snapshot(self, snapshot: DashboardSnapshot) -> None:
+    """Fan out a single container/info/history snapshot to the UI."""
+    t_snapshot = time() - self.__refresh_started
+    instrumentation.record('EdgeNodeLauncher.refresh_all', t_snapshot)
+    if snapshot.timeout_error is not None:
+      self.add_log(f'Dashboard refresh timed out: {snapshot.timeout_error}', debug=True)
+      self.refresh_scheduler.report('dashboard', changed=False)
+      return
+    if not snapshot.is_running:
+      self.add_log('Edge Node stopped while refreshing. Skipping refresh.')
+      self.refresh_scheduler.report('dashboard', changed=False)
+      return
+
+    changed = False
+    t0 = time()
+    if snapshot.node_info is not None:
+      changed = self._show_node_info(snapshot.node_info)
+    else:
+      self._show_node_info_error(snapshot.node_info_error)
+    t1 = time()
+    if snapshot.node_history is not None:
+      changed = self._on_node_history(snapshot.node_history) > 0 or changed
+    else:
+      self._on_node_history_error(snapshot.node_history_error)
+    t2 = time()
+    # one source for both: polls back off only while neither the info nor the history changes
+    self.refresh_scheduler.report('dashboard', changed=changed)
+    self.maybe_refresh_uptime()
+    t3 = time()
+    self.add_log(
+      f'{t_snapshot:.2f}s (dashboard snapshot), {t1 - t0:.2f}s (node info), {t2 - t1:.2f}s (plot_data), {t3 - t2:.2f}s (maybe_refresh_uptime)',
+      debug=True
+    )
+    return
+
+  def _on_dashboard_snapshot_error(self, error: str) -> None:
+    self.add_log(f'Error refreshing dashboard: {error}', debug=True)
+    self.refresh_scheduler.report('dashboard', changed=False)
+    return
 
 
 
@@ -1011,6 +1166,7 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
   
   def toggle_force_debug(self):
     self.__force_debug = self.force_debug_checkbox.isChecked()
+    self.performance_button.setVisible(self.__force_debug or not self.runs_in_production)
     if self.__force_debug:
       self.add_log('Force Debug enabled.')
     else:
@@ -1096,11 +1252,8 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
         )
         dialog.accept()
         
-        # Stop and restart the container
-        self.stop_container()
-        self.launch_container()
-        self.post_launch_setup()
-        self.refresh_local_address()
+        # Stop and restart the container, info is refreshed once it is running again
+        self.restart_container()
 
     def on_error(error: str) -> None:
         self.add_log(f'Error renaming node: {error}', debug=True)
@@ -1149,19 +1302,11 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
     self.__current_node_epoch_avail = -1
     self.__current_node_ver = -1
     self.__last_plot_data = None
-    self.__last_timesteps = []
+    self.__history_buffer.clear()
     
-    # Clear all graphs
-    self.cpu_plot.clear()
-    self.memory_plot.clear()
-    self.gpu_plot.clear()
-    self.gpu_memory_plot.clear()
-    
-    # Reset graph titles and labels with current theme color
-    for plot in [self.cpu_plot, self.memory_plot, self.gpu_plot, self.gpu_memory_plot]:
-        plot.setTitle('')
-        plot.setLabel('left', '')
-        plot.setLabel('bottom', '')
+    # Clear all graphs, keeping the plot items for the next host
+    for metric_plot in self.metric_plots:
+        metric_plot.reset()
     
     # Update toggle button state and color
     self.toggleButton.setText(LAUNCH_CONTAINER_BUTTON_TEXT)
@@ -1189,31 +1334,21 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
         self.toggleButton.setEnabled(False)
         return
 
-    # Start status check if not already running
-    if not self.host_selector.status_threads.get(host_name) or not self.host_selector.status_threads[host_name].isRunning():
+    # Continue once the status check of this host reports back; a check already in
+    # flight (e.g. from the fleet scan) is awaited instead of started again
+    self.__pending_host_check = (host_name, ssh_command)
+    if not self.host_selector.is_checking(host_name):
         self.host_selector.check_host_status(host_name)
-        
-        # Wait for status check to complete
-        def check_status():
-            is_online = self.host_selector.current_status.property("is_online")
-            
-            if not is_online:
-                self.add_log(f"Host {host_name} is offline")
-                self.toggleButton.setText("Host Offline")
-                self.toggleButton.setStyleSheet("background-color: gray; color: white;")
-                self.toggleButton.setEnabled(False)
-                self.toast.show_notification(NotificationType.ERROR, f"Host {host_name} is offline")
-                return
-            
-            # Only proceed with connection if host is online
-            self._check_host_connection(host_name, ssh_command)
-            
-        # Check status after a delay to allow the check to complete
-        QTimer.singleShot(2000, check_status)
+    return
+
+  def _on_host_status_changed(self, host_name: str, is_online: bool):
+    """Finish the selection of a host once its status check is done."""
+    pending = self.__pending_host_check
+    if pending is None or pending[0] != host_name or self.host_selector.get_current_host() != host_name:
         return
-    
-    # If status check is already running, use current status
-    is_online = self.host_selector.current_status.property("is_online")
+    self.__pending_host_check = None
+    _, ssh_command = pending
+
     if not is_online:
         self.add_log(f"Host {host_name} is offline")
         self.toggleButton.setText("Host Offline")
@@ -1221,7 +1356,7 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
         self.toggleButton.setEnabled(False)
         self.toast.show_notification(NotificationType.ERROR, f"Host {host_name} is offline")
         return
-        
+
     # Only proceed with connection if host is online
     self._check_host_connection(host_name, ssh_command)
 
@@ -1261,12 +1396,8 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
         self.add_log(f"Docker is available on host {host_name}")
         self.toggleButton.setEnabled(True)
         
-        # Refresh container status
-        if self.is_container_running():
-            self.post_launch_setup()
-            self.refresh_local_address()
-            self.plot_data()
-        self.update_toggle_button_text()
+        # Container status, info and plots follow from the container state service
+        # that was reconfigured for this host by set_remote_connection
         
     except Exception as e:
         # Clear any partial connection state
@@ -1280,22 +1411,38 @@ class EdgeNodeLauncher(QWidget, _DockerUtilsMixin, _UpdaterMixin):
         self.toast.show_notification(NotificationType.ERROR, f"Failed to connect to host {host_name}")
         return
 
+  def open_performance_panel(self):
+    if self.performance_panel is None:
+      from widgets.PerformancePanel import PerformancePanel
+      self.performance_panel = PerformancePanel(get_user_folder() / INSTRUMENTATION_REPORT_FILE, parent=self)
+    self.performance_panel.show()
+    self.performance_panel.raise_()
+    return
+
+  def open_fleet_dashboard(self):
+    if self.fleet_dashboard is None:
+      from widgets.FleetDashboard import FleetDashboard
+      self.fleet_dashboard = FleetDashboard(self.host_selector.hosts_manager, self)
+      self.fleet_dashboard.host_activated.connect(self.host_selector.select_host)
+    self.fleet_dashboard.show()
+    self.fleet_dashboard.raise_()
+    return
+
   def _on_mode_changed(self, is_multi_host: bool):
     """Handle mode change."""
     # Clear current display and state
     self._clear_info_display()
+    self.fleet_dashboard_button.setVisible(is_multi_host)
+    if not is_multi_host and self.fleet_dashboard is not None:
+      self.fleet_dashboard.close()
     
     if not is_multi_host:
         self.clear_remote_connection()
         self.docker_handler.clear_remote_connection()  # Clear remote connection for docker_handler
         self.add_log("Switched to local mode")
         self.toggleButton.setEnabled(True)
-        # Refresh container status
-        if self.is_container_running():
-            self.post_launch_setup()
-            self.refresh_local_address()
-            self.plot_data()
-        self.update_toggle_button_text()
+        # Container status, info and plots follow from the container state service
+        # that was reconfigured for the local host by clear_remote_connection
     else:
         self.add_log("Switched to multi-host mode")
         self.toggleButton.setEnabled(False)  # Disable toggle button until a host is selected
@@ -0,0 +1,155 @@
+from datetime import datetime
+
+import numpy as np
+import pyqtgraph as pg
+from pyqtgraph import AxisItem
+
+from models.NodeHistory import iso_to_epoch_us_array
+from utils.downsample import minmax_downsample
+
+
+class DateAxisItem_OLD(AxisItem):
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.setLabel(text='Time')
+    return
+
+  def tickStrings(self, values, scale, spacing):
+    ticks = [datetime.fromtimestamp(value).strftime("%H:%M:%S") for value in values]      
+    return ticks
+
+
+class DateAxisItem(AxisItem):
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.setLabel(text='Time')  # Custom label without scientific notation
+    self.timestamps = None  # Store actual timestamps from the data
+    self.parent = None  # Store the parent widget for debugging
+    return
+
+  def setTimestamps(self, timestamps, parent):
+    """
+    Store the actual timestamps from the data to map axis values.
+
+    Float epoch arrays (e.g. `NodeHistoryBuffer.epoch_seconds`) are kept by
+    reference, so axes sharing the same data do not convert it again.
+    """
+    self.parent = parent
+    if len(timestamps) > 0 and isinstance(timestamps[0], str):
+      self.timestamps = iso_to_epoch_us_array(timestamps) / 1_000_000
+    else:
+      self.timestamps = timestamps
+    return
+
+  def tickStrings(self, values, scale, spacing):
+    if self.timestamps is None or len(self.timestamps) == 0:
+      return [""] * len(values)  # Return empty labels if no timestamps available
+
+    # Get the range of actual timestamps
+    start_time = self.timestamps[0]
+    end_time = self.timestamps[-1]
+    time_range = end_time - start_time
+
+    # Map the axis values to actual timestamps
+    ticks = []
+    for value in values:
+      try:
+        # Scale the value if it's in the range of the timestamp indices
+        if start_time <= value <= end_time:
+          ticks.append(datetime.fromtimestamp(value).strftime("%H:%M:%S"))
+        else:
+          ticks.append("")  # Ignore out-of-range values
+      except Exception as e:
+        ticks.append("")  # Handle exceptions gracefully    
+    # print(f"Ticks for {self.parent}: {ticks}")
+    return ticks
+
+
+class MetricPlot:
+  """
+  Persistent plot of one metric on a pyqtgraph PlotWidget.
+
+  The date axis, legend and curve are created once and later refreshed with
+  `setData`. Refreshes are skipped while the plot is hidden or when neither the
+  data nor the color changed since the last draw. Series longer than the plot
+  is wide are reduced to the min and max of each pixel column, so drawing costs
+  the same whatever the history length and spikes stay visible.
+  """
+  NO_DATA_LABEL = 'NO DATA'
+
+  def __init__(self, plot_widget, title, label, name):
+    self.widget = plot_widget
+    self.title = title
+    self.label = label
+    self.date_axis = DateAxisItem(orientation='bottom')
+    self.date_axis.autoVisible = False
+    self.date_axis.enableAutoSIPrefix(False)
+    self.widget.setAxisItems({'bottom': self.date_axis})
+    self.legend = self.widget.addLegend()
+    self.curve = self.widget.plot([], [], name=label)
+    self.name = name
+    self._color = None
+    self._key = None
+    self._has_data = True
+    return
+
+  def _pixel_width(self):
+    return int(self.widget.getPlotItem().getViewBox().width()) or self.widget.width()
+
+  def _is_shown(self):
+    return self.widget.isVisible() and not self.widget.window().isMinimized()
+
+  def _set_legend(self, has_data):
+    if has_data != self._has_data:
+      self.legend.removeItem(self.curve)
+      self.legend.addItem(self.curve, self.label if has_data else self.NO_DATA_LABEL)
+      self._has_data = has_data
+    return
+
+  def update(self, timestamps, values, color, key=None, time_range=''):
+    """
+    Draw `values` against `timestamps` (float epoch seconds).
+
+    `key` identifies the data (e.g. buffer version); the call is a no-op when the
+    key and color are unchanged. Returns True if the plot was redrawn.
+    """
+    if not self._is_shown():
+      return False
+    if key is not None and key == self._key and color == self._color:
+      return False
+
+    if color != self._color:
+      self.widget.setTitle(self.title)
+      self.widget.setLabel('left', text=self.label, color=color)
+      self._color = color
+
+    if values is not None and np.isfinite(values).any():
+      # gaps (NaN) are left unconnected instead of being dropped out of alignment
+      x, y = minmax_downsample(timestamps, values, self._pixel_width())
+      self.curve.setData(
+        x, y, pen=pg.mkPen(color=color, width=2),
+        symbol=None, connect='finite'
+      )
+      self._set_legend(True)
+    else:
+      self.curve.setData([0], [0], pen=None, symbol='o', symbolBrush=color)
+      self._set_legend(False)
+
+    self.date_axis.setTimestamps(timestamps, parent=self.name)
+    if time_range:
+      self.widget.setLabel('bottom', f"Time ({time_range})", color=color)
+    else:
+      self.widget.setLabel('bottom', text='Time', color=color)
+    self._key = key
+    return True
+
+  def reset(self):
+    """Remove the data and labels, keeping the plot items for the next update."""
+    self.curve.setData([], [])
+    self.date_axis.timestamps = None
+    self.widget.setTitle('')
+    self.widget.setLabel('left', '')
+    self.widget.setLabel('bottom', '')
+    self._color = None
+    self._key = None
+    return
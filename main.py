@@ -1,14 +1,17 @@
 import sys
 import os
+from utils.startup import startup_profiler
 from PyQt5.QtWidgets import QApplication
-from app_forms.frm_main import EdgeNodeLauncher
+
+with startup_profiler.phase('imports'):
+  from app_forms.frm_main import EdgeNodeLauncher
 
 # Set the working directory to the location of the executable
 # os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 if __name__ == '__main__':
   app = QApplication(sys.argv)
-  manager = EdgeNodeLauncher()
-  manager.show()
+  with startup_profiler.phase('window'):
+    manager = EdgeNodeLauncher()
+    manager.show()
   sys.exit(app.exec_())
-
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Dict
 
+from utils.instrumentation import timer
+
 
 @dataclass
 class AllowedAddress:
@@ -26,6 +28,7 @@ class AllowedAddressList:
     addresses: List[AllowedAddress]
 
     @classmethod
+    @timer()
     def from_dict(cls, data: Dict[str, str]) -> 'AllowedAddressList':
         """Convert from API response format {address: alias, ...} to AllowedAddressList"""
         addresses = [
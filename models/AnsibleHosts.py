@@ -1,9 +1,10 @@
 import os
-import yaml
 from dataclasses import dataclass
 from typing import Dict, Optional
 from pathlib import Path
 
+from utils.ssh_pool import ssh_control_pool
+
 @dataclass
 class AnsibleHost:
     name: str
@@ -25,6 +26,7 @@ class AnsibleHostsManager:
         """Load hosts from the Ansible hosts file."""
         try:
             with open(self.hosts_file, 'r') as f:
+                import yaml  # only needed when there is a hosts file
                 config = yaml.safe_load(f)
                 
             if config and 'all' in config and 'children' in config['all']:
@@ -70,4 +72,6 @@ class AnsibleHostsManager:
             
         cmd.extend([f'{host.ansible_user}@{host.ansible_host}'])
         
+        # reuse the host's master connection for every command built from this prefix
+        cmd = ssh_control_pool.apply(cmd)
         return ' '.join(cmd) 
\ No newline at end of file
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Dict, Any
 
+from utils.instrumentation import timer
+
 @dataclass
 class CommunicationInstance:
     RECV_FROM: str = None
@@ -63,6 +65,7 @@ class ConfigApp:
     SERVING_IN_PROCESS: bool
 
     @classmethod
+    @timer()
     def from_dict(cls, data: dict) -> 'ConfigApp':
         # Process COMMUNICATION section
         instances = {
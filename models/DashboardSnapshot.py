@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from models.NodeInfo import NodeInfo
+from models.NodeHistory import NodeHistory
+
+@dataclass
+class DashboardSnapshot:
+    is_running: bool
+    node_info: Optional[NodeInfo] = None
+    node_history: Optional[NodeHistory] = None
+    node_info_error: Optional[str] = None
+    node_history_error: Optional[str] = None
+    # set when the exec session gave no reply in time: the container state is unknown
+    timeout_error: Optional[str] = None
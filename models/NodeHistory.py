@@ -1,5 +1,12 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import warnings
+
+import numpy as np
+
+from utils.instrumentation import timer
 
 @dataclass
 class NodeHistory:
@@ -23,6 +30,7 @@ class NodeHistory:
     version: str
 
     @classmethod
+    @timer()
     def from_dict(cls, data: dict) -> 'NodeHistory':
         # Clean up GPU-related lists - if all values are None, set the whole list to None
         gpu_fields = ['gpu_load', 'gpu_occupied_memory', 'gpu_total_memory', 'gpu_temp']
@@ -49,4 +57,176 @@ class NodeHistory:
             total_memory=data['total_memory'],
             uptime=data['uptime'],
             version=data['version']
-        )
\ No newline at end of file
+        )
+
+
+def iso_to_epoch_us(timestamp: str) -> int:
+    """Convert an ISO timestamp (local time when naive) to epoch microseconds."""
+    return int(round(datetime.fromisoformat(timestamp).timestamp() * 1_000_000))
+
+
+def iso_to_epoch_us_array(timestamps: List[str]) -> np.ndarray:
+    """Vectorized `iso_to_epoch_us` for a list of ISO timestamps.
+
+    NumPy parses naive timestamps as UTC wall time, so the local UTC offset is
+    measured on the first and last samples (input is chronological) and removed
+    in one operation. Input with explicit offsets, or a window crossing a DST
+    change, is converted per sample.
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64)
+    if datetime.fromisoformat(timestamps[0]).tzinfo is None:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                wall_us = np.array(timestamps, dtype='datetime64[us]').astype(np.int64)
+        except (ValueError, DeprecationWarning):
+            wall_us = None
+        if wall_us is not None:
+            first_offset = int(wall_us[0]) - iso_to_epoch_us(timestamps[0])
+            last_offset = int(wall_us[-1]) - iso_to_epoch_us(timestamps[-1])
+            if first_offset == last_offset:
+                return wall_us - first_offset
+    return np.array([iso_to_epoch_us(ts) for ts in timestamps], dtype=np.int64)
+
+
+class MetricRingBuffer:
+    """Fixed-capacity ring buffer with O(1) appends and zero-copy window views.
+
+    Every value is written twice, at `i` and `i + capacity`, so the most recent `n`
+    values are always one contiguous slice of the backing array. Views are read-only
+    and only valid until the next write.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64, fill=np.nan):
+        self.capacity = capacity
+        self._data = np.full(2 * capacity, fill, dtype=dtype)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        self._next = 0
+        self._size = 0
+
+    def append(self, value) -> None:
+        self._data[self._next] = value
+        self._data[self._next + self.capacity] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, values) -> None:
+        values = np.asarray(values, dtype=self._data.dtype)[-self.capacity:]
+        count = len(values)
+        if count == 0:
+            return
+        first = min(count, self.capacity - self._next)
+        self._data[self._next:self._next + first] = values[:first]
+        self._data[self._next + self.capacity:self._next + self.capacity + first] = values[:first]
+        rest = count - first
+        if rest:
+            self._data[:rest] = values[first:]
+            self._data[self.capacity:self.capacity + rest] = values[first:]
+        self._next = (self._next + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """Return the last `n` values (all when None), oldest first, without copying."""
+        size = self._size if n is None else min(n, self._size)
+        end = self._next + self.capacity
+        window = self._data[end - size:end]
+        window.setflags(write=False)
+        return window
+
+
+class NodeHistoryBuffer:
+    """Client-side node history, merged from incremental fetches into ring buffers.
+
+    Timestamps are kept as int64 epoch microseconds and every metric as a float64
+    series (missing values are NaN), so windows can be handed to pyqtgraph as-is.
+    """
+    SERIES_FIELDS = [
+        'cpu_load', 'cpu_temp', 'occupied_memory', 'total_memory',
+        'gpu_load', 'gpu_occupied_memory', 'gpu_temp', 'gpu_total_memory',
+    ]
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = MetricRingBuffer(capacity, dtype=np.int64, fill=0)
+        self.series = {field: MetricRingBuffer(capacity) for field in self.SERIES_FIELDS}
+        self.version = 0
+        self._epoch_cache = (None, None)
+        self.clear()
+
+    def clear(self) -> None:
+        self.latest: Optional[NodeHistory] = None
+        self._last_timestamp: Optional[str] = None
+        self.version += 1
+        self.timestamps.clear()
+        for values in self.series.values():
+            values.clear()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self) -> Optional[str]:
+        """ISO timestamp of the newest sample, as reported by the node."""
+        return self._last_timestamp
+
+    def merge(self, history: NodeHistory) -> int:
+        """Append the samples of `history` newer than the buffer contents.
+
+        Works for both full and incremental (`since`) payloads.
+
+        Returns:
+            Number of new samples
+        """
+        if self.latest is not None and history.address != self.latest.address:
+            self.clear()
+        self.latest = history
+
+        start = 0
+        if self._last_timestamp is not None:
+            start = len(history.timestamps)
+            while start > 0 and history.timestamps[start - 1] > self._last_timestamp:
+                start -= 1
+
+        new_timestamps = history.timestamps[start:]
+        if not new_timestamps:
+            return 0
+        self.timestamps.extend(iso_to_epoch_us_array(new_timestamps))
+        for field, buffer in self.series.items():
+            values = getattr(history, field)
+            if values is None:
+                buffer.extend(np.full(len(new_timestamps), np.nan))
+            else:
+                buffer.extend(np.array(values[start:], dtype=np.float64))
+        self._last_timestamp = new_timestamps[-1]
+        self.version += 1
+        return len(new_timestamps)
+
+    def window(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        """Last `n` values of a metric (NaN where the node reported nothing)."""
+        return self.series[field].view(n)
+
+    def epoch_seconds(self, n: Optional[int] = None) -> np.ndarray:
+        """Last `n` timestamps as float epoch seconds.
+
+        Converted once per buffer update; every plot and axis shares the same
+        read-only array until the next merge.
+        """
+        key = (self.version, n)
+        cached_key, cached = self._epoch_cache
+        if cached_key != key:
+            cached = self.timestamps.view(n) / 1_000_000
+            cached.setflags(write=False)
+            self._epoch_cache = (key, cached)
+        return cached
+
+    def tail(self, n: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Copies of the last `n` timestamps (epoch microseconds) and metric values,
+        safe to hand to another thread."""
+        return self.timestamps.view(n).copy(), {field: self.window(field, n).copy() for field in self.SERIES_FIELDS}
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
+from utils.instrumentation import timer
+
 @dataclass
 class NodeInfo:
     address: str
@@ -11,6 +13,7 @@ class NodeInfo:
     whitelist: List[str]
 
     @classmethod
+    @timer()
     def from_dict(cls, data: dict) -> 'NodeInfo':
         return cls(
             address=data['address'],
@@ -1,6 +1,8 @@
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
+from utils.instrumentation import timer
+
 @dataclass
 class BlockchainConfig:
     PEM_FILE: str
@@ -87,6 +89,7 @@ class StartupConfig:
     CONFIG_RETRIEVE: List[Dict[str, str]]
 
     @classmethod
+    @timer()
     def from_dict(cls, data: dict) -> 'StartupConfig':
         # Filter out keys starting with '#'
         filtered_data = {k: v for k, v in data.items() if not k.startswith('#')}
@@ -0,0 +1,139 @@
+import json
+import os
+import re
+import shutil
+import socketserver
+import struct
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+from itertools import count
+from urllib.parse import parse_qs, urlsplit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ Answers the few Engine API endpoints used by DockerEngineClient """
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        return  # unix socket peers have no address to log
+
+    def _send(self, status: int, body: bytes = b'', content_type: str = 'application/json') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_idle:
+            # close without announcing it, as the daemon does with an idle keep-alive connection
+            self.close_connection = True
+
+    def _send_json(self, status: int, data) -> None:
+        self._send(status, json.dumps(data).encode('utf-8'))
+
+    def _read_json(self):
+        size = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(size)) if size else None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/version':
+            return self._send_json(200, {'Version': 'fake', 'ApiVersion': '1.43'})
+        if url.path == '/events':
+            self.server.event_filters = json.loads(parse_qs(url.query)['filters'][0])
+            return self._send_events()
+        match = re.fullmatch(r'/containers/([^/]+)/json', url.path)
+        if match:
+            name = match.group(1)
+            if name not in self.server.containers:
+                return self._send_json(404, {'message': f'No such container: {name}'})
+            return self._send_json(200, {'Name': f'/{name}', 'State': {'Running': True}})
+        match = re.fullmatch(r'/exec/([^/]+)/json', url.path)
+        if match:
+            return self._send_json(200, {'ExitCode': self.server.execs[match.group(1)]['ExitCode']})
+        self._send_json(404, {'message': 'page not found'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self._read_json()
+        match = re.fullmatch(r'/containers/([^/]+)/(stop|exec)', url.path)
+        if match:
+            name, action = match.groups()
+            if name not in self.server.containers:
+                return self._send_json(404, {'message': f'No such container: {name}'})
+            if action == 'stop':
+                return self._send(304)  # not running: nothing to stop
+            exec_id = f'exec{next(self.server.exec_ids)}'
+            self.server.execs[exec_id] = {'Cmd': body['Cmd'], 'Env': body.get('Env') or [], 'ExitCode': None}
+            return self._send_json(201, {'Id': exec_id})
+        match = re.fullmatch(r'/exec/([^/]+)/start', url.path)
+        if match:
+            return self._start_exec(self.server.execs[match.group(1)])
+        self._send_json(404, {'message': 'page not found'})
+
+    def _start_exec(self, exec_config: dict) -> None:
+        # the "container" is the test machine: run the command and multiplex its output
+        env = dict(os.environ)
+        env.update(entry.split('=', 1) for entry in exec_config['Env'])
+        completed = subprocess.run(exec_config['Cmd'], env=env, capture_output=True)
+        exec_config['ExitCode'] = completed.returncode
+        body = b''.join(
+            struct.pack('>BxxxL', stream_id, len(payload)) + payload
+            for stream_id, payload in ((1, completed.stdout), (2, completed.stderr)) if payload
+        )
+        self._send(200, body, content_type='application/vnd.docker.raw-stream')
+
+    def _send_events(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for event in self.server.events:
+            data = json.dumps(event).encode('utf-8') + b'\n'
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.write(b'0\r\n\r\n')
+        self.close_connection = True
+
+
+class FakeDockerDaemon(socketserver.ThreadingUnixStreamServer):
+    """ In-process stand-in for dockerd, listening on a temporary unix socket.
+
+    Use as a context manager (or `start()` / `stop()`) and point a
+    DockerEngineClient at `socket_path`. `containers` holds the names that
+    exist, `events` what `/events` streams before it ends, and `drop_idle`
+    closes every connection after its response without telling the client,
+    like the daemon does with idle keep-alives.
+    """
+    daemon_threads = True
+
+    def __init__(self, containers=(), events=()):
+        self._directory = tempfile.mkdtemp(prefix='fake-docker-')
+        self.socket_path = os.path.join(self._directory, 'docker.sock')
+        super().__init__(self.socket_path, _Handler)
+        self.containers = set(containers)
+        self.events = list(events)
+        self.event_filters = None
+        self.drop_idle = False
+        self.connections = 0
+        self.execs = {}
+        self.exec_ids = count(1)
+
+    def start(self) -> 'FakeDockerDaemon':
+        threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
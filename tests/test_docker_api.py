@@ -0,0 +1,67 @@
+import socketserver
+import unittest
+
+from utils.docker_api import DockerApiExecSession, DockerEngineClient
+from utils.docker_session import DockerSessionError, DockerSessionTimeout
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    from tests.fake_docker_daemon import FakeDockerDaemon
+
+
+@unittest.skipUnless(hasattr(socketserver, 'ThreadingUnixStreamServer'), 'needs unix sockets')
+class DockerEngineClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = FakeDockerDaemon(
+            containers=['edge_node'],
+            events=[{'status': 'start', 'id': 'abc'}, {'status': 'die', 'id': 'abc'}],
+        ).start()
+        self.addCleanup(self.daemon.stop)
+        self.client = DockerEngineClient(self.daemon.socket_path, timeout=5)
+        self.addCleanup(self.client.close)
+
+    def test_requests_share_one_connection(self):
+        self.assertTrue(self.client.is_available())
+        self.assertEqual(self.client.version()['Version'], 'fake')
+        self.assertEqual(self.client.version()['Version'], 'fake')
+        self.assertEqual(self.daemon.connections, 1)
+
+    def test_reconnects_once_after_idle_drop(self):
+        self.daemon.drop_idle = True
+        self.assertEqual(self.client.version()['Version'], 'fake')
+        self.assertEqual(self.client.version()['Version'], 'fake')
+        self.assertEqual(self.daemon.connections, 2)
+
+    def test_missing_container_is_none(self):
+        self.assertIsNone(self.client.inspect_container('missing'))
+        self.assertEqual(self.client.inspect_container('edge_node')['Name'], '/edge_node')
+
+    def test_stop_of_stopped_container_succeeds(self):
+        self.client.stop_container('edge_node', timeout=1)
+
+    def test_exec_output_is_demultiplexed(self):
+        result = self.client.exec_run('edge_node', ['sh', '-c', 'echo out; echo err >&2; exit 3'])
+        self.assertEqual((result.returncode, result.stdout, result.stderr), (3, 'out\n', 'err\n'))
+
+    def test_session_passes_input_through_env(self):
+        session = DockerApiExecSession('edge_node', self.client)
+        self.assertEqual(session.execute('cat', input_data="it's a\nmulti line $input").stdout, "it's a\nmulti line $input")
+        self.assertEqual(session.execute('echo a && echo b', shell=True).stdout, 'a\nb\n')
+        with self.assertRaises(DockerSessionError):
+            DockerApiExecSession('missing', self.client).execute('true')
+
+    def test_session_reports_hung_exec_as_timeout(self):
+        client = DockerEngineClient(self.daemon.socket_path, timeout=0.2)
+        self.addCleanup(client.close)
+        with self.assertRaises(DockerSessionTimeout):
+            DockerApiExecSession('edge_node', client).execute('sleep 1')
+
+    def test_events_are_read_from_chunked_stream(self):
+        filters = {'container': ['edge_node'], 'type': ['container']}
+        events = list(self.client.events(filters))
+        self.assertEqual([event['status'] for event in events], ['start', 'die'])
+        self.assertEqual(self.daemon.event_filters, filters)
+
+
+if __name__ == '__main__':
+    unittest.main()
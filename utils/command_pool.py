@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .instrumentation import instrumentation
+
+
+@dataclass
+class _Job:
+    name: str
+    func: Callable[[], Any]
+    callback: Callable[[Any], None]
+    error_callback: Callable[[str], None]
+
+
+class CommandPool(QObject):
+    """ Runs blocking commands on a bounded set of worker threads.
+
+    At most `max_workers` commands run at once, the others wait in the queue.
+    Commands submitted as `droppable` (periodic polls whose next tick would fetch
+    the same data) are refused while `max_pending` commands are already waiting or
+    running, so a slow host does not pile up work; neither of their callbacks is
+    called and the refusal is counted as `<name>.refused`. User actions are never
+    dropped.
+
+    Callbacks are called on the thread that owns the pool (the GUI thread). The
+    number of pending commands is reported as the `<name>.pending` gauge.
+    """
+    _job_done = pyqtSignal(object)
+
+    def __init__(self, name: str, max_workers: int = 3, max_pending: int = 6, parent: QObject = None):
+        super().__init__(parent)
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._job_done.connect(self._on_job_done)
+
+    @property
+    def pending(self) -> int:
+        """Commands waiting or running."""
+        return self._pending
+
+    def submit(self, name: str, func: Callable[[], Any], callback: Callable[[Any], None],
+               error_callback: Callable[[str], None], droppable: bool = False) -> bool:
+        """Run `func` on a worker, then `callback(result)` or `error_callback(message)`.
+
+        Returns False when the command was refused (see `droppable`).
+        """
+        with self._lock:
+            if droppable and self._pending >= self.max_pending:
+                refused = True
+            else:
+                refused = False
+                self._pending += 1
+                pending = self._pending
+        if refused:
+            instrumentation.record(f'{self.name}.refused', 0.0, error=True)
+            return False
+        instrumentation.gauge(f'{self.name}.pending', pending)
+        self._executor.submit(self._run, _Job(name, func, callback, error_callback))
+        return True
+
+    def _run(self, job: _Job) -> None:
+        try:
+            self._job_done.emit((job, job.func(), None))
+        except Exception as e:
+            self._job_done.emit((job, None, str(e)))
+
+    def _on_job_done(self, payload) -> None:
+        job, result, error = payload
+        with self._lock:
+            self._pending -= 1
+            pending = self._pending
+        instrumentation.gauge(f'{self.name}.pending', pending)
+        if error is None:
+            job.callback(result)
+        else:
+            job.error_callback(error)
+
+    def shutdown(self) -> None:
+        """Drop the queued commands; the running ones finish without callbacks."""
+        self._job_done.disconnect(self._on_job_done)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -10,6 +10,32 @@ DOCKER_VOLUME = 'naeural_vol'
 DOCKER_IMAGE = 'naeural/edge_node'
 DOCKER_TAG = 'develop'
 DOCKER_CONTAINER_NAME = 'edge_node_container'
+DOCKER_REGISTRY_MIRROR = None # e.g. 'https://mirror.example.com', registry v2 API without auth
+IMAGE_DIGEST_CACHE_FILE = 'image_digests.json' # stored in HOME_SUBFOLDER
+IMAGE_DIGEST_CACHE_TTL = 10 * 60 # seconds a registry digest is trusted before asking again
+IMAGE_DIGEST_PRECHECK = True # check the image digest in the background before launch
+PULL_PROGRESS_INTERVAL = 0.25 # seconds between two pull progress updates
+USE_DOCKER_ENGINE_API = True # talk to the local docker socket instead of spawning the docker CLI
+DOCKER_API_TIMEOUT = 30 # seconds
+DOCKER_COMMAND_WORKERS = 3 # node commands running at once
+DOCKER_COMMAND_MAX_PENDING = 6 # periodic node reads are skipped while this many commands are pending
+DOCKER_EXEC_TIMEOUT = 60 # seconds a node command may take before its docker exec / ssh session is killed
+DOCKER_COMMAND_CACHE_TTL = { # seconds a command result is reused, until the container restarts
+    'get_startup_config': 600,
+    'get_config_app': 600,
+}
+
+# SSH
+SSH_MULTIPLEXING = True # share one master connection per remote host (not available on Windows)
+SSH_CONTROL_PERSIST = 300 # seconds an idle master connection is kept open
+SSH_SERVER_ALIVE_INTERVAL = 10 # seconds, a master on a dead link exits after two missed replies
+SSH_COMMAND_TIMEOUT = 120 # seconds a remote command (service restart, checks) may run before it is killed
+FLEET_SCAN_WORKERS = 16 # max concurrent ssh checks when scanning the hosts
+FLEET_SCAN_TIMEOUT = 3 # seconds per host check
+FLEET_MONITOR_WORKERS = 8 # max concurrent node polls in the fleet dashboard
+FLEET_POLL_INTERVAL = 30 # seconds between polls of the same node
+FLEET_POLL_MAX_INTERVAL = 300 # seconds, polls of unreachable nodes back off up to this
+FLEET_SPARKLINE_POINTS = 60 # history samples kept per node for the dashboard sparklines
 
 # Files names
 E2_PEM_FILE = 'e2.pem'
@@ -29,15 +55,65 @@ COPY_ADDRESS_BUTTON_TEXT = 'Copy Address'
 COPY_ETHEREUM_ADDRESS_BUTTON_TEXT = 'Copy Ethereum Address'
 RENAME_NODE_BUTTON_TEXT = 'Change Node Alias'
 LIGHT_DASHBOARD_BUTTON_TEXT = 'Switch to Light Theme'
+LIFECYCLE_BUTTON_TEXT = { # toggle button text while a launch/stop is in progress
+  'checking': 'Checking Docker...',
+  'pulling': 'Pulling Image...',
+  'cleaning': 'Cleaning Up...',
+  'starting': 'Starting Edge Node...',
+  'stopping': 'Stopping Edge Node...',
+}
 
 UPTIME_LABEL = 'Up Time:'
 EPOCH_LABEL = 'Epoch:'
 EPOCH_AVAIL_LABEL = 'Epochs avail:'
 
-REFRESH_TIME = 20_000
+# Adaptive refresh: each source has its own interval (seconds), backs off up to its
+# max interval while its data is unchanged or the window is minimized and polls at
+# its fast interval during launch / stop / restart
+DASHBOARD_REFRESH_INTERVAL = 20 # node info and history snapshot (address, alias, metrics, uptime, epoch)
+DASHBOARD_REFRESH_FAST_INTERVAL = 5
+DASHBOARD_REFRESH_MAX_INTERVAL = 120
+CONTAINER_STATE_RESYNC_INTERVAL = 60 # the state is pushed by docker events, this only catches missed ones
+CONTAINER_STATE_RESYNC_FAST_INTERVAL = 3
+REFRESH_JITTER = 0.1 # +/- fraction added to every interval
 MAX_HISTORY_QUEUE = 5 * 60 // 10 # 5 minutes @ 10 seconds each hb
+HISTORY_BUFFER_CAPACITY = 6 * 60 * 60 // 10 # 6 hours @ 10 seconds each hb kept in memory
+
+# Telemetry archive: node history kept on disk with 1m / 10m / 1h rollups for the long plot ranges
+TELEMETRY_ARCHIVE = True
+TELEMETRY_ARCHIVE_FILE = 'telemetry.sqlite' # stored in HOME_SUBFOLDER
+TELEMETRY_RETENTION = { # seconds kept per resolution (0 = raw samples)
+  0: 2 * 24 * 60 * 60,
+  60: 7 * 24 * 60 * 60,
+  600: 30 * 24 * 60 * 60,
+  3600: 365 * 24 * 60 * 60,
+}
+TELEMETRY_MAX_PLOT_POINTS = 1500 # long ranges use the finest rollup with at most this many points
+PLOT_TIME_RANGES = { # plot range selector, None for the live in-memory history
+  '5 minutes (live)': None,
+  '1 hour': 60 * 60,
+  '24 hours': 24 * 60 * 60,
+  '7 days': 7 * 24 * 60 * 60,
+}
 
 AUTO_UPDATE_CHECK_INTERVAL = 60
+UPDATE_RELEASE_CACHE_FILE = 'latest_release.json' # stored in HOME_SUBFOLDER, revalidated with its ETag
+UPDATE_CHECK_TIMEOUT = 10 # seconds for the release information request
+UPDATE_CHECK_MAX_BACKOFF = 60 * 60 # seconds, failed checks back off up to this
+UPDATE_DOWNLOAD_TIMEOUT = 30 # seconds without data before a background download is retried
+
+# Log view and log file
+LOG_VIEW_MAX_LINES = 5000 # older lines are dropped from the log view
+LOG_FLUSH_INTERVAL = 200 # ms between log view refreshes
+LOG_FLUSH_MAX_BATCH = 500 # max lines appended per refresh
+LOG_TO_FILE = True
+LOG_FILE_NAME = 'launcher.log' # stored in HOME_SUBFOLDER
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+STARTUP_PROFILE_FILE = 'startup_profile.json' # stored in HOME_SUBFOLDER, timings of the last startup
+STARTUP_PROBE_TIMEOUT = 20 # seconds for each of the docker and GPU checks
+INSTRUMENTATION_REPORT_FILE = 'performance_report.json' # stored in HOME_SUBFOLDER, operation timings written on exit
 
 # Notification messages
 NOTIFICATION_TITLE_STRINGS_ENUM = {
@@ -111,7 +187,7 @@ DARK_STYLESHEET = """
   QDialog, QWidget {
     background-color: #0D1F2D;
   }
-  QTextEdit {
+  QTextEdit, QPlainTextEdit {
     background-color: #0D1F2D;
     color: white;
     font-size: 14px;
@@ -160,7 +236,7 @@ LIGHT_STYLESHEET = """
   QDialog, QWidget {
     background-color: #F0F0F0;
   }
-  QTextEdit {
+  QTextEdit, QPlainTextEdit {
     background-color: #FFFFFF;
     color: black;
     font-size: 14px;
@@ -0,0 +1,271 @@
+import threading
+from time import perf_counter
+from enum import Enum
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .docker_api import DockerAPIError, read_env_file
+from .docker_pull import DockerPullEngine
+from .instrumentation import instrumentation
+from .process_runner import run_process
+
+
+class LifecycleState(Enum):
+    IDLE = "idle"
+    CHECKING = "checking"
+    PULLING = "pulling"
+    CLEANING = "cleaning"
+    STARTING = "starting"
+    RUNNING = "running"
+    STOPPING = "stopping"
+    STOPPED = "stopped"
+    FAILED = "failed"
+
+
+# states in which the container is being changed and new requests are refused
+TRANSITION_STATES = {
+    LifecycleState.CHECKING, LifecycleState.PULLING, LifecycleState.CLEANING,
+    LifecycleState.STARTING, LifecycleState.STOPPING,
+}
+
+
+class LifecycleAction(Enum):
+    LAUNCH = "launch"
+    STOP = "stop"
+    RESTART = "restart"
+
+
+class ContainerLifecycleThread(QThread):
+    """ Runs a launch / stop / restart of the edge node off the GUI thread.
+
+    The work is a small state machine (checking -> pulling + cleaning -> starting ->
+    running, or stopping -> cleaning -> stopped); every transition is reported with
+    `state_changed` and pull output with `pull_progress`. The image pull and the
+    removal of the previous container are independent, so they run in parallel.
+    """
+    state_changed = pyqtSignal(str)  # LifecycleState value
+    pull_progress = pyqtSignal(str, int)  # output line, percent
+    pull_stats = pyqtSignal(object)  # PullStats, throttled
+    log = pyqtSignal(str)
+    lifecycle_finished = pyqtSignal(str, bool, str)  # action, success, message
+
+    COMMAND_TIMEOUT = 180  # seconds allowed for each docker / ssh command (not the pull)
+
+    def __init__(self, action: LifecycleAction, run_command: List[str], clean_command: List[str],
+                 stop_command: List[str], pull_command: Optional[List[str]] = None,
+                 service_manager=None, service_name: str = None, image: str = None,
+                 digest_cache=None, pull_platform: str = None, pull_interval: float = 0.25,
+                 api_client=None, run_spec: dict = None):
+        """
+        Args:
+            action: What to do
+            run_command: `docker run` command line
+            clean_command: `docker rm` command line
+            stop_command: `docker stop` command line
+            pull_command: `docker pull` command line, None to skip the pull
+            service_manager: When given, the node is (re)started as a remote service instead
+            service_name: Name of the remote service
+            image: Image pulled by `pull_command`
+            digest_cache: ImageDigestCache used to skip the pull when the image is current
+            pull_platform: Platform requested when pulling through the Docker Engine API
+            pull_interval: Minimum seconds between two `pull_stats` signals
+            api_client: DockerEngineClient used instead of the docker CLI commands, when given
+            run_spec: `DockerEngineClient.run_container` arguments, with `env_file` instead of `env`
+        """
+        super().__init__()
+        self.action = action
+        self.run_command = run_command
+        self.clean_command = clean_command
+        self.stop_command = stop_command
+        self.pull_command = pull_command
+        self.service_manager = service_manager
+        self.service_name = service_name
+        self.image = image
+        self.digest_cache = digest_cache
+        self.pull_platform = pull_platform
+        self.pull_interval = pull_interval
+        self.api_client = api_client
+        self.run_spec = run_spec
+        self.state = LifecycleState.IDLE
+        self._state_started = None
+
+    def _set_state(self, state: LifecycleState) -> None:
+        # each step is timed from its state change to the next one
+        now = perf_counter()
+        if self._state_started is not None and self.state in TRANSITION_STATES:
+            instrumentation.record(f'lifecycle.{self.action.value}.{self.state.value}', now - self._state_started)
+        self._state_started = now
+        self.state = state
+        self.state_changed.emit(state.value)
+
+    def _run(self, command: List[str]) -> Tuple[int, str]:
+        """Run a command to completion and return (returncode, combined output)."""
+        try:
+            result = run_process(
+                command, timeout=self.COMMAND_TIMEOUT, merge_stderr=True, name='lifecycle.command'
+            )
+            return result.returncode, result.stdout.strip()
+        except FileNotFoundError as e:
+            return 127, str(e)
+        except Exception as e:
+            return -1, str(e)
+
+    @staticmethod
+    def _call(func, *args, **kwargs) -> Tuple[int, str]:
+        """Run an Engine API call with the same (returncode, output) contract as `_run`."""
+        try:
+            result = func(*args, **kwargs)
+            return 0, '' if result is None else str(result)
+        except (DockerAPIError, OSError) as e:
+            return 1, str(e)
+
+    def _run_container(self) -> Tuple[int, str]:
+        if self.api_client is None:
+            return self._run(self.run_command)
+        spec = dict(self.run_spec)
+        try:
+            spec['env'] = read_env_file(spec.pop('env_file'))
+        except OSError as e:
+            return 1, str(e)
+        return self._call(self.api_client.run_container, **spec)
+
+    def _check_docker(self) -> Optional[str]:
+        """Return an error message when docker is unusable, None otherwise."""
+        if self.api_client is not None:
+            try:
+                version = self.api_client.version()
+                self.log.emit("Docker version: {} (Engine API)".format(version.get('Version')))
+                self.log.emit("Docker daemon is running")
+                return None
+            except (DockerAPIError, OSError):
+                self.log.emit('Docker Engine API not reachable, checking with the docker CLI...')
+        returncode, output = self._run(['docker', '--version'])
+        if returncode == 127:
+            return (
+                'Docker is not installed. Please install Docker and restart the application.\n\n'
+                'Click the "Download Docker" button to visit the Docker installation page.'
+            )
+        self.log.emit("Docker version: " + output)
+        returncode, _ = self._run(['docker', 'info'])
+        if returncode != 0:
+            return (
+                'Docker daemon is not running. Please start Docker and try again.\n\n'
+                'If Docker is not installed, click the "Download Docker" button to visit the Docker installation page.'
+            )
+        self.log.emit("Docker daemon is running")
+        return None
+
+    def _remove_container(self) -> Tuple[int, str]:
+        if self.api_client is None:
+            return self._run(self.clean_command)
+        return self._call(self.api_client.remove_container, self.run_spec['name'])
+
+    def _clean(self, results: dict) -> None:
+        results['clean'] = self._remove_container()
+
+    def _pull(self) -> bool:
+        engine = DockerPullEngine(
+            self.pull_command, self.image, platform=self.pull_platform,
+            on_line=self.pull_progress.emit,
+            on_stats=self.pull_stats.emit,
+            on_log=self.log.emit,
+            interval=self.pull_interval,
+            client=self.api_client,
+        )
+        return engine.pull()
+
+    def _is_image_current(self) -> bool:
+        if self.digest_cache is None or not self.image:
+            return False
+        try:
+            up_to_date, reason = self.digest_cache.is_up_to_date(self.image)
+        except Exception as e:
+            up_to_date, reason = False, str(e)
+        self.log.emit(f'Image digest check for {self.image}: {reason}')
+        return up_to_date
+
+    def _launch(self) -> Tuple[bool, str]:
+        if self.service_manager is not None:
+            self._set_state(LifecycleState.STARTING)
+            self.log.emit('Starting Edge Node service on remote host...')
+            success, error = self.service_manager.restart_service(self.service_name)
+            if not success:
+                return False, f'Edge Node service restart failed: {error}'
+            return True, 'Edge Node service restarted successfully.'
+
+        self._set_state(LifecycleState.CHECKING)
+        error = self._check_docker()
+        if error:
+            return False, error
+
+        # remove the previous container while the image is being pulled
+        clean_results = {}
+        clean_thread = threading.Thread(target=self._clean, args=(clean_results,), daemon=True)
+        self._set_state(LifecycleState.CLEANING)
+        self.log.emit("Attempting to clean up the container...")
+        clean_thread.start()
+        if self.pull_command and self._is_image_current():
+            self.log.emit('Image is up to date, skipping docker pull.')
+        elif self.pull_command:
+            self._set_state(LifecycleState.PULLING)
+            self.log.emit('Updating image...')
+            if self._pull():
+                self.log.emit('Docker image pulled successfully.')
+            else:
+                self.log.emit('Failed to pull Docker image, starting with the local image.')
+        clean_thread.join()
+        returncode, output = clean_results.get('clean', (-1, 'cleanup did not run'))
+        if returncode == 0:
+            self.log.emit('Container cleanup status: {}'.format(output))
+        else:
+            self.log.emit('Edge Node container cleanup failed with code={}: {}'.format(returncode, output))
+
+        self._set_state(LifecycleState.STARTING)
+        self.log.emit('Starting Edge Node container...')
+        returncode, output = self._run_container()
+        if returncode != 0:
+            return False, 'Edge Node container start failed with error code={}: {}'.format(returncode, output)
+        self.log.emit('Container start status: {}'.format(output))
+        return True, 'Edge Node container launched successfully.'
+
+    def _stop(self) -> Tuple[bool, str]:
+        self._set_state(LifecycleState.STOPPING)
+        self.log.emit('Stopping Edge Node container...')
+        # `docker stop` returns once the container has exited, no extra wait is needed
+        if self.api_client is None:
+            returncode, output = self._run(self.stop_command)
+        else:
+            returncode, output = self._call(self.api_client.stop_container, self.run_spec['name'])
+        if returncode != 0:
+            return False, f'Edge Node container stop failed: {output}'
+        self.log.emit('Edge Node container stopped successfully.')
+        self._set_state(LifecycleState.CLEANING)
+        self.log.emit('Cleaning Edge Node container...')
+        returncode, _ = self._remove_container()
+        if returncode == 0:
+            self.log.emit('Edge Node container removed.')
+        else:
+            self.log.emit('Edge Node container removal failed probably due to already being removed.')
+        return True, 'Edge Node container stopped successfully.'
+
+    def run(self):
+        start = perf_counter()
+        try:
+            if self.action == LifecycleAction.STOP:
+                success, message = self._stop()
+                final_state = LifecycleState.STOPPED
+            elif self.action == LifecycleAction.RESTART:
+                success, message = self._stop()
+                if success:
+                    success, message = self._launch()
+                final_state = LifecycleState.RUNNING
+            else:
+                success, message = self._launch()
+                final_state = LifecycleState.RUNNING
+        except Exception as e:
+            success, message = False, f'Edge Node {self.action.value} failed with unknown error: {e}'
+        self._set_state(final_state if success else LifecycleState.FAILED)
+        instrumentation.record(f'lifecycle.{self.action.value}', perf_counter() - start, error=not success)
+        self.lifecycle_finished.emit(self.action.value, success, message)
+        return
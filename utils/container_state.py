@@ -0,0 +1,240 @@
+import subprocess
+import threading
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .docker_api import DockerAPIError
+from .process_runner import popen, run_process
+
+
+# `docker events` statuses that change the running state of the container
+RUNNING_EVENTS = {'start', 'restart', 'unpause'}
+STOPPED_EVENTS = {'die', 'stop', 'destroy'}
+# `docker events` statuses after which the container runs a new process
+STARTED_EVENTS = {'start', 'restart'}
+
+INSPECT_FORMAT = '{{.State.Running}} {{.State.StartedAt}}'
+
+
+class ContainerStateService(QThread):
+    """ Keeps the running state of a container in memory.
+
+    The state is read once with `docker inspect` and then kept up to date from a
+    `docker events` stream, so callers on the GUI thread can read `is_running`
+    and `started_at` without spawning a process. `state_changed` is emitted on
+    every transition and once after each (re)configuration, when the first state
+    is known.
+
+    When configured with a DockerEngineClient the same inspect/events are read from
+    the Engine API instead of the docker CLI.
+    """
+    state_changed = pyqtSignal(bool, str)  # is_running, status
+
+    RECONNECT_DELAY = 5  # seconds to wait before reopening a dropped events stream
+    INSPECT_TIMEOUT = 30  # seconds allowed for the inspect run when the stream (re)opens
+    RESYNC_TIMEOUT = 10  # seconds allowed for a background `resync` inspect
+
+    def __init__(self, container_name: str):
+        super().__init__()
+        self.container_name = container_name
+        self.command_prefix: List[str] = []
+        self.api_client = None
+        self._stream = None
+        self._is_running = False
+        self._is_known = False
+        self._started_at = ''
+        self._stop_event = threading.Event()
+        self._process = None
+        self._resync_lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
+    @property
+    def is_known(self) -> bool:
+        return self._is_known
+
+    @property
+    def started_at(self) -> str:
+        """When the running container was started (empty when unknown); changes on every restart."""
+        return self._started_at
+
+    def configure(self, command_prefix: List[str] = None, api_client=None) -> None:
+        """(Re)start watching the container with the given command prefix (sudo/ssh).
+
+        Args:
+            command_prefix: Arguments placed before `docker` (e.g. the ssh command)
+            api_client: DockerEngineClient to use instead of the docker CLI
+        """
+        self.stop()
+        self.command_prefix = list(command_prefix or [])
+        self.api_client = api_client
+        self._is_running = False
+        self._is_known = False
+        self._started_at = ''
+        self._stop_event.clear()
+        self.start()
+
+    def stop(self) -> None:
+        """Stop the events listener and wait for the thread to finish."""
+        self._stop_event.set()
+        self._kill_process()
+        if self.isRunning():
+            self.wait()
+
+    def _kill_process(self) -> None:
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+        stream = self._stream
+        if stream is not None:
+            stream.abort()
+
+    def _set_stream(self, connection) -> None:
+        self._stream = connection
+        if self._stop_event.is_set():
+            connection.abort()
+
+    def _popen(self, command: List[str]) -> subprocess.Popen:
+        return popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True
+        )
+
+    def _inspect_api(self) -> None:
+        try:
+            details = self.api_client.inspect_container(self.container_name)
+            state = (details or {}).get('State') or {}
+            running = bool(state.get('Running'))
+            status = state.get('Status') or 'not found'
+            started_at = state.get('StartedAt') or ''
+        except DockerAPIError as e:
+            running, status, started_at = False, str(e), ''
+        self._update(running, status, started_at)
+
+    def _watch_api(self) -> None:
+        filters = {'container': [self.container_name], 'type': ['container']}
+        try:
+            for event in self.api_client.events(filters, on_connect=self._set_stream):
+                status = event.get('Action') or event.get('status') or ''
+                if status in STARTED_EVENTS:
+                    self._on_started(status)
+                elif status in RUNNING_EVENTS:
+                    self._update(True, status)
+                elif status in STOPPED_EVENTS:
+                    self._update(False, status)
+        except Exception:
+            pass
+        finally:
+            self._stream = None
+
+    def _on_started(self, status: str) -> None:
+        """The container (re)started: read its start time with inspect, in the same format as on (re)connect."""
+        if not self._inspect():
+            self._update(True, status, '')
+
+    def _inspect(self) -> bool:
+        """Read the state with inspect, False when it could not be read in time."""
+        if self.api_client is not None:
+            self._inspect_api()
+            return True
+        command = self.command_prefix + [
+            'docker', 'inspect', '--format', INSPECT_FORMAT, self.container_name
+        ]
+        try:
+            result = run_process(
+                command, timeout=self.INSPECT_TIMEOUT, cancel_event=self._stop_event, name='docker.inspect'
+            )
+            if result.timed_out or result.cancelled:
+                return False  # unknown for now, the next resync reads it again
+            running, status, started_at = self._parse_inspect(result.returncode, result.stdout)
+        except Exception as e:
+            running, status, started_at = False, str(e), ''
+        self._update(running, status, started_at)
+        return True
+
+    @staticmethod
+    def _parse_inspect(returncode: int, output: str) -> Tuple[bool, str, str]:
+        """Running flag, status and start time from the `INSPECT_FORMAT` output."""
+        lines = output.strip().splitlines()
+        status = lines[-1].strip() if lines else ''  # ssh / sudo may print before it
+        flag, _, started_at = status.partition(' ')
+        running = returncode == 0 and flag == 'true'
+        return running, flag or 'not found', started_at if running else ''
+
+    def resync(self) -> None:
+        """Inspect the container again in the background, in case an event was missed."""
+        if not self.isRunning() or self._stop_event.is_set():
+            return
+        if self._resync_lock.acquire(blocking=False):
+            threading.Thread(target=self._resync, daemon=True).start()
+
+    def _resync(self) -> None:
+        try:
+            if self.api_client is not None:
+                self._inspect_api()
+                return
+            command = self.command_prefix + [
+                'docker', 'inspect', '--format', INSPECT_FORMAT, self.container_name
+            ]
+            try:
+                result = run_process(
+                    command, timeout=self.RESYNC_TIMEOUT, cancel_event=self._stop_event, name='docker.inspect'
+                )
+            except OSError:
+                return
+            if result.timed_out or result.cancelled:
+                return  # keep the current state, the events stream is still authoritative
+            self._update(*self._parse_inspect(result.returncode, result.stdout))
+        finally:
+            self._resync_lock.release()
+
+    def _update(self, running: bool, status: str, started_at: Optional[str] = None) -> None:
+        """Store the state, `started_at` None keeps the known start time."""
+        if self._stop_event.is_set():
+            return
+        if started_at is None:
+            started_at = self._started_at if running else ''
+        self._started_at = started_at
+        if running != self._is_running or not self._is_known:
+            self._is_running = running
+            self._is_known = True
+            self.state_changed.emit(running, status)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            # Events only report transitions, so resync with inspect each time the stream (re)opens
+            self._inspect()
+            if self._stop_event.is_set():
+                break
+            if self.api_client is not None:
+                self._watch_api()
+                self._stop_event.wait(self.RECONNECT_DELAY)
+                continue
+            command = self.command_prefix + [
+                'docker', 'events',
+                '--filter', f'container={self.container_name}',
+                '--filter', 'type=container',
+                '--format', '{{.Status}}',
+            ]
+            try:
+                self._process = self._popen(command)
+                if self._stop_event.is_set():
+                    self._kill_process()
+                for line in iter(self._process.stdout.readline, ''):
+                    status = line.strip()
+                    if status in STARTED_EVENTS:
+                        self._on_started(status)
+                    elif status in RUNNING_EVENTS:
+                        self._update(True, status)
+                    elif status in STOPPED_EVENTS:
+                        self._update(False, status)
+                self._process.wait()
+            except Exception:
+                pass
+            self._stop_event.wait(self.RECONNECT_DELAY)
+        return
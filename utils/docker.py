@@ -1,22 +1,26 @@
 import os
 import sys
 import platform
-import subprocess
 import platform
 import base64
 
 from pathlib import Path
 from collections import OrderedDict
-from time import sleep
 from uuid import uuid4
 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (QApplication, QDialog, QInputDialog, QLabel,
                              QMessageBox, QProgressBar, QTextEdit, QVBoxLayout)
 
 from .const import *
 from .docker_commands import DockerCommandHandler
+from .container_state import ContainerStateService
+from .docker_api import DockerEngineClient
+from .image_digest import ImageDigestCache, ImageDigestCheckThread
+from .container_lifecycle import ContainerLifecycleThread, LifecycleAction, LifecycleState, TRANSITION_STATES
 from .ssh_service import SSHService, SSHConfig
+from .instrumentation import timer
+from .startup import probe_docker, probe_nvidia_gpu
 from .service_manager import ServiceManager
 
 def get_user_folder():
@@ -25,83 +29,23 @@ def get_user_folder():
   """
   return Path.home() / HOME_SUBFOLDER
 
-class DockerPullThread(QThread):
-  progress_update = pyqtSignal(str, int)
-  pull_finished = pyqtSignal(bool)
-
-  def __init__(self, docker_pull_command):
-    super().__init__()
-    self.docker_pull_command = docker_pull_command
-    self.total_layers = 0
-    self.pulled_layers = 0    
-    return
-
-
-  def run(self):
-    try:
-      docker_pull_command = self.docker_pull_command    
-      if os.name == 'nt':
-        process = subprocess.Popen(docker_pull_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, creationflags=subprocess.CREATE_NO_WINDOW)
-      else:
-        process = subprocess.Popen(docker_pull_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-
-      for line in iter(process.stdout.readline, ''):
-        self.parse_output(line)
-        self.progress_update.emit(line.strip(), self.calculate_progress())
-      
-      process.stdout.close()
-      process.wait()
-
-      if process.returncode == 0:
-        self.pull_finished.emit(True)
-      else:
-        self.pull_finished.emit(False)
-
-    except subprocess.CalledProcessError:
-      self.pull_finished.emit(False)
-    return
-
-
-  def parse_output(self, line):    
-    DONE = [
-      'Image is up to date',
-      'Pull complete',
-      'Already exists',
-    ]
-    START = [
-      'Already exists',
-      'Pulling fs layer',
-      'Image is up to date',
-    ]
-    for d in DONE:
-      if d in line:
-        self.pulled_layers += 1
-    for s in START:
-      if s in line:
-        self.total_layers += 1
-    return
-
-
-  def calculate_progress(self):
-    if self.total_layers == 0:
-      return 0
-    return int((self.pulled_layers / self.total_layers) * 100)
-  
-
-
 class ProgressBarWindow(QDialog):
   def __init__(self, message, icon_object, sender):
     super().__init__()
     self.sender = sender
     self.setWindowTitle("Progress")
     self.setWindowIcon(icon_object)
-    self.setWindowModality(Qt.ApplicationModal)
+    # non-modal: the launcher stays usable while the image is pulled
+    self.setWindowModality(Qt.NonModal)
     self.setGeometry(300, 300, 600, 400)  # Larger size
     layout = QVBoxLayout()
 
     self.label = QLabel(message)
     layout.addWidget(self.label)
 
+    self.stats_label = QLabel('')
+    layout.addWidget(self.stats_label)
+
     self.output_edit = QTextEdit()
     self.output_edit.setReadOnly(True)
     layout.addWidget(self.output_edit)
@@ -121,25 +65,22 @@ class ProgressBarWindow(QDialog):
   
   
   def update_progress(self, output, progress):
-    self.output_edit.append(output)
-    self.output_edit.verticalScrollBar().setValue(self.output_edit.verticalScrollBar().maximum())
+    if output:
+      self.output_edit.append(output)
+      self.output_edit.verticalScrollBar().setValue(self.output_edit.verticalScrollBar().maximum())
     self.progress_bar.setValue(progress)
 
 
+  def update_stats(self, stats):
+    # throughput and ETA, only available when pulling through the Docker Engine API
+    self.stats_label.setText(stats.describe())
+    self.progress_bar.setValue(stats.percent)
+
+
   def apply_stylesheet(self):
     self.setStyleSheet(self.sender._current_stylesheet)
     return
 
-  
-  def on_docker_pull_finished(self, success):
-    if success:
-      QMessageBox.information(self, 'Docker Pull', 'Docker image pulled successfully.')      
-      self.sender.add_log('Docker image pulled successfully.')
-    else:
-      QMessageBox.warning(self, 'Docker Pull', 'Failed to pull Docker image.\nCheck if Docker is running.')
-    self.accept()  # Close the progress dialog
-    return
-
 
 
 class _DockerUtilsMixin:
@@ -148,8 +89,16 @@ class _DockerUtilsMixin:
     
     self.init_directories()
     
-    self.docker_commands = DockerCommandHandler(DOCKER_CONTAINER_NAME)
-    self.ssh_service = SSHService()
+    self.docker_api = self.__create_docker_api_client()
+    self.docker_commands = DockerCommandHandler(
+      DOCKER_CONTAINER_NAME, api_client=self.docker_api,
+      max_workers=DOCKER_COMMAND_WORKERS, max_pending=DOCKER_COMMAND_MAX_PENDING,
+      cache_ttl=DOCKER_COMMAND_CACHE_TTL, container_started_at=lambda: self.container_state.started_at,
+      timeout=DOCKER_EXEC_TIMEOUT,
+    )
+    self.container_state = ContainerStateService(DOCKER_CONTAINER_NAME)
+    self.container_state.state_changed.connect(self._on_container_state_changed)
+    self.ssh_service = SSHService(command_timeout=SSH_COMMAND_TIMEOUT)
     self.service_manager = ServiceManager(self.ssh_service)
 
     self.node_addr = None
@@ -161,6 +110,15 @@ class _DockerUtilsMixin:
     self._dev_mode = False
     
     self.run_with_sudo = False
+
+    self.lifecycle_thread = None
+    self.image_digests = ImageDigestCache(
+      get_user_folder() / IMAGE_DIGEST_CACHE_FILE, IMAGE_DIGEST_CACHE_TTL, DOCKER_REGISTRY_MIRROR,
+      api_client=self.docker_api,
+    )
+    self.image_check_thread = None
+    self.lifecycle_state = LifecycleState.IDLE
+    self.progress_dialog = None
     
     # Remote connection settings
     self.is_remote = False
@@ -168,6 +126,27 @@ class _DockerUtilsMixin:
     
     return
   
+  def __create_docker_api_client(self):
+    if not USE_DOCKER_ENGINE_API:
+      return None
+    client = DockerEngineClient(timeout=DOCKER_API_TIMEOUT)
+    if not client.is_available():
+      self.add_log(f'Docker Engine API socket not usable ({client.socket_path}), using the docker CLI.')
+      return None
+    self.add_log(f'Using the Docker Engine API on {client.socket_path}')
+    return client
+
+
+  def get_docker_api_client(self):
+    """
+    Returns the Engine API client for the current target, None when the docker CLI
+    must be used (remote host, sudo, Windows or API disabled).
+    """
+    if self.is_remote or self.run_with_sudo:
+      return None
+    return self.docker_api
+
+
   def init_directories(self):
     path = get_user_folder()
     path.mkdir(exist_ok=True)
@@ -181,24 +160,15 @@ class _DockerUtilsMixin:
     self.add_log('Executing post-launch setup...')
     return
   
-  def docker_initialize(self):
-    self._use_gpus = self.check_nvidia_gpu_available()
+  def docker_initialize(self, use_gpus=None):
+    """`use_gpus` comes from the startup probes, GPUs are probed here when it is None."""
+    self._use_gpus = self.check_nvidia_gpu_available() if use_gpus is None else use_gpus
     self.__generate_env_file()
     self.__setup_docker_run()
     return
   
   def check_nvidia_gpu_available(self):
-    result = False
-    try:
-      if os.name == 'nt':
-        output = subprocess.check_output(['nvidia-smi', '-L'], stderr=subprocess.STDOUT, universal_newlines=True, creationflags=subprocess.CREATE_NO_WINDOW)
-      else:
-        output = subprocess.check_output(['nvidia-smi', '-L'], stderr=subprocess.STDOUT, universal_newlines=True)
-      result = 'GPU' in output
-    except Exception as exc:
-      result = False
-      output = str(exc)
-    output = output.replace('\n', '') 
+    result, output = probe_nvidia_gpu()
     self.add_log(f'NVIDIA GPU available: {result} ({output})')
     return result
   
@@ -259,6 +229,31 @@ class _DockerUtilsMixin:
     self.add_log(' - Clean:   {}'.format(" ".join(self.__CMD_CLEAN)))
     self.add_log(' - Stop:    {}'.format(" ".join(self.__CMD_STOP)))
     self.add_log(' - Inspect: {}'.format(" ".join(self.__CMD_INSPECT)))
+
+    # watch the container of the current target (local or remote)
+    state_prefix = []
+    if self.is_remote and self.remote_ssh_command:
+      state_prefix += self.remote_ssh_command
+    if self.run_with_sudo:
+      state_prefix += ['sudo']
+    self.container_state.configure(state_prefix, api_client=self.get_docker_api_client())
+    self.__maybe_precheck_image()
+    return
+
+
+  def __maybe_precheck_image(self):
+    # warm the digest cache so a launch with an unchanged image skips the pull right away
+    if not IMAGE_DIGEST_PRECHECK or self.is_remote:
+      return
+    if self.image_check_thread is not None and self.image_check_thread.isRunning():
+      return
+    self.image_check_thread = ImageDigestCheckThread(self.image_digests, self.docker_image)
+    self.image_check_thread.check_finished.connect(
+      lambda up_to_date, reason: self.add_log(
+        f'Image {self.docker_image} up to date: {up_to_date} ({reason})', debug=True
+      )
+    )
+    self.image_check_thread.start()
     return
   
   
@@ -269,6 +264,18 @@ class _DockerUtilsMixin:
       result = self.__CMD + [self.docker_image]
     return result
   
+  def get_run_spec(self):
+    # same container as get_cmd(), for the Docker Engine API
+    return {
+      'name': self.docker_container_name,
+      'image': self.docker_image,
+      'env_file': str(self.env_file),
+      'binds': [f'{DOCKER_VOLUME}:/edge_node/_local_cache'],
+      'gpus': self._use_gpus,
+      'auto_remove': True,
+      'ports': {'80/tcp': '80'} if self._dev_mode else None,
+    }
+  
   def get_clean_cmd(self):
     return self.__CMD_CLEAN
   
@@ -281,24 +288,20 @@ class _DockerUtilsMixin:
     return self.__CMD_INSPECT
   
   
-  def __maybe_docker_pull(self):
+  def get_pull_platform(self):
     architecture = platform.machine()
-    docker_pull_command = ['docker', 'pull', self.docker_image]
     if architecture == 'aarch64' or architecture == 'arm64':
-      docker_pull_command.insert(2, '--platform')
-      docker_pull_command.insert(3, 'linux/amd64')
+      return 'linux/amd64'
+    return None
 
-    str_docker_pull_command = ' '.join(docker_pull_command)
-    progress_dialog = ProgressBarWindow(f"Pulling Docker Image: '{str_docker_pull_command}'", self._icon, self)
-    self.docker_pull_thread = DockerPullThread(docker_pull_command=docker_pull_command)
-    self.docker_pull_thread.progress_update.connect(progress_dialog.update_progress)
-    self.docker_pull_thread.pull_finished.connect(progress_dialog.on_docker_pull_finished)
-    
-    self.docker_pull_thread.start()
-    
-    self.progress_dialog = progress_dialog
-    self.progress_dialog.exec_()
-    return
+
+  def get_pull_command(self):
+    docker_pull_command = ['docker', 'pull', self.docker_image]
+    pull_platform = self.get_pull_platform()
+    if pull_platform is not None:
+      docker_pull_command.insert(2, '--platform')
+      docker_pull_command.insert(3, pull_platform)
+    return docker_pull_command
   
   
   def get_node_id(self):
@@ -334,178 +337,161 @@ class _DockerUtilsMixin:
 
   def check_docker(self):
     self.add_log('Checking Docker status...')
-    try:
-        # First check if Docker is installed
-        if os.name == 'nt':
-            output = subprocess.check_output(['docker', '--version'], stderr=subprocess.STDOUT, universal_newlines=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        else:
-            output = subprocess.check_output(['docker', '--version'], stderr=subprocess.STDOUT, universal_newlines=True)
-        self.add_log("Docker version: " + output.strip())
-        
-        # Then check if Docker daemon is running
-        if os.name == 'nt':
-            subprocess.check_output(['docker', 'info'], stderr=subprocess.STDOUT, universal_newlines=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        else:
-            subprocess.check_output(['docker', 'info'], stderr=subprocess.STDOUT, universal_newlines=True)
-        
-        self.add_log("Docker daemon is running")
-        return True
-    except FileNotFoundError:
-        QMessageBox.warning(
-            self, 'Docker Check', 
-            'Docker is not installed. Please install Docker and restart the application.\n\n'
-            'Click the "Download Docker" button to visit the Docker installation page.'
-        )
-        return False
-    except subprocess.CalledProcessError:
-        QMessageBox.warning(
-            self, 'Docker Check', 
-            'Docker daemon is not running. Please start Docker and try again.\n\n'
-            'If Docker is not installed, click the "Download Docker" button to visit the Docker installation page.'
-        )
-        return False
+    return self.show_docker_probe(probe_docker(self.docker_api))
+
+
+  def show_docker_probe(self, probe):
+    """Log the outcome of a docker probe, warn the user when docker is unusable."""
+    for line in probe.log:
+      self.add_log(line)
+    if not probe.installed:
+      QMessageBox.warning(
+          self, 'Docker Check', 
+          'Docker is not installed. Please install Docker and restart the application.\n\n'
+          'Click the "Download Docker" button to visit the Docker installation page.'
+      )
+      return False
+    self.add_log("Docker version: " + probe.version + (' (Engine API)' if probe.via_api else ''))
+    if not probe.running:
+      QMessageBox.warning(
+          self, 'Docker Check', 
+          'Docker daemon is not running. Please start Docker and try again.\n\n'
+          'If Docker is not installed, click the "Download Docker" button to visit the Docker installation page.'
+      )
+      return False
+    self.add_log("Docker daemon is running")
+    return True
 
 
   def is_container_running(self):
-    try:
-      inspect_cmd = self.get_inspect_command()
-      if os.name == 'nt':
-        status = subprocess.check_output(inspect_cmd, stderr=subprocess.STDOUT, universal_newlines=True, creationflags=subprocess.CREATE_NO_WINDOW)
-      else:
-        status = subprocess.check_output(inspect_cmd, stderr=subprocess.STDOUT, universal_newlines=True)
-
-      status = status.strip()
-      container_running = status.split()[-1] == 'true'
-      if container_running != self.container_last_run_status:
-        self.add_log('Edge Node container status changed: {} -> {} (status: {})'.format(
-          self.container_last_run_status, container_running, status
-        ))
-        self.container_last_run_status = container_running
-        if container_running:
-          self.post_launch_setup()
-      return container_running
-    except:
-      return False
+    # cached by the container state service, no process is spawned here
+    return self.container_state.is_running
 
 
-  def launch_container(self):
-    # Check Docker status first
-    if not self.check_docker():
-        return
+  def _on_container_state_changed(self, container_running, status):
+    self.set_container_run_status(container_running, status)
+    return
+
+
+  def set_container_run_status(self, container_running, status=''):
+    if container_running != self.container_last_run_status:
+      self.add_log('Edge Node container status changed: {} -> {} (status: {})'.format(
+        self.container_last_run_status, container_running, status
+      ))
+      self.container_last_run_status = container_running
+      if container_running:
+        self.post_launch_setup()
+    return
+
+
+  def is_lifecycle_busy(self):
+    return self.lifecycle_state in TRANSITION_STATES
+
 
-    is_env_ok = self.__check_env_keys()
-    if not is_env_ok:
+  def _start_lifecycle(self, action):
+    """
+    Run a launch / stop / restart in the background. Progress is reported through
+    `_on_lifecycle_state_changed` and the result through `_on_lifecycle_finished`.
+    """
+    if self.lifecycle_thread is not None and self.lifecycle_thread.isRunning():
+      self.add_log(f'Edge Node {action.value} ignored, {self.lifecycle_state.value} is in progress.')
+      return False
+
+    if action != LifecycleAction.STOP:
+      is_env_ok = self.__check_env_keys()
+      if not is_env_ok:
         self.add_log('Environment is not ok. Could not start the container.')
-        return
+        return False
 
-    # If in multi-host mode, use the service command instead
-    if self.is_remote:
-        try:
-            self.add_log('Starting Edge Node service on remote host...')
-            
-            success, error = self.service_manager.restart_service('mnl_execution_engine')
-            
-            if not success:
-                raise Exception(error)
-            
-            self.add_log('Edge Node service restarted successfully.')
-            QMessageBox.information(self, 'Service Restart', 'Edge Node service restarted successfully.')
-            self.post_launch_setup()
-            return
-            
-        except Exception as e:
-            QMessageBox.warning(self, 'Service Restart', 'Failed to restart Edge Node service')
-            self.add_log(f'Edge Node service restart failed: {str(e)}')
-            return
-
-    # Regular Docker container launch for local mode
-    self.add_log('Updating image...')
-    self.__maybe_docker_pull()
-    # first try to clean the container
-    self.add_log("Attempting to clean up the container...")
-    clean_cmd = self.get_clean_cmd()
-    try:
-      if os.name == 'nt':
-        # subprocess.call(clean_cmd, creationflags=subprocess.CREATE_NO_WINDOW)
-        output = subprocess.check_output(
-          clean_cmd, 
-          stderr=subprocess.STDOUT, 
-          universal_newlines=True, 
-          creationflags=subprocess.CREATE_NO_WINDOW
-        )
+    thread = ContainerLifecycleThread(
+      action,
+      run_command=self.get_cmd(),
+      clean_command=self.get_clean_cmd(),
+      stop_command=self.get_stop_command(),
+      pull_command=None if self.is_remote else self.get_pull_command(),
+      # in multi-host mode the node runs as a service
+      service_manager=self.service_manager if self.is_remote else None,
+      service_name='mnl_execution_engine',
+      image=self.docker_image,
+      digest_cache=None if self.is_remote else self.image_digests,
+      pull_platform=self.get_pull_platform(),
+      pull_interval=PULL_PROGRESS_INTERVAL,
+      api_client=self.get_docker_api_client(),
+      run_spec=self.get_run_spec(),
+    )
+    thread.log.connect(self.add_log)
+    thread.state_changed.connect(self.__on_lifecycle_state)
+    thread.pull_progress.connect(self.__on_pull_progress)
+    thread.pull_stats.connect(self.__on_pull_stats)
+    thread.lifecycle_finished.connect(self._on_lifecycle_finished)
+    self.lifecycle_thread = thread
+    thread.start()
+    return True
+
+
+  def __on_lifecycle_state(self, state):
+    self.lifecycle_state = LifecycleState(state)
+    if self.lifecycle_state == LifecycleState.PULLING:
+      str_docker_pull_command = ' '.join(self.lifecycle_thread.pull_command)
+      self.progress_dialog = ProgressBarWindow(f"Pulling Docker Image: '{str_docker_pull_command}'", self._icon, self)
+      self.progress_dialog.show()
+    elif self.progress_dialog is not None:
+      self.progress_dialog.accept()
+      self.progress_dialog = None
+    self._on_lifecycle_state_changed(self.lifecycle_state)
+    return
+
+
+  def __on_pull_progress(self, output, progress):
+    if self.progress_dialog is not None:
+      self.progress_dialog.update_progress(output, progress)
+    return
+
+
+  def __on_pull_stats(self, stats):
+    if self.progress_dialog is not None:
+      self.progress_dialog.update_stats(stats)
+    return
+
+
+  def _on_lifecycle_state_changed(self, state):
+    self.add_log(f'Edge Node lifecycle: {state.value}', debug=True)
+    return
+
+
+  def _on_lifecycle_finished(self, action, success, message):
+    self.add_log(message)
+    if action == LifecycleAction.STOP.value:
+      if success:
+        QMessageBox.information(self, 'Container Stop', 'Container stopped successfully.')
       else:
-        output = subprocess.check_output(
-          clean_cmd, 
-          stderr=subprocess.STDOUT
-        )
-      # endif windows or not
-      self.add_log('Container cleanup status: {}'.format(output))
-    except subprocess.CalledProcessError as e:
-      error_code = e.returncode
-      error_output = e.output
-      self.add_log('Edge Node container cleanup failed with code={}: {}'.format(error_code, error_output))
-    except Exception as e:
-      self.add_log('Edge Node container cleanup failed with unknown error: {}'.format(e))
-    
-    try:
-      self.add_log('Starting Edge Node container...')
-      run_cmd = self.get_cmd()
-      if os.name == 'nt':
-        # rc = subprocess.call(run_cmd, creationflags=subprocess.CREATE_NO_WINDOW, timeout=20)
-        output = subprocess.check_output(
-          run_cmd, 
-          stderr=subprocess.STDOUT, 
-          universal_newlines=True, 
-          creationflags=subprocess.CREATE_NO_WINDOW
-        )
+        QMessageBox.warning(self, 'Container Stop', 'Failed to stop container.')
+    elif self.is_remote:
+      if success:
+        QMessageBox.information(self, 'Service Restart', 'Edge Node service restarted successfully.')
       else:
-        # rc = subprocess.call(run_cmd, timeout=20)
-        output = subprocess.check_output(
-          run_cmd, 
-          stderr=subprocess.STDOUT, 
-        )
-      # endif windows or not
-      self.add_log('Container start status: {}'.format(output))
-      QMessageBox.information(self, 'Container Launch', 'Container launched successfully.')
-      self.add_log('Edge Node container launched successfully.')
+        QMessageBox.warning(self, 'Service Restart', 'Failed to restart Edge Node service')
+    else:
+      if success:
+        QMessageBox.information(self, 'Container Launch', 'Container launched successfully.')
+      else:
+        QMessageBox.warning(self, 'Container Launch', 'Failed to launch container')
+    if success and action != LifecycleAction.STOP.value:
       self.post_launch_setup()
-      # endif container running
-    except subprocess.CalledProcessError as e:
-      error_code = e.returncode
-      error_output = e.output
-      QMessageBox.warning(self, 'Container Launch', 'Failed to launch container')
-      self.add_log('Edge Node container start failed with error code={}: {}'.format(error_code, error_output))
-    except Exception as e:
-      QMessageBox.warning(self, 'Container Launch', 'Failed to launch container')
-      self.add_log('Edge Node container start failed with unknown error: {}'.format(e))
     return
 
 
+  @timer()
+  def launch_container(self):
+    return self._start_lifecycle(LifecycleAction.LAUNCH)
+
+
   def stop_container(self):
-    try:
-      self.add_log('Stopping Edge Node container...')
-      stop_cmd = self.get_stop_command()
-      if os.name == 'nt':
-        subprocess.check_call(stop_cmd, creationflags=subprocess.CREATE_NO_WINDOW)
-      else:
-        subprocess.check_call(stop_cmd)
-      sleep(2)
-      QMessageBox.information(self, 'Container Stop', 'Container stopped successfully.')      
-      self.add_log('Edge Node container stopped successfully.')
-      try:
-        self.add_log('Cleaning Edge Node container...')
-        clean_cmd = self.get_clean_cmd()
-        if os.name == 'nt':
-          subprocess.check_call(clean_cmd, creationflags=subprocess.CREATE_NO_WINDOW)
-        else:
-          subprocess.check_call(clean_cmd)
-        self.add_log('Edge Node container removed.')
-      except subprocess.CalledProcessError:
-        self.add_log('Edge Node container removal failed probably due to already being removed.')
-    except subprocess.CalledProcessError:
-      QMessageBox.warning(self, 'Container Stop', 'Failed to stop container.')
-      self.add_log('Edge Node container stop failed.')
-    return
+    return self._start_lifecycle(LifecycleAction.STOP)
+
+
+  def restart_container(self):
+    return self._start_lifecycle(LifecycleAction.RESTART)
 
 
   def delete_and_restart(self):
@@ -518,13 +504,11 @@ class _DockerUtilsMixin:
             try:
                 # Call reset_address with callbacks
                 def on_success(data):
-                    self.stop_container()
-                    self.launch_container()
-                    QMessageBox.information(self, 'Restart Edge Node', f'{E2_PEM_FILE} deleted and Edge Node restarted.')
+                    self.restart_container()
+                    QMessageBox.information(self, 'Restart Edge Node', f'{E2_PEM_FILE} deleted and Edge Node is restarting.')
                 
                 def on_error(error):
-                    self.stop_container()
-                    self.launch_container()
+                    self.restart_container()
                     QMessageBox.warning(self, 'Restart Edge Node', f'Failed to do proper cleanup: {error}')
                 
                 self.docker_commands.reset_address(on_success, on_error)
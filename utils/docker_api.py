@@ -0,0 +1,341 @@
+import http.client
+import json
+import os
+import shlex
+import socket
+import struct
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from .docker_session import DockerSessionError, DockerSessionTimeout, ExecResult
+
+
+DEFAULT_DOCKER_SOCKET = '/var/run/docker.sock'
+
+# stream ids of the multiplexed exec/attach output (non-tty)
+STREAM_STDOUT = 1
+STREAM_STDERR = 2
+
+
+class DockerAPIError(Exception):
+    """ Raised when the Docker Engine API answers with an error """
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """ HTTP connection over a unix domain socket """
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+    def abort(self) -> None:
+        """Unblock a reader in another thread by shutting the socket down."""
+        sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def get_docker_socket_path() -> Optional[str]:
+    """Return the local Docker Engine socket, None when docker is not reachable through one.
+
+    Honors `DOCKER_HOST=unix://...`; TCP/ssh hosts and Windows named pipes are not supported.
+    """
+    if os.name == 'nt':
+        return None
+    docker_host = os.environ.get('DOCKER_HOST')
+    if docker_host:
+        if not docker_host.startswith('unix://'):
+            return None
+        return docker_host[len('unix://'):]
+    return DEFAULT_DOCKER_SOCKET
+
+
+def read_env_file(env_file: str) -> List[str]:
+    """Read a `--env-file` the way the docker CLI does (no quote processing)."""
+    env = []
+    with open(env_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if '=' not in line:
+                # bare names are taken from the launcher environment, when set
+                if line in os.environ:
+                    env.append(f'{line}={os.environ[line]}')
+                continue
+            env.append(line)
+    return env
+
+
+def demux_stream(data: bytes) -> Tuple[bytes, bytes]:
+    """Split a multiplexed exec output into (stdout, stderr)."""
+    stdout, stderr = [], []
+    offset = 0
+    while offset + 8 <= len(data):
+        stream_id, size = struct.unpack('>BxxxL', data[offset:offset + 8])
+        payload = data[offset + 8:offset + 8 + size]
+        (stderr if stream_id == STREAM_STDERR else stdout).append(payload)
+        offset += 8 + size
+    return b''.join(stdout), b''.join(stderr)
+
+
+class DockerEngineClient:
+    """ Minimal Docker Engine API client speaking HTTP over the local unix socket.
+
+    Regular requests share one keep-alive connection (serialized by a lock) so a
+    call costs a round trip on an open socket instead of a `docker` CLI process.
+    Streams (pull progress, events) get their own connection.
+    """
+
+    def __init__(self, socket_path: str = None, timeout: float = 30):
+        self.socket_path = socket_path or get_docker_socket_path()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection: Optional[UnixHTTPConnection] = None
+
+    def is_available(self) -> bool:
+        """True if the socket exists and the current user may use it (no sudo needed)."""
+        return bool(self.socket_path) and os.path.exists(self.socket_path) and os.access(self.socket_path, os.R_OK | os.W_OK)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @staticmethod
+    def _path(path: str, params: dict = None) -> str:
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+            path = f'{path}?{urlencode(params)}'
+        return path
+
+    @staticmethod
+    def _raise_for_status(status: int, body: bytes) -> None:
+        if status < 400:
+            return
+        try:
+            message = json.loads(body).get('message', '')
+        except (ValueError, AttributeError):
+            message = body.decode('utf-8', errors='replace')
+        raise DockerAPIError(f'Docker API error {status}: {message}', status=status)
+
+    def request(self, method: str, path: str, params: dict = None, body: dict = None,
+                timeout: float = None) -> Tuple[int, bytes]:
+        """Send a request on the shared keep-alive connection.
+
+        Returns:
+            Tuple of (status, body). Error statuses are returned, not raised.
+        """
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        with self._lock:
+            for attempt in range(2):
+                reused = self._connection is not None
+                if self._connection is None:
+                    self._connection = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+                connection = self._connection
+                connection.timeout = timeout or self.timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(connection.timeout)
+                try:
+                    connection.request(method, self._path(path, params), body=payload, headers=headers)
+                    response = connection.getresponse()
+                    data = response.read()
+                    if response.will_close:
+                        connection.close()
+                        self._connection = None
+                    return response.status, data
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                    # the daemon closed an idle keep-alive connection: reconnect once
+                    connection.close()
+                    self._connection = None
+                    if not reused or attempt:
+                        raise DockerAPIError(f'Docker API connection failed: {e}') from e
+                except (OSError, http.client.HTTPException) as e:
+                    connection.close()
+                    self._connection = None
+                    raise DockerAPIError(f'Docker API request failed: {e}') from e
+
+    def request_json(self, method: str, path: str, params: dict = None, body: dict = None,
+                     timeout: float = None):
+        status, data = self.request(method, path, params=params, body=body, timeout=timeout)
+        self._raise_for_status(status, data)
+        return json.loads(data) if data else None
+
+    def stream_json(self, method: str, path: str, params: dict = None, timeout: float = None,
+                    on_connect=None) -> Iterator[dict]:
+        """Send a request and yield the JSON objects of a streamed (newline delimited) response.
+
+        Each stream uses its own connection since it stays open until the operation ends.
+        `on_connect` receives the connection, so another thread can `abort()` the stream.
+        """
+        connection = UnixHTTPConnection(self.socket_path, timeout=timeout)
+        if on_connect is not None:
+            on_connect(connection)
+        try:
+            connection.request(method, self._path(path, params), headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            if response.status >= 400:
+                self._raise_for_status(response.status, response.read())
+            for line in response:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        finally:
+            connection.close()
+
+    # --- daemon ---------------------------------------------------------------
+
+    def version(self) -> dict:
+        return self.request_json('GET', '/version')
+
+    def info(self) -> dict:
+        return self.request_json('GET', '/info')
+
+    def events(self, filters: Dict[str, List[str]], on_connect=None) -> Iterator[dict]:
+        """Yield daemon events matching `filters` until the stream is closed."""
+        return self.stream_json('GET', '/events', {'filters': json.dumps(filters)}, on_connect=on_connect)
+
+    # --- images ---------------------------------------------------------------
+
+    def pull_image(self, image: str, tag: str, platform: str = None) -> Iterator[dict]:
+        """Pull an image, yielding the progress messages of the engine."""
+        params = {'fromImage': image, 'tag': tag, 'platform': platform}
+        for message in self.stream_json('POST', '/images/create', params):
+            if 'error' in message:
+                raise DockerAPIError(message['error'])
+            yield message
+
+    def inspect_image(self, image: str) -> Optional[dict]:
+        """Return the image details, None when the image is not present locally."""
+        status, data = self.request('GET', f'/images/{quote(image, safe="")}/json')
+        if status == 404:
+            return None
+        self._raise_for_status(status, data)
+        return json.loads(data)
+
+    # --- containers -----------------------------------------------------------
+
+    def inspect_container(self, name: str) -> Optional[dict]:
+        """Return the container details, None when there is no such container."""
+        status, data = self.request('GET', f'/containers/{quote(name)}/json')
+        if status == 404:
+            return None
+        self._raise_for_status(status, data)
+        return json.loads(data)
+
+    def remove_container(self, name: str, force: bool = False) -> None:
+        self.request_json('DELETE', f'/containers/{quote(name)}', {'force': str(force).lower()})
+
+    def stop_container(self, name: str, timeout: int = None) -> None:
+        # 304: already stopped, same as the CLI which succeeds in that case
+        status, data = self.request(
+            'POST', f'/containers/{quote(name)}/stop', {'t': timeout},
+            timeout=self.timeout + (timeout or 10)
+        )
+        if status != 304:
+            self._raise_for_status(status, data)
+
+    def run_container(self, name: str, image: str, env: List[str] = None, binds: List[str] = None,
+                      gpus: bool = False, auto_remove: bool = False, ports: Dict[str, str] = None) -> str:
+        """Create and start a detached container (`docker run -d` equivalent).
+
+        Args:
+            name: Container name
+            image: Image to run, must be present locally
+            env: `KEY=VALUE` entries
+            binds: Volume binds (`volume:/path`)
+            gpus: Request all GPUs (`--gpus=all`)
+            auto_remove: Remove the container when it exits (`--rm`)
+            ports: Container port (`80/tcp`) to host port
+
+        Returns:
+            Id of the started container
+        """
+        host_config = {'AutoRemove': auto_remove, 'Binds': binds or []}
+        if gpus:
+            host_config['DeviceRequests'] = [{'Driver': '', 'Count': -1, 'Capabilities': [['gpu']]}]
+        body = {'Image': image, 'Env': env or [], 'HostConfig': host_config}
+        if ports:
+            body['ExposedPorts'] = {port: {} for port in ports}
+            host_config['PortBindings'] = {port: [{'HostPort': host_port}] for port, host_port in ports.items()}
+        container = self.request_json('POST', '/containers/create', {'name': name}, body=body)
+        self.request_json('POST', f"/containers/{container['Id']}/start")
+        return container['Id']
+
+    def exec_run(self, name: str, command: List[str], env: List[str] = None) -> ExecResult:
+        """Run a command in a running container and collect its output (`docker exec` equivalent)."""
+        exec_config = self.request_json('POST', f'/containers/{quote(name)}/exec', body={
+            'Cmd': command,
+            'Env': env or [],
+            'AttachStdout': True,
+            'AttachStderr': True,
+        })
+        exec_id = exec_config['Id']
+        status, data = self.request('POST', f'/exec/{exec_id}/start', body={'Detach': False, 'Tty': False})
+        self._raise_for_status(status, data)
+        stdout, stderr = demux_stream(data)
+        details = self.request_json('GET', f'/exec/{exec_id}/json')
+        return ExecResult(
+            returncode=details.get('ExitCode') or 0,
+            stdout=stdout.decode('utf-8', errors='replace'),
+            stderr=stderr.decode('utf-8', errors='replace'),
+        )
+
+
+class DockerApiExecSession:
+    """ `DockerExecSession` drop-in that runs each command through the Engine API.
+
+    Used for the local container when the API is enabled; stdin is passed through an
+    environment variable since exec stdin would need a hijacked connection.
+    """
+
+    def __init__(self, container_name: str, client: DockerEngineClient):
+        self.container_name = container_name
+        self.client = client
+
+    def close(self) -> None:
+        return
+
+    def execute(self, command: str, input_data: str = None, shell: bool = False) -> ExecResult:
+        if input_data is not None:
+            inner = command if shell else ' '.join(shlex.quote(part) for part in command.split())
+            argv = ['sh', '-c', f'printf "%s" "$ENL_INPUT" | {{ {inner}\n}}']
+            env = [f'ENL_INPUT={input_data}']
+        elif shell:
+            argv, env = ['sh', '-c', command], None
+        else:
+            argv, env = command.split(), None
+        try:
+            return self.client.exec_run(self.container_name, argv, env=env)
+        except DockerAPIError as e:
+            # same contract as the CLI session: a hung exec times out, otherwise the container is not there to answer
+            if isinstance(e.__cause__, socket.timeout):
+                raise DockerSessionTimeout(str(e)) from e
+            raise DockerSessionError(str(e)) from e
+
+    def execute_batch(self, commands: List[str], input_data: List[Optional[str]] = None,
+                      shell: bool = False) -> List[ExecResult]:
+        if input_data is None:
+            input_data = [None] * len(commands)
+        return [self.execute(command, data, shell=shell) for command, data in zip(commands, input_data)]
@@ -1,96 +1,263 @@
-import os
 import json
-import subprocess
-from PyQt5.QtCore import QThread, pyqtSignal
+import shlex
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from models.NodeInfo import NodeInfo
 from models.NodeHistory import NodeHistory
 from models.StartupConfig import StartupConfig
 from models.ConfigApp import ConfigApp
+from models.DashboardSnapshot import DashboardSnapshot
+from .docker_session import DockerExecSession, DockerSessionError, DockerSessionTimeout
+from .docker_api import DockerApiExecSession
+from .command_pool import CommandPool
+from .instrumentation import instrumentation, timed
 
 
-class DockerCommandThread(QThread):
-    """ Thread to run a Docker command """
-    command_finished = pyqtSignal(dict)
-    command_error = pyqtSignal(str)
+# Runs inside the container (python3 ships with the edge node image) and trims the
+# get_node_history lists to the samples newer than argv[1], so only the delta crosses
+# the exec/ssh boundary. Timestamps are ISO strings and compare lexicographically.
+NODE_HISTORY_SINCE_FILTER = """
+import json, sys
+data = json.load(sys.stdin)
+timestamps = data.get("timestamps") or []
+start = len(timestamps)
+while start > 0 and timestamps[start - 1] > sys.argv[1]:
+    start -= 1
+for key, value in data.items():
+    if isinstance(value, list) and len(value) == len(timestamps):
+        data[key] = value[start:]
+json.dump(data, sys.stdout)
+"""
+
+
+def build_node_history_command(since: Optional[str] = None) -> str:
+    """Shell command returning the node history, only newer than `since` when given.
+
+    Falls back to the full history if the filter cannot run in the container.
+    """
+    if not since:
+        return 'get_node_history'
+    return (
+        f'get_node_history | python3 -c {shlex.quote(NODE_HISTORY_SINCE_FILTER)} {shlex.quote(since)}'
+        ' || get_node_history'
+    )
 
-    def __init__(self, container_name: str, command: str, input_data: str = None, remote_ssh_command: list = None):
-        super().__init__()
-        self.container_name = container_name
-        self.command = command
-        self.input_data = input_data
-        self.remote_ssh_command = remote_ssh_command
 
-    def run(self):
+class DockerCommandError(Exception):
+    """ A command that ran but failed or returned unusable output """
+
+
+def run_command(session: DockerExecSession, command: str, input_data: str = None, shell: bool = False) -> dict:
+    """Run a command through the exec session and return its parsed JSON output."""
+    with timed(f'docker_command.{command.split()[0]}'):
         try:
-            full_command = ['docker', 'exec']
-            if self.input_data is not None:
-                full_command.extend(['-i'])  # Add interactive flag when input is provided
-            full_command.extend([self.container_name] + self.command.split())
-
-            # Add remote prefix if needed
-            if self.remote_ssh_command:
-                full_command = self.remote_ssh_command + full_command
-
-            if os.name == 'nt':
-                result = subprocess.run(
-                    full_command,
-                    input=self.input_data,
-                    capture_output=True,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
-            else:
-                result = subprocess.run(
-                    full_command,
-                    input=self.input_data,
-                    capture_output=True,
-                    text=True
-                )
+            result = session.execute(command, input_data, shell=shell)
+        except Exception as e:
+            raise DockerCommandError(f"Error executing command: {str(e)}\nCommand: {command}\nInput data: {input_data}") from e
 
-            if result.returncode != 0:
-                self.command_error.emit(f"Command failed: {result.stderr}\nCommand: {' '.join(full_command)}\nInput data: {self.input_data}")
-                return
+        if result.returncode != 0:
+            raise DockerCommandError(f"Command failed: {result.stderr}\nCommand: {command}\nInput data: {input_data}")
 
-            # TODO: Improve output handling.
-            # Maybe implement it in a way that the command itself can specify the output format.
-            # For reset_address and commands starting with change_alias, treat output as plain text
-            if self.command == 'reset_address' or self.command.startswith('change_alias'):
-                self.command_finished.emit({'message': result.stdout.strip()})
-                return
+        # TODO: Improve output handling.
+        # Maybe implement it in a way that the command itself can specify the output format.
+        # For get_allowed, reset_address and commands starting with change_alias, treat output as plain text
+        if command in ('get_allowed', 'reset_address') or command.startswith('change_alias'):
+            return {'message': result.stdout.strip()}
+
+        try:
+            return json.loads(result.stdout)
+        except json.JSONDecodeError:
+            raise DockerCommandError(f"Error decoding JSON response. Raw output: {result.stdout}")
+        except Exception as e:
+            raise DockerCommandError(f"Error processing response: {str(e)}\nRaw output: {result.stdout}")
+
+
+def collect_dashboard_snapshot(session: DockerExecSession, history_since: Optional[str] = None) -> DashboardSnapshot:
+    """Collect node info and history in a single exec round trip."""
+    commands = ['get_node_info', build_node_history_command(history_since)]
+    with timed('docker_command.dashboard_snapshot'):
+        try:
+            results = session.execute_batch(commands, shell=True)
+        except DockerSessionTimeout as e:
+            # a slow or hung exec says nothing about the container state
+            return DashboardSnapshot(is_running=True, timeout_error=str(e))
+        except DockerSessionError:
+            # docker exec could not attach: the container is not running
+            return DashboardSnapshot(is_running=False)
 
+        parsed = {}
+        errors = {}
+        for key, command, result in zip(['get_node_info', 'get_node_history'], commands, results):
+            if result.returncode != 0:
+                errors[key] = f"Command failed: {result.stderr}\nCommand: {command}"
+                continue
             try:
                 data = json.loads(result.stdout)
-                self.command_finished.emit(data)
             except json.JSONDecodeError:
-                self.command_error.emit(f"Error decoding JSON response. Raw output: {result.stdout}")
+                errors[key] = f"Error decoding JSON response. Raw output: {result.stdout}"
+                continue
+            try:
+                if key == 'get_node_info':
+                    parsed[key] = NodeInfo.from_dict(data)
+                else:
+                    parsed[key] = NodeHistory.from_dict(data)
             except Exception as e:
-                self.command_error.emit(f"Error processing response: {str(e)}\nRaw output: {result.stdout}")
-        except Exception as e:
-            self.command_error.emit(f"Error executing command: {str(e)}\nCommand: {' '.join(full_command)}\nInput data: {self.input_data}")
+                errors[key] = f"Failed to process {key}: {str(e)}"
+
+        return DashboardSnapshot(
+            is_running=True,
+            node_info=parsed.get('get_node_info'),
+            node_history=parsed.get('get_node_history'),
+            node_info_error=errors.get('get_node_info'),
+            node_history_error=errors.get('get_node_history'),
+        )
+
 
 class DockerCommandHandler:
-    """ Handles Docker commands """
-    def __init__(self, container_name: str):
+    """ Handles Docker commands
+
+    Commands run on a bounded worker pool. The periodic reads (node info, history,
+    dashboard snapshot) are dropped while the pool is backed up, so a slow host
+    gets fewer requests instead of a growing pile of them.
+
+    Reads are de-duplicated: asking for a command that is still running attaches
+    the callbacks to it instead of running it again. Commands listed in
+    `cache_ttl` are answered from memory for that many seconds, until the
+    container is started again or the target changes.
+    """
+    def __init__(self, container_name: str, api_client=None, max_workers: int = 3, max_pending: int = 6,
+                 cache_ttl: Dict[str, float] = None, container_started_at: Callable[[], str] = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            container_name: Container the commands are executed in
+            api_client: DockerEngineClient used for the local container instead of the docker CLI
+            max_workers: Commands run at once
+            max_pending: Pending commands above which the periodic reads are dropped
+            cache_ttl: Seconds the result of a command (by name) is reused
+            container_started_at: Returns the start time of the container, cached results
+                of an earlier start are not reused
+            timeout: Seconds a docker exec / ssh round trip may take before it is killed
+        """
         self.container_name = container_name
-        self.threads = []
+        self.pool = CommandPool('docker_commands', max_workers=max_workers, max_pending=max_pending)
+        self.cache_ttl = dict(cache_ttl or {})
+        self.container_started_at = container_started_at or (lambda: '')
+        self._in_flight: Dict[tuple, List[Tuple[Callable, Callable]]] = {}
+        self._cache: Dict[tuple, Tuple[float, str, Any]] = {}  # key -> (expires, started_at, result)
+        self._generation = 0
         self.remote_ssh_command = None
+        self.api_client = api_client
+        self.timeout = timeout
+        self.session = self._create_session()
+
+    def _create_session(self):
+        if self.api_client is not None and not self.remote_ssh_command:
+            return DockerApiExecSession(self.container_name, self.api_client)
+        return DockerExecSession(self.container_name, self.remote_ssh_command, timeout=self.timeout)
+
+    def _reset_session(self) -> None:
+        """Replace the exec session so the next command connects to the current target."""
+        self.session.close()
+        self.session = self._create_session()
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """Forget the cached results; commands still running are not reused or cached."""
+        self._generation += 1
+        self._cache.clear()
+        self._in_flight.clear()
 
     def set_remote_connection(self, ssh_command: str):
         """Set up remote connection using SSH command."""
         self.remote_ssh_command = ssh_command.split() if ssh_command else None
+        self._reset_session()
 
     def clear_remote_connection(self):
         """Clear remote connection settings."""
         self.remote_ssh_command = None
+        self._reset_session()
 
-    def _execute_threaded(self, command: str, callback, error_callback, input_data: str = None) -> None:
-        thread = DockerCommandThread(self.container_name, command, input_data, self.remote_ssh_command)
-        thread.command_finished.connect(callback)
-        thread.command_error.connect(error_callback)
-        self.threads.append(thread)  # Keep reference to prevent GC
-        thread.finished.connect(lambda: self.threads.remove(thread))
-        thread.start()
+    def close(self) -> None:
+        """Stop the worker pool and close the exec session kept open in the container."""
+        self.pool.shutdown()
+        self.session.close()
+
+    def _submit(self, key: tuple, func: Callable[[], Any], callback, error_callback, droppable: bool = False,
+                shared: bool = True) -> None:
+        """Run `func` on the pool, or reuse the cached / running result of the same `key`.
+
+        `key[0]` is the command name. Commands that change the node are not `shared`.
+        """
+        name = key[0]
+        if not shared:
+            def on_changed(result) -> None:
+                self.invalidate_cache()  # the cached reads may describe the node before the change
+                callback(result)
+            self.pool.submit(name, func, on_changed, error_callback, droppable=droppable)
+            return
+
+        started_at = self.container_started_at()
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires, cached_started_at, result = cached
+            if monotonic() < expires and cached_started_at == started_at:
+                instrumentation.record(f'docker_commands.{name}.cached', 0.0)
+                callback(result)
+                return
+            del self._cache[key]
+
+        waiters = self._in_flight.get(key)
+        if waiters is not None:
+            instrumentation.record(f'docker_commands.{name}.coalesced', 0.0)
+            waiters.append((callback, error_callback))
+            return
+
+        waiters = self._in_flight[key] = [(callback, error_callback)]
+        generation = self._generation
+
+        def on_done(result) -> None:
+            if self._in_flight.get(key) is waiters:
+                del self._in_flight[key]
+            ttl = self.cache_ttl.get(name)
+            if ttl and generation == self._generation:
+                self._cache[key] = (monotonic() + ttl, started_at, result)
+            for waiter_callback, _ in waiters:
+                waiter_callback(result)
+
+        def on_error(error: str) -> None:
+            if self._in_flight.get(key) is waiters:
+                del self._in_flight[key]
+            for _, waiter_error_callback in waiters:
+                waiter_error_callback(error)
+
+        if not self.pool.submit(name, func, on_done, on_error, droppable=droppable):
+            del self._in_flight[key]
+
+    def _execute_threaded(self, command: str, callback, error_callback, input_data: str = None, shell: bool = False,
+                          droppable: bool = False, shared: bool = True) -> None:
+        session = self.session
+        self._submit(
+            (command.split()[0], command, input_data, shell),
+            lambda: run_command(session, command, input_data, shell=shell),
+            callback, error_callback, droppable=droppable, shared=shared,
+        )
+
+    def get_dashboard_snapshot(self, callback, error_callback, history_since: Optional[str] = None) -> None:
+        """Fetch container state, node info and node history in one round trip
+
+        Args:
+            callback: Called with a DashboardSnapshot
+            error_callback: Error callback
+            history_since: Only return history samples newer than this timestamp
+        """
+        session = self.session
+        self._submit(
+            ('dashboard_snapshot', history_since),
+            lambda: collect_dashboard_snapshot(session, history_since),
+            callback, error_callback, droppable=True,
+        )
 
     def get_node_info(self, callback, error_callback) -> None:
         def process_node_info(data: dict):
@@ -100,9 +267,16 @@ class DockerCommandHandler:
             except Exception as e:
                 error_callback(f"Failed to process node info: {str(e)}")
 
-        self._execute_threaded('get_node_info', process_node_info, error_callback)
+        self._execute_threaded('get_node_info', process_node_info, error_callback, droppable=True)
+
+    def get_node_history(self, callback, error_callback, since: Optional[str] = None) -> None:
+        """Fetch the node history
 
-    def get_node_history(self, callback, error_callback) -> None:
+        Args:
+            callback: Called with a NodeHistory
+            error_callback: Error callback
+            since: Only return samples newer than this timestamp (incremental mode)
+        """
         def process_metrics(data: dict):
             try:
                 metrics = NodeHistory.from_dict(data)
@@ -110,14 +284,14 @@ class DockerCommandHandler:
             except Exception as e:
                 error_callback(f"Failed to process metrics: {str(e)}")
 
-        self._execute_threaded('get_node_history', process_metrics, error_callback)
+        self._execute_threaded(build_node_history_command(since), process_metrics, error_callback, shell=True, droppable=True)
 
     def get_allowed_addresses(self, callback, error_callback) -> None:
-        def process_allowed_addresses(output: str):
+        def process_allowed_addresses(data: dict):
             try:
                 # Convert plain text output to dictionary
                 allowed_dict = {}
-                for line in output.strip().split('\n'):
+                for line in data['message'].split('\n'):
                     if line.strip():  # Skip empty lines
                         # Split on '#' and take only the first part
                         main_part = line.split('#')[0].strip()
@@ -129,30 +303,7 @@ class DockerCommandHandler:
             except Exception as e:
                 error_callback(f"Failed to process allowed addresses: {str(e)}")
 
-        try:
-            full_command = ['docker', 'exec', self.container_name, 'get_allowed']
-            
-            # Add remote prefix if needed
-            if self.remote_ssh_command:
-                full_command = self.remote_ssh_command + full_command
-
-            if os.name == 'nt':
-                result = subprocess.run(
-                    full_command,
-                    capture_output=True,
-                    text=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
-            else:
-                result = subprocess.run(full_command, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                error_callback(f"Command failed: {result.stderr}")
-                return
-
-            process_allowed_addresses(result.stdout)
-        except Exception as e:
-            error_callback(str(e))
+        self._execute_threaded('get_allowed', process_allowed_addresses, error_callback)
 
     def update_allowed_batch(self, addresses_data: list, callback, error_callback) -> None:
         """Update allowed addresses in batch
@@ -170,7 +321,8 @@ class DockerCommandHandler:
             'update_allowed_batch',  # Just the command name, no data here
             callback,
             error_callback,
-            input_data=batch_input + '\n'  # Add final newline and pass as input_data
+            input_data=batch_input + '\n',  # Add final newline and pass as input_data
+            shared=False
         )
 
     def get_startup_config(self, callback, error_callback) -> None:
@@ -208,7 +360,7 @@ class DockerCommandHandler:
             except Exception as e:
                 error_callback(f"Failed to process response: {str(e)}")
 
-        self._execute_threaded('reset_address', process_response, error_callback)
+        self._execute_threaded('reset_address', process_response, error_callback, shared=False)
 
     def update_node_name(self, new_name: str, callback, error_callback) -> None:
         """Updates the node name/alias
@@ -221,5 +373,6 @@ class DockerCommandHandler:
         self._execute_threaded(
             f'change_alias {new_name}',
             callback,
-            error_callback
+            error_callback,
+            shared=False
         )
@@ -0,0 +1,260 @@
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable, Dict, List, Optional
+
+from .docker_api import DockerEngineClient, DockerAPIError
+from .image_digest import split_image
+from .process_runner import run_process
+
+
+MB = 1024 * 1024
+
+
+class PullProgressTracker:
+    """ Estimates `docker pull` progress from the CLI output, by completed layers """
+    DONE = [
+        'Image is up to date',
+        'Pull complete',
+        'Already exists',
+    ]
+    START = [
+        'Already exists',
+        'Pulling fs layer',
+        'Image is up to date',
+    ]
+
+    def __init__(self):
+        self.total_layers = 0
+        self.pulled_layers = 0
+
+    def parse_output(self, line: str) -> None:
+        for d in self.DONE:
+            if d in line:
+                self.pulled_layers += 1
+        for s in self.START:
+            if s in line:
+                self.total_layers += 1
+
+    def calculate_progress(self) -> int:
+        if self.total_layers == 0:
+            return 0
+        return int((self.pulled_layers / self.total_layers) * 100)
+
+
+@dataclass
+class LayerProgress:
+    total: Optional[int] = None
+    downloaded: int = 0
+    extracted: int = 0
+    status: str = ''
+    done: bool = False
+
+
+@dataclass
+class PullStats:
+    """ Aggregated pull progress, as shown to the user """
+    percent: int = 0
+    downloaded: int = 0
+    extracted: int = 0
+    total: int = 0
+    download_rate: float = 0.0  # bytes/s
+    extract_rate: float = 0.0  # bytes/s
+    eta: Optional[float] = None  # seconds
+    layers_done: int = 0
+    layers: int = 0
+
+    def describe(self) -> str:
+        eta = '--:--' if self.eta is None else f'{int(self.eta) // 60}:{int(self.eta) % 60:02d}'
+        return (
+            f'{self.percent}% | layers {self.layers_done}/{self.layers} | '
+            f'downloaded {self.downloaded / MB:.1f}/{self.total / MB:.1f} MB @ {self.download_rate / MB:.1f} MB/s | '
+            f'extracted {self.extracted / MB:.1f} MB @ {self.extract_rate / MB:.1f} MB/s | ETA {eta}'
+        )
+
+
+class LayerProgressTracker:
+    """ Byte-weighted pull progress built from the Docker Engine API progress messages.
+
+    Every layer counts twice its size: once downloaded and once extracted. Layers whose
+    size is not known yet are weighted with the average known layer size. Rates are
+    exponential moving averages, so the ETA tells whether the pull is currently
+    network-bound or extraction-bound.
+    """
+    RATE_SMOOTHING = 0.3
+    MIN_RATE_INTERVAL = 0.1  # seconds, shorter samples make the rates jittery
+
+    def __init__(self):
+        self.layers: Dict[str, LayerProgress] = {}
+        self.started = monotonic()
+        self._last_time = self.started
+        self._last_downloaded = 0
+        self._last_extracted = 0
+        self.download_rate = 0.0
+        self.extract_rate = 0.0
+
+    def update(self, message: dict) -> Optional[str]:
+        """Apply one progress message. Returns a line worth logging on layer status changes."""
+        layer_id = message.get('id')
+        status = message.get('status', '')
+        if not layer_id or status.startswith('Pulling from'):
+            # image level messages (e.g. "Pulling from ...", "Digest: ...")
+            return status
+        layer = self.layers.setdefault(layer_id, LayerProgress())
+        detail = message.get('progressDetail') or {}
+        changed = status != layer.status
+        layer.status = status
+        if status == 'Downloading':
+            layer.total = detail.get('total', layer.total)
+            layer.downloaded = detail.get('current', layer.downloaded)
+        elif status in ('Verifying Checksum', 'Download complete'):
+            if layer.total is not None:
+                layer.downloaded = layer.total
+        elif status == 'Extracting':
+            layer.total = detail.get('total', layer.total)
+            if layer.total is not None:
+                layer.downloaded = layer.total
+            layer.extracted = detail.get('current', layer.extracted)
+        elif status in ('Pull complete', 'Already exists'):
+            layer.done = True
+            if layer.total is not None:
+                layer.downloaded = layer.extracted = layer.total
+        if changed and status not in ('Downloading', 'Extracting'):
+            return f'{layer_id}: {status}'
+        return None
+
+    def stats(self) -> PullStats:
+        layers = list(self.layers.values())
+        known = [layer.total for layer in layers if layer.total]
+        average = sum(known) / len(known) if known else 0
+        total = downloaded = extracted = 0
+        weighted_total = weighted_done = estimated_total = 0.0
+        for layer in layers:
+            if layer.done and not layer.total:
+                continue  # already present locally, nothing to transfer
+            size = layer.total or average
+            total += layer.total or 0
+            downloaded += layer.downloaded
+            extracted += layer.extracted
+            weighted_total += 2 * size
+            estimated_total += max(size, layer.downloaded)
+            weighted_done += min(layer.downloaded, size) + min(layer.extracted, size)
+
+        now = monotonic()
+        elapsed = now - self._last_time
+        if elapsed >= self.MIN_RATE_INTERVAL:
+            alpha = self.RATE_SMOOTHING
+            self.download_rate += alpha * ((downloaded - self._last_downloaded) / elapsed - self.download_rate)
+            self.extract_rate += alpha * ((extracted - self._last_extracted) / elapsed - self.extract_rate)
+            self._last_time, self._last_downloaded, self._last_extracted = now, downloaded, extracted
+
+        eta = None
+        if known:
+            # layers still waiting count with the average size; the slower stage bounds the ETA
+            remaining = [
+                (estimated_total - downloaded) / self.download_rate if self.download_rate > 0 else None,
+                (estimated_total - extracted) / self.extract_rate if self.extract_rate > 0 else None,
+            ]
+            remaining = [value for value in remaining if value is not None]
+            eta = max(max(remaining), 0.0) if remaining else None
+
+        percent = int(100 * weighted_done / weighted_total) if weighted_total else 0
+        return PullStats(
+            percent=min(percent, 100),
+            downloaded=downloaded,
+            extracted=extracted,
+            total=total,
+            download_rate=max(self.download_rate, 0.0),
+            extract_rate=max(self.extract_rate, 0.0),
+            eta=eta,
+            layers_done=sum(1 for layer in layers if layer.done),
+            layers=len(layers),
+        )
+
+    def summary(self) -> str:
+        """One line describing where the pull time went."""
+        stats = self.stats()
+        elapsed = monotonic() - self.started
+        return (
+            f'Pulled {stats.total / MB:.1f} MB in {elapsed:.1f}s '
+            f'(average {stats.total / MB / elapsed if elapsed else 0:.1f} MB/s, '
+            f'{stats.layers} layers, {stats.layers - sum(1 for layer in self.layers.values() if layer.total)} already present)'
+        )
+
+
+class DockerPullEngine:
+    """ Pulls an image reporting byte-weighted progress.
+
+    Uses the Docker Engine API when a client is given and usable, and parses the
+    `docker pull` CLI output otherwise. No client is passed when the API is turned
+    off or does not reach the target daemon (Windows, remote hosts, sudo).
+    """
+
+    def __init__(self, pull_command: List[str], image: str, platform: str = None,
+                 on_line: Callable[[str, int], None] = None, on_stats: Callable[[PullStats], None] = None,
+                 on_log: Callable[[str], None] = None, interval: float = 0.25,
+                 client: DockerEngineClient = None):
+        """
+        Args:
+            pull_command: `docker pull` command line used by the CLI fallback
+            image: Image to pull (`repo:tag`)
+            platform: Platform requested from the registry (e.g. `linux/amd64`)
+            on_line: Called with (output line, percent) for notable output
+            on_stats: Called with PullStats, at most once per `interval`
+            on_log: Called with messages for the launcher log
+            interval: Minimum seconds between two `on_stats` calls
+            client: DockerEngineClient of the target daemon, None to pull with the docker CLI
+        """
+        self.pull_command = pull_command
+        self.image = image
+        self.platform = platform
+        self.on_line = on_line or (lambda line, percent: None)
+        self.on_stats = on_stats or (lambda stats: None)
+        self.on_log = on_log or (lambda message: None)
+        self.interval = interval
+        self.client = client
+
+    def pull(self) -> bool:
+        if self.client is not None and self.client.is_available():
+            try:
+                return self._pull_api()
+            except (OSError, DockerAPIError) as e:
+                self.on_log(f'Docker API pull failed ({e}), retrying with the docker CLI...')
+        return self._pull_cli()
+
+    def _pull_api(self) -> bool:
+        repository, tag = split_image(self.image)
+        tracker = LayerProgressTracker()
+        last_emit = 0.0
+        for message in self.client.pull_image(repository, tag, platform=self.platform):
+            line = tracker.update(message)
+            now = monotonic()
+            if line or now - last_emit >= self.interval:
+                stats = tracker.stats()
+                if line:
+                    self.on_line(line, stats.percent)
+                if now - last_emit >= self.interval:
+                    self.on_stats(stats)
+                    last_emit = now
+        stats = tracker.stats()
+        stats.percent = 100
+        self.on_stats(stats)
+        self.on_log(tracker.summary())
+        return True
+
+    def _pull_cli(self) -> bool:
+        tracker = PullProgressTracker()
+
+        def on_line(line: str) -> None:
+            tracker.parse_output(line)
+            self.on_line(line.strip(), tracker.calculate_progress())
+
+        try:
+            # no timeout, a large image on a slow link takes as long as it takes
+            result = run_process(
+                self.pull_command, timeout=None, merge_stderr=True, on_line=on_line,
+                max_output=64 * 1024, name='docker.pull'
+            )
+        except Exception as e:
+            self.on_log(f'Docker pull could not start: {e}')
+            return False
+        return result.ok
@@ -0,0 +1,248 @@
+import shlex
+import subprocess
+import threading
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import List, Optional
+from uuid import uuid4
+
+from .process_runner import popen
+
+
+FRAME_PREFIX = '@@ENL'
+
+
+class DockerSessionError(Exception):
+    """ Raised when the exec session cannot deliver a reply """
+
+
+class DockerSessionTimeout(DockerSessionError):
+    """ Raised when the exec session gave no reply within its timeout (hung container or ssh link) """
+
+
+@dataclass
+class ExecResult:
+    """ Result of a single command executed through a DockerExecSession """
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+class DockerExecSession:
+    """ Long-lived `docker exec` shell shared by all commands sent to a container.
+
+    Instead of spawning `docker exec` (and `ssh` in remote mode) for every query, one
+    `sh` is kept open inside the container and requests are written to its stdin.
+    Every request gets an id; the shell answers with a header line
+    `@@ENL <id> <returncode> <stdout_bytes> <stderr_bytes>` followed by both payloads,
+    so replies are split by length and never by scanning the command output.
+
+    The session is restarted transparently when the shell is gone (e.g. the
+    container was restarted). A round trip taking longer than `timeout` seconds
+    kills the shell, so a hung container or ssh link fails the call instead of
+    blocking its thread.
+    """
+
+    def __init__(self, container_name: str, remote_ssh_command: List[str] = None, timeout: Optional[float] = None):
+        self.container_name = container_name
+        self.remote_ssh_command = remote_ssh_command
+        self.timeout = timeout
+        self._timed_out = False
+        self._session_id = uuid4().hex[:8]
+        self._request_ids = count(1)
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._stderr_tail = deque(maxlen=20)
+        self._stderr_thread: Optional[threading.Thread] = None
+
+    def _build_command(self) -> List[str]:
+        full_command = ['docker', 'exec', '-i', self.container_name, 'sh']
+        if self.remote_ssh_command:
+            full_command = self.remote_ssh_command + full_command
+        return full_command
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _drain_stderr(self, process: subprocess.Popen) -> None:
+        for line in iter(process.stderr.readline, b''):
+            self._stderr_tail.append(line.decode('utf-8', errors='replace').rstrip())
+
+    def _start(self) -> None:
+        self._kill()
+        self._stderr_tail.clear()
+        process = popen(
+            self._build_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        self._process = process
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, args=(process,), daemon=True)
+        self._stderr_thread.start()
+
+        # Private scratch folder for the per-request stdout/stderr captures
+        try:
+            self._write(
+                'ENL_TMP=$(mktemp -d 2>/dev/null || echo /tmp/enl_$$); mkdir -p "$ENL_TMP"\n'
+                f"printf '{FRAME_PREFIX} ready 0 0 0\\n'\n"
+            )
+        except OSError:
+            raise DockerSessionError(f"Could not open exec session: {self._describe_failure()}")
+        self._read_reply('ready')
+
+    def _kill(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.write(b'rm -rf "$ENL_TMP"; exit 0\n')
+                process.stdin.flush()
+                process.wait(timeout=2)
+        except Exception:
+            pass
+        if process.poll() is None:
+            process.kill()
+
+    def close(self) -> None:
+        """Terminate the shell inside the container, interrupting a command still waiting for its reply."""
+        if not self._lock.acquire(timeout=1):
+            self._expire()
+            self._lock.acquire()
+        try:
+            self._kill()
+        finally:
+            self._lock.release()
+
+    def _expire(self) -> None:
+        """Kill the shell from another thread; the pending read fails with the timeout."""
+        self._timed_out = True
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def _write(self, script: str) -> None:
+        self._process.stdin.write(script.encode('utf-8'))
+        self._process.stdin.flush()
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self._process.stdout.read(size) if size > 0 else b''
+        if len(data) != size:
+            raise DockerSessionError(f"Session closed while reading reply: {self._describe_failure()}")
+        return data
+
+    def _read_reply(self, request_id: str) -> ExecResult:
+        while True:
+            line = self._process.stdout.readline()
+            if not line:
+                raise DockerSessionError(f"Session closed: {self._describe_failure()}")
+            parts = line.decode('utf-8', errors='replace').split()
+            if len(parts) == 5 and parts[0] == FRAME_PREFIX and parts[1] == request_id:
+                break
+            # anything else is stray shell output (e.g. profile messages) and is ignored
+        returncode, stdout_size, stderr_size = (int(x) for x in parts[2:])
+        stdout = self._read_exact(stdout_size)
+        stderr = self._read_exact(stderr_size)
+        return ExecResult(
+            returncode=returncode,
+            stdout=stdout.decode('utf-8', errors='replace'),
+            stderr=stderr.decode('utf-8', errors='replace'),
+        )
+
+    def _describe_failure(self) -> str:
+        if self._timed_out:
+            return f'no reply within {self.timeout}s' if self.timeout else 'interrupted'
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                pass
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=1)
+        details = ' '.join(self._stderr_tail)
+        return details or 'no output from docker exec'
+
+    def _build_script(self, request_id: str, command: str, input_data: str = None, shell: bool = False) -> str:
+        if shell:
+            args = '{ ' + command + '\n}'
+        else:
+            args = ' '.join(shlex.quote(part) for part in command.split())
+        script = f'{args} >"$ENL_TMP/out" 2>"$ENL_TMP/err"'
+        if input_data is not None:
+            delimiter = f'ENL_INPUT_{self._session_id}_{request_id}'
+            if not input_data.endswith('\n'):
+                input_data += '\n'
+            script += f" <<'{delimiter}'\n{input_data}{delimiter}"
+        else:
+            script += ' </dev/null'
+        script += (
+            '\nENL_RC=$?\n'
+            f"printf '{FRAME_PREFIX} %s %s %s %s\\n' {request_id} \"$ENL_RC\" "
+            '"$(wc -c <"$ENL_TMP/out")" "$(wc -c <"$ENL_TMP/err")"\n'
+            'cat "$ENL_TMP/out" "$ENL_TMP/err"\n'
+        )
+        return script
+
+    def execute(self, command: str, input_data: str = None, shell: bool = False) -> ExecResult:
+        """Run a command in the container through the shared shell.
+
+        Args:
+            command: Command line to run (split on whitespace, like `docker exec`)
+            input_data: Optional text passed to the command stdin
+            shell: Pass the command to the shell verbatim (pipelines, fallbacks)
+
+        Returns:
+            ExecResult with the command return code, stdout and stderr
+        """
+        return self.execute_batch([command], input_data=[input_data], shell=shell)[0]
+
+    def execute_batch(self, commands: List[str], input_data: List[Optional[str]] = None, shell: bool = False) -> List[ExecResult]:
+        """Run several commands in a single round trip.
+
+        All requests are written to the shell at once and the replies are read back
+        in order, so the cost of the transport (and ssh) is paid only once.
+
+        Args:
+            commands: Command lines to run
+            input_data: Optional stdin text for each command (same length as commands)
+            shell: Pass the commands to the shell verbatim
+
+        Returns:
+            One ExecResult per command, in the same order
+        """
+        if input_data is None:
+            input_data = [None] * len(commands)
+        with self._lock:
+            self._timed_out = False
+            watchdog = threading.Timer(self.timeout, self._expire) if self.timeout else None
+            if watchdog is not None:
+                watchdog.daemon = True
+                watchdog.start()
+            request_ids = [str(next(self._request_ids)) for _ in commands]
+            script = ''.join(
+                self._build_script(request_id, command, data, shell=shell)
+                for request_id, command, data in zip(request_ids, commands, input_data)
+            )
+            try:
+                if not self.is_alive():
+                    self._start()
+                try:
+                    self._write(script)
+                except OSError:
+                    # Shell died between requests (container restart): the requests were
+                    # not delivered, so it is safe to reconnect and send them once more.
+                    self._start()
+                    self._write(script)
+                return [self._read_reply(request_id) for request_id in request_ids]
+            except (OSError, ValueError, DockerSessionError) as e:
+                self._kill()
+                if self._timed_out:
+                    raise DockerSessionTimeout(f"Session closed: {self._describe_failure()}") from e
+                if isinstance(e, DockerSessionError):
+                    raise
+                raise DockerSessionError(f"Session error: {str(e)}") from e
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
@@ -0,0 +1,44 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to the min and max point of each of `buckets` equal x ranges.
+
+    With one bucket per pixel column the line looks the same as with every point
+    drawn (spikes included), while at most `2 * buckets + 2` points are left. `x`
+    must be sorted. NaN values are gaps: a bucket holding only NaN keeps one NaN
+    point, so the gap still breaks the line. Points are returned in x order.
+    """
+    count = len(x)
+    if buckets <= 0 or count <= 2 * buckets + 2:
+        return x, y
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    span = x[-1] - x[0]
+    if span <= 0:
+        return x[[0, -1]], y[[0, -1]]
+
+    bucket_ids = np.minimum(((x - x[0]) * (buckets / span)).astype(np.int64), buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+    sizes = np.diff(np.r_[starts, count])
+    segment = np.repeat(np.arange(len(starts)), sizes)  # bucket index of every point
+
+    finite = np.isfinite(y)
+    mins = np.minimum.reduceat(np.where(finite, y, np.inf), starts)
+    maxs = np.maximum.reduceat(np.where(finite, y, -np.inf), starts)
+    # first point of each bucket equal to its min / max (none for all-NaN buckets)
+    is_min = finite & (y == mins[segment])
+    is_max = finite & (y == maxs[segment])
+    _, min_first = np.unique(segment[is_min], return_index=True)
+    _, max_first = np.unique(segment[is_max], return_index=True)
+    empty = starts[~np.isfinite(mins)]
+
+    keep = np.unique(np.concatenate([
+        [0, count - 1],
+        np.flatnonzero(is_min)[min_first],
+        np.flatnonzero(is_max)[max_first],
+        empty,
+    ]))
+    return x[keep], y[keep]
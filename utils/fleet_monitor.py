@@ -0,0 +1,211 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from models.NodeHistory import NodeHistory, NodeHistoryBuffer
+from models.NodeInfo import NodeInfo
+from .docker_commands import build_node_history_command
+from .docker_session import DockerExecSession, DockerSessionError, DockerSessionTimeout
+
+
+@dataclass
+class FleetNodeStatus:
+    """ Latest known state of one fleet host """
+    host: str
+    running: bool = False
+    alias: str = ''
+    address: str = ''
+    version: str = ''
+    uptime: str = ''
+    epoch_avail: Optional[float] = None
+    cpu_load: Optional[float] = None
+    gpu_load: Optional[float] = None
+    error: Optional[str] = None
+    timed_out: bool = False  # last poll got no reply in time, `running` is the previous state
+    poll_seconds: float = 0.0
+    history: Optional[NodeHistoryBuffer] = field(default=None, repr=False)
+
+
+@dataclass
+class _PollResult:
+    host: str
+    node_info: Optional[NodeInfo] = None
+    node_history: Optional[NodeHistory] = None
+    running: bool = True
+    timed_out: bool = False
+    error: Optional[str] = None
+    poll_seconds: float = 0.0
+
+
+class FleetMonitor(QObject):
+    """ Polls the edge node of every fleet host on a bounded schedule.
+
+    Each host is polled every `interval` seconds through its own `docker exec`
+    session over ssh (node info and the history delta in one round trip). First
+    polls are spread over the interval, at most `max_workers` polls run at once and
+    a host is never polled again while its previous poll is in flight, so the load
+    on the launcher stays bounded whatever the fleet size. A poll taking longer than
+    `exec_timeout` kills the session of its host and counts as a failure, so a hung
+    host frees its worker. Failing hosts back off up to `max_interval`.
+
+    Results are delivered on the GUI thread through `node_updated`.
+    """
+    node_updated = pyqtSignal(str, object)  # host, FleetNodeStatus
+    _poll_done = pyqtSignal(object)
+
+    def __init__(self, max_workers: int = 8, interval: float = 30, max_interval: float = 300,
+                 connect_timeout: int = 5, history_points: int = 60, exec_timeout: float = 60,
+                 parent: QObject = None):
+        super().__init__(parent)
+        self.exec_timeout = exec_timeout
+        self.max_workers = max_workers
+        self.interval = interval
+        self.max_interval = max_interval
+        self.connect_timeout = connect_timeout
+        self.history_points = history_points
+        self.status: Dict[str, FleetNodeStatus] = {}
+        self._commands: Dict[str, List[str]] = {}
+        self._sessions: Dict[str, DockerExecSession] = {}
+        self._sessions_lock = threading.Lock()
+        self._next_due: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._in_flight = set()
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fleet_poll')
+        self._poll_done.connect(self._on_poll_done)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._schedule)
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self, hosts: Dict[str, List[str]], container_name: str) -> None:
+        """Start polling `hosts` (name -> ssh command), replacing the current fleet."""
+        self.stop()
+        self._generation += 1
+        self.container_name = container_name
+        self._commands = {host: list(command) for host, command in hosts.items()}
+        now = monotonic()
+        step = self.interval / max(len(hosts), 1)
+        for index, host in enumerate(hosts):
+            if host not in self.status:
+                self.status[host] = FleetNodeStatus(host=host, history=NodeHistoryBuffer(self.history_points))
+            self._next_due[host] = now + index * step
+            self._failures[host] = 0
+        for host in list(self.status):
+            if host not in self._commands:
+                del self.status[host]
+        self._timer.start(1000)
+        self._schedule()
+
+    def stop(self) -> None:
+        """Stop polling and close the exec sessions. Polls in flight are discarded."""
+        self._timer.stop()
+        self._generation += 1
+        self._in_flight.clear()
+        self._next_due.clear()
+        with self._sessions_lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            # closing waits for a poll still using the session, keep it off the GUI thread
+            self._executor.submit(session.close)
+
+    def shutdown(self) -> None:
+        self.stop()
+        self._executor.shutdown(wait=False)
+
+    def poll_now(self, host: str) -> None:
+        """Poll `host` at the next scheduling tick."""
+        if host in self._next_due:
+            self._next_due[host] = 0
+            self._schedule()
+
+    def _schedule(self) -> None:
+        now = monotonic()
+        free = self.max_workers - len(self._in_flight)
+        due = sorted(
+            (due_at, host) for host, due_at in self._next_due.items()
+            if due_at <= now and host not in self._in_flight
+        )
+        for _, host in due[:max(free, 0)]:
+            buffer = self.status[host].history
+            self._in_flight.add(host)
+            self._executor.submit(self._poll, host, buffer.last_timestamp, self._generation)
+
+    def _get_session(self, host: str) -> DockerExecSession:
+        with self._sessions_lock:
+            session = self._sessions.get(host)
+            if session is None:
+                ssh_command = self._commands[host] + ['-o', f'ConnectTimeout={self.connect_timeout}', '-o', 'BatchMode=yes']
+                session = DockerExecSession(self.container_name, ssh_command, timeout=self.exec_timeout)
+                self._sessions[host] = session
+            return session
+
+    def _poll(self, host: str, since: Optional[str], generation: int) -> None:
+        start = monotonic()
+        result = _PollResult(host=host)
+        try:
+            if generation != self._generation:
+                return
+            commands = ['get_node_info', build_node_history_command(since)]
+            info_result, history_result = self._get_session(host).execute_batch(commands, shell=True)
+            if info_result.returncode == 0:
+                result.node_info = NodeInfo.from_dict(json.loads(info_result.stdout))
+            if history_result.returncode == 0:
+                result.node_history = NodeHistory.from_dict(json.loads(history_result.stdout))
+            if result.node_info is None and result.node_history is None:
+                result.error = (info_result.stderr or history_result.stderr).strip() or 'no data from node'
+        except DockerSessionTimeout as e:
+            # slow host or hung link: an error, the container state is unknown
+            result.timed_out = True
+            result.error = str(e)
+        except DockerSessionError as e:
+            # ssh or docker exec failed: host unreachable or container not running
+            result.running = False
+            result.error = str(e)
+        except Exception as e:
+            result.error = str(e)
+        result.poll_seconds = monotonic() - start
+        self._poll_done.emit((generation, result))
+
+    def _on_poll_done(self, payload) -> None:
+        generation, result = payload
+        if generation != self._generation or result.host not in self.status:
+            return
+        host = result.host
+        self._in_flight.discard(host)
+        status = self.status[host]
+        if not result.timed_out:
+            status.running = result.running
+        status.error = result.error
+        status.timed_out = result.timed_out
+        status.poll_seconds = result.poll_seconds
+        if result.node_info is not None:
+            status.alias = result.node_info.alias
+            status.address = result.node_info.address
+            status.version = result.node_info.version_short
+        if result.node_history is not None:
+            history = result.node_history
+            status.history.merge(history)
+            status.uptime = history.uptime
+            status.epoch_avail = history.current_epoch_avail
+            status.version = history.version or status.version
+            status.cpu_load = history.cpu_load[-1] if history.cpu_load else status.cpu_load
+            status.gpu_load = history.gpu_load[-1] if history.gpu_load else None
+        elif not result.running:
+            status.uptime = ''
+            status.epoch_avail = None
+            status.cpu_load = None
+            status.gpu_load = None
+
+        # back off hosts that keep failing, so dead nodes cost less than live ones
+        self._failures[host] = 0 if result.error is None else self._failures[host] + 1
+        delay = min(self.interval * (2 ** self._failures[host]), self.max_interval)
+        self._next_due[host] = monotonic() + delay
+        self.node_updated.emit(host, status)
+        self._schedule()
@@ -0,0 +1,112 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Dict, List
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .process_runner import run_process
+
+
+class FleetScanner(QObject):
+    """ Checks SSH reachability of many hosts with a bounded pool of workers.
+
+    At most `max_workers` ssh processes run at once, each limited by `timeout`.
+    Results are delivered one by one through `host_checked` (queued to the GUI
+    thread) as soon as each host answers.
+
+    Cancellation is cooperative: every host has a token that is bumped when its
+    check is superseded (a new scan, `cancel`), queued checks with an old token are
+    skipped, running ssh processes are killed and late results are dropped. Worker
+    threads are never terminated.
+    """
+    host_checked = pyqtSignal(str, bool, float)  # host, is_online, latency in seconds
+    scan_finished = pyqtSignal()
+
+    def __init__(self, max_workers: int = 16, timeout: int = 3, parent: QObject = None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fleet_scan')
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}  # host -> token of the check not finished yet
+        self._cancel_events: Dict[str, threading.Event] = {}  # host -> cancel event of the running check
+        self._next_token = 0
+
+    def _issue_token(self, host: str) -> int:
+        self._next_token += 1
+        self._tokens[host] = self._next_token
+        self._pending[host] = self._next_token
+        return self._next_token
+
+    def _is_current(self, host: str, token: int) -> bool:
+        return self._tokens.get(host) == token
+
+    def is_checking(self, host: str) -> bool:
+        """True while a check of `host` is queued or running."""
+        with self._lock:
+            return host in self._pending
+
+    def check(self, host: str, ssh_command: List[str]) -> None:
+        """Check one host, superseding any check of the same host still in flight."""
+        with self._lock:
+            self._kill(host)
+            token = self._issue_token(host)
+        self._executor.submit(self._run_check, host, list(ssh_command), token)
+
+    def scan(self, hosts: Dict[str, List[str]]) -> None:
+        """Check all `hosts` (name -> ssh command), cancelling the previous scan."""
+        self.cancel()
+        for host, ssh_command in hosts.items():
+            self.check(host, ssh_command)
+
+    def cancel(self) -> None:
+        """Drop every queued check and stop the running ones."""
+        with self._lock:
+            for host in list(self._pending):
+                self._kill(host)
+                self._tokens[host] = -1
+            self._pending.clear()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _kill(self, host: str) -> None:
+        cancel_event = self._cancel_events.pop(host, None)
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def _run_check(self, host: str, ssh_command: List[str], token: int) -> None:
+        cancel_event = threading.Event()
+        with self._lock:
+            if not self._is_current(host, token):
+                return  # cancelled while queued
+            self._cancel_events[host] = cancel_event
+        # ssh keeps the first value of an option: placed before the connection sharing options of the
+        # pooled command, so a probe may use an open master but never leaves a new one behind per host
+        command = ssh_command[:1] + ['-o', 'ControlMaster=no'] + ssh_command[1:] + [
+            '-o', f'ConnectTimeout={self.timeout}', '-o', 'BatchMode=yes', 'exit'
+        ]
+        start = monotonic()
+        is_online = False
+        try:
+            # the ssh ConnectTimeout does not cover a stalled handshake, so bound the whole check
+            result = run_process(
+                command, timeout=self.timeout + 1, cancel_event=cancel_event, max_output=4096, name='ssh.check'
+            )
+            is_online = result.ok
+        except Exception as e:
+            print(f"SSH check error for {host}: {str(e)}")
+        latency = monotonic() - start
+
+        with self._lock:
+            if self._cancel_events.get(host) is cancel_event:
+                self._cancel_events.pop(host, None)
+            if not self._is_current(host, token):
+                return  # superseded, a newer check reports this host
+            self._pending.pop(host, None)
+            finished = not self._pending
+        self.host_checked.emit(host, is_online, latency)
+        if finished:
+            self.scan_finished.emit()
@@ -0,0 +1,159 @@
+import json
+import threading
+from pathlib import Path
+from time import time
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .docker_api import DockerAPIError
+from .process_runner import run_process
+
+
+DOCKER_HUB_AUTH_URL = 'https://auth.docker.io/token'
+DOCKER_HUB_REGISTRY_URL = 'https://registry-1.docker.io'
+
+# accept multi-arch indexes first: that is the digest `docker pull <tag>` records in RepoDigests
+MANIFEST_ACCEPT = ', '.join([
+    'application/vnd.oci.image.index.v1+json',
+    'application/vnd.docker.distribution.manifest.list.v2+json',
+    'application/vnd.oci.image.manifest.v1+json',
+    'application/vnd.docker.distribution.manifest.v2+json',
+])
+
+
+def split_image(image: str) -> Tuple[str, str]:
+    """Split `repo[:tag]` into (repository, tag), defaulting to `latest`."""
+    repository, _, tag = image.rpartition(':')
+    if not repository or '/' in tag:
+        return image, 'latest'
+    return repository, tag
+
+
+def get_local_digests(image: str, command_prefix: List[str] = None, api_client=None, timeout: float = 30) -> List[str]:
+    """Return the manifest digests (`sha256:...`) recorded for a local image."""
+    if api_client is not None:
+        try:
+            repo_digests = (api_client.inspect_image(image) or {}).get('RepoDigests') or []
+        except (DockerAPIError, OSError):
+            return []
+        return [digest.split('@', 1)[1] for digest in repo_digests if '@' in digest]
+    command = list(command_prefix or []) + [
+        'docker', 'image', 'inspect', '--format', '{{json .RepoDigests}}', image
+    ]
+    try:
+        result = run_process(command, timeout=timeout, name='docker.image_inspect')
+        if not result.ok:
+            return []
+        repo_digests = json.loads(result.stdout.strip() or '[]') or []
+    except (OSError, ValueError):
+        return []
+    return [digest.split('@', 1)[1] for digest in repo_digests if '@' in digest]
+
+
+def get_remote_digest(image: str, registry_url: Optional[str] = None, timeout: float = 5) -> Optional[str]:
+    """Return the manifest digest of `image` in the registry, None when it cannot be read.
+
+    Docker Hub is queried with an anonymous pull token. A mirror given as
+    `registry_url` is expected to serve the registry v2 API without auth.
+    """
+    import requests  # imported on first use, it is slow to load and not needed at startup
+
+    repository, tag = split_image(image)
+    headers = {'Accept': MANIFEST_ACCEPT}
+    if registry_url is None:
+        registry_url = DOCKER_HUB_REGISTRY_URL
+        if '/' not in repository:
+            repository = f'library/{repository}'
+        response = requests.get(
+            DOCKER_HUB_AUTH_URL,
+            params={'service': 'registry.docker.io', 'scope': f'repository:{repository}:pull'},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        headers['Authorization'] = f"Bearer {response.json()['token']}"
+    response = requests.head(
+        f"{registry_url.rstrip('/')}/v2/{repository}/manifests/{tag}",
+        headers=headers,
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response.headers.get('Docker-Content-Digest')
+
+
+class ImageDigestCache:
+    """ Remote image digests cached on disk, so repeated launches skip the registry round trip """
+
+    def __init__(self, cache_file: Path, ttl: float, registry_url: Optional[str] = None, api_client=None):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.registry_url = registry_url
+        self.api_client = api_client
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: dict) -> None:
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(data, f, indent=2)
+        except OSError:
+            pass
+
+    def remote_digest(self, image: str, refresh: bool = False) -> Optional[str]:
+        """Return the registry digest of `image`, from the cache while it is fresh."""
+        with self._lock:
+            data = self._load()
+            entry = data.get(image)
+            if not refresh and entry and time() - entry.get('checked_at', 0) < self.ttl:
+                return entry.get('digest')
+            try:
+                digest = get_remote_digest(image, self.registry_url)
+            except (OSError, KeyError, ValueError):  # requests errors are OSErrors
+                # registry unreachable: fall back to the last known digest, if any
+                return entry.get('digest') if entry else None
+            data[image] = {'digest': digest, 'checked_at': time()}
+            self._save(data)
+            return digest
+
+    def is_up_to_date(self, image: str, command_prefix: List[str] = None) -> Tuple[bool, str]:
+        """Check whether the local image already matches the registry.
+
+        Returns:
+            Tuple of (up_to_date, reason)
+        """
+        local_digests = get_local_digests(image, command_prefix, api_client=self.api_client)
+        if not local_digests:
+            return False, 'image not found locally'
+        remote_digest = self.remote_digest(image)
+        if remote_digest is None:
+            return False, 'registry digest unavailable'
+        if remote_digest in local_digests:
+            return True, f'local image matches {remote_digest[:19]}'
+        # the tag moved: refresh a possibly stale cached digest before deciding
+        remote_digest = self.remote_digest(image, refresh=True)
+        if remote_digest in local_digests:
+            return True, f'local image matches {remote_digest[:19]}'
+        return False, f'registry has {remote_digest[:19] if remote_digest else "unknown"}'
+
+
+class ImageDigestCheckThread(QThread):
+    """ Pre-checks the image digest in the background, before the user launches the node """
+    check_finished = pyqtSignal(bool, str)  # up_to_date, reason
+
+    def __init__(self, digest_cache: ImageDigestCache, image: str):
+        super().__init__()
+        self.digest_cache = digest_cache
+        self.image = image
+
+    def run(self):
+        try:
+            up_to_date, reason = self.digest_cache.is_up_to_date(self.image)
+        except Exception as e:
+            up_to_date, reason = False, str(e)
+        self.check_finished.emit(up_to_date, reason)
@@ -0,0 +1,142 @@
+"""Timings of the launcher hot paths.
+
+Operations are timed with `timed` (a context manager) or `timer` (a decorator)
+and aggregated per operation name in `instrumentation`: call and error counts,
+total and max time, and the p50 / p95 / p99 of the last `max_samples` calls.
+Levels such as queue depths are tracked with `instrumentation.gauge`.
+`instrumentation.report()` returns everything as a JSON-ready dict.
+"""
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter, time
+from typing import Callable, Deque, Dict, Optional
+
+import numpy as np
+
+
+class OperationStats:
+    """ Durations (seconds) of one operation """
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+    def add(self, seconds: float, error: bool = False) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.samples.append(seconds)
+
+    def summary(self) -> dict:
+        p50, p95, p99 = np.percentile(np.fromiter(self.samples, float), [50, 95, 99]) if self.samples else (0, 0, 0)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': float(p50),
+            'p95': float(p95),
+            'p99': float(p99),
+            'max': self.max,
+            'last': self.last,
+        }
+
+
+class Instrumentation:
+    """ Thread safe registry of operation timings """
+
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.enabled = True
+        self.started_at = time()
+        self._stats: Dict[str, OperationStats] = {}
+        self._gauges: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, error: bool = False) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = OperationStats(self.max_samples)
+            stats.add(seconds, error)
+
+    def gauge(self, name: str, value: float) -> None:
+        """Set the current value of a level (e.g. a queue depth), its peak is kept too."""
+        if not self.enabled:
+            return
+        with self._lock:
+            gauge = self._gauges.setdefault(name, {'value': value, 'max': value})
+            gauge['value'] = value
+            gauge['max'] = max(gauge['max'], value)
+
+    def gauges(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: dict(gauge) for name, gauge in sorted(self._gauges.items())}
+
+    @contextmanager
+    def timed(self, name: str):
+        """Time the block as `name`; a block left by an exception counts as an error."""
+        start = perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, perf_counter() - start, error)
+
+    def timer(self, name: Optional[str] = None) -> Callable:
+        """Decorator timing every call of the function, as `name` or its qualified name."""
+        def decorator(func):
+            operation = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(operation):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self._stats.items())}
+
+    def report(self) -> dict:
+        return {
+            'started_at': self.started_at,
+            'generated_at': time(),
+            'operations': self.summary(),
+            'gauges': self.gauges(),
+        }
+
+    def save(self, path, **extra) -> None:
+        """Write the report (and the `extra` sections) as JSON."""
+        try:
+            with open(path, 'w') as f:
+                json.dump({**self.report(), **extra}, f, indent=2)
+        except OSError:
+            pass
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            for gauge in self._gauges.values():
+                gauge['max'] = gauge['value']
+            self.started_at = time()
+
+
+instrumentation = Instrumentation()
+timed = instrumentation.timed
+timer = instrumentation.timer
@@ -0,0 +1,86 @@
+import logging
+import queue
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QPlainTextEdit
+
+
+class LogPipeline(QObject):
+    """ Buffered log sink for the launcher log view.
+
+    `put` only enqueues the line and is safe to call from any thread. A timer on the
+    GUI thread drains the queue in batches, appending each batch to a
+    QPlainTextEdit with a bounded block count, and optionally to a rotating log
+    file, so the cost per line stays flat no matter how long the session runs.
+    """
+
+    def __init__(self, parent: QObject = None, max_lines: int = 5000, flush_interval: int = 200,
+                 max_batch: int = 500, log_file: Optional[Path] = None,
+                 max_file_bytes: int = 5 * 1024 * 1024, file_backups: int = 3):
+        super().__init__(parent)
+        self.max_lines = max_lines
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._view: Optional[QPlainTextEdit] = None
+        self._file_logger = self._create_file_logger(log_file, max_file_bytes, file_backups)
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_interval)
+        self._timer.timeout.connect(self.flush)
+
+    @staticmethod
+    def _create_file_logger(log_file: Optional[Path], max_bytes: int, backups: int) -> Optional[logging.Logger]:
+        if log_file is None:
+            return None
+        try:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+        except OSError as e:
+            print(f"Log file disabled, could not open {log_file}: {e}", flush=True)
+            return None
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger = logging.getLogger(f'{__name__}.{id(handler)}')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        return logger
+
+    def attach(self, view: QPlainTextEdit) -> None:
+        """Start flushing into `view`. Lines logged before this call are kept queued."""
+        self._view = view
+        self._view.setMaximumBlockCount(self.max_lines)
+        self._timer.start()
+
+    def put(self, line: str) -> None:
+        """Queue a line for display (thread-safe)."""
+        self._queue.put(line)
+
+    def flush(self, limit: Optional[int] = None) -> None:
+        """Move up to `limit` queued lines (the batch size by default) to the view and file."""
+        limit = self.max_batch if limit is None else limit
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return
+        text = '\n'.join(batch)
+        if self._view is not None:
+            # one append per batch; the view drops the oldest blocks past max_lines
+            self._view.appendPlainText(text)
+        if self._file_logger is not None:
+            self._file_logger.info(text)
+
+    def close(self) -> None:
+        """Flush every pending line and release the log file."""
+        self._timer.stop()
+        self.flush(limit=self._queue.qsize() + self.max_batch)
+        if self._file_logger is not None:
+            for handler in list(self._file_logger.handlers):
+                handler.close()
+                self._file_logger.removeHandler(handler)
+            self._file_logger = None
@@ -0,0 +1,195 @@
+"""Every external process of the launcher is started here.
+
+`run_process` runs a command to completion with a timeout, a cancel event that
+is checked while it runs, a cap on the captured output and incremental UTF-8
+decoding (optionally line by line, for progress output). Its duration is
+recorded in `instrumentation` as `process.<name>`. `popen` starts the long-lived
+processes (event streams, exec sessions) that are read by their owner.
+
+Both hide the console window on Windows, so callers never branch on `os.name`.
+"""
+import codecs
+import os
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Callable, List, Optional
+
+from .instrumentation import instrumentation
+
+
+NO_WINDOW = {'creationflags': subprocess.CREATE_NO_WINDOW} if os.name == 'nt' else {}
+
+DEFAULT_TIMEOUT = 60  # seconds
+MAX_OUTPUT = 4 * 1024 * 1024  # characters kept per stream, the rest is read and dropped
+POLL_INTERVAL = 0.1  # seconds between two checks of the cancel event
+READ_SIZE = 64 * 1024
+READER_JOIN_TIMEOUT = 2  # seconds; a background child (e.g. an ssh master) may keep the pipes open
+
+
+@dataclass
+class ProcessResult:
+    """ Outcome of `run_process`, usable where a CompletedProcess was """
+    args: List[str]
+    returncode: int
+    stdout: str = ''
+    stderr: str = ''
+    duration: float = 0.0
+    timed_out: bool = False
+    cancelled: bool = False
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+
+class ProcessError(Exception):
+    """ A command that could not complete successfully """
+
+    def __init__(self, result: ProcessResult):
+        self.result = result
+        if result.timed_out:
+            reason = f'timed out after {result.duration:.0f}s'
+        elif result.cancelled:
+            reason = 'cancelled'
+        else:
+            reason = f'exit code {result.returncode}'
+        output = (result.stderr or result.stdout).strip()
+        super().__init__(f"{' '.join(result.args)}: {reason}" + (f'\n{output}' if output else ''))
+
+
+@dataclass
+class _Capture:
+    """ Reads one pipe on a thread, keeping at most `limit` characters """
+    stream: object
+    limit: int
+    on_line: Optional[Callable[[str], None]] = None
+    chunks: List[str] = field(default_factory=list)
+    size: int = 0
+    truncated: bool = False
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self._read, daemon=True)
+        thread.start()
+        return thread
+
+    def _keep(self, text: str) -> None:
+        room = self.limit - self.size
+        if len(text) > room:
+            text = text[:max(room, 0)]
+            self.truncated = True
+        if text:
+            self.chunks.append(text)
+            self.size += len(text)
+
+    def _read(self) -> None:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ''  # last, unterminated line
+        try:
+            while True:
+                data = self.stream.read1(READ_SIZE)
+                text = decoder.decode(data, final=not data)
+                self._keep(text)
+                if self.on_line is not None:
+                    *lines, pending = (pending + text).split('\n')
+                    for line in lines:
+                        self.on_line(line)
+                if not data:
+                    break
+        except (OSError, ValueError):
+            pass  # pipe closed under us (process killed)
+        if self.on_line is not None and pending:
+            self.on_line(pending)
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.chunks)
+
+
+def _write_input(stream, input_data: str) -> None:
+    try:
+        stream.write(input_data.encode('utf-8'))
+        stream.close()
+    except OSError:
+        pass  # exited without reading its input, the return code tells why
+
+
+def popen(command: List[str], **kwargs) -> subprocess.Popen:
+    """Start a process that is read by the caller (streams, sessions)."""
+    return subprocess.Popen(command, **NO_WINDOW, **kwargs)
+
+
+def run_process(command: List[str], input_data: Optional[str] = None, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                cancel_event: Optional[threading.Event] = None, max_output: int = MAX_OUTPUT,
+                merge_stderr: bool = False, on_line: Optional[Callable[[str], None]] = None,
+                name: Optional[str] = None) -> ProcessResult:
+    """Run a command to completion and capture its output.
+
+    The process is killed when `timeout` (seconds, None for no limit) expires or
+    `cancel_event` is set; the result then has `timed_out` / `cancelled` set and a
+    note in stderr. OSError (e.g. FileNotFoundError) is raised when it cannot start.
+
+    Args:
+        input_data: Text written to the stdin of the command
+        max_output: Characters kept from each of stdout and stderr
+        merge_stderr: Capture stderr into stdout
+        on_line: Called with every stdout line (without the newline), on a reader thread
+        name: Metric name, `process.<name>`; defaults to the executable name
+    """
+    name = name or os.path.basename(command[0])
+    start = monotonic()
+    process = popen(
+        command,
+        stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+    )
+    captures = [_Capture(process.stdout, max_output, on_line)]
+    if not merge_stderr:
+        captures.append(_Capture(process.stderr, max_output))
+    readers = [capture.start() for capture in captures]
+
+    if input_data is not None:
+        # written on a thread too, a command that does not read its input must not block the timeout
+        threading.Thread(target=_write_input, args=(process.stdin, input_data), daemon=True).start()
+
+    timed_out = cancelled = False
+    deadline = None if timeout is None else start + timeout
+    while True:
+        try:
+            process.wait(timeout=POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+            elif deadline is not None and monotonic() >= deadline:
+                timed_out = True
+            else:
+                continue
+            process.kill()
+            process.wait()
+            break
+    join_deadline = monotonic() + READER_JOIN_TIMEOUT
+    for reader in readers:
+        reader.join(max(join_deadline - monotonic(), 0))
+
+    result = ProcessResult(
+        args=list(command),
+        returncode=process.returncode,
+        stdout=captures[0].text,
+        stderr='' if merge_stderr else captures[1].text,
+        duration=monotonic() - start,
+        timed_out=timed_out,
+        cancelled=cancelled,
+        truncated=any(capture.truncated for capture in captures),
+    )
+    if timed_out or cancelled:
+        note = f'[timed out after {timeout}s]' if timed_out else '[cancelled]'
+        if merge_stderr:
+            result.stdout = '\n'.join(filter(None, [result.stdout.rstrip('\n'), note]))
+        else:
+            result.stderr = '\n'.join(filter(None, [result.stderr.rstrip('\n'), note]))
+    instrumentation.record(f'process.{name}', result.duration, error=not result.ok)
+    return result
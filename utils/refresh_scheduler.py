@@ -0,0 +1,127 @@
+import random
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, QTimer
+
+
+@dataclass
+class RefreshSource:
+    """ One periodically refreshed data source and its intervals (seconds) """
+    name: str
+    callback: Callable[[], None]
+    interval: float
+    fast_interval: Optional[float] = None  # used while a transition is in progress
+    max_interval: Optional[float] = None  # backoff limit, None for a fixed interval
+    backoff: float = 1.5
+    first_delay: Optional[float] = None  # delay of the first run, defaults to the interval
+    current: float = 0.0
+    last_run: float = 0.0
+    timer: Optional[QTimer] = field(default=None, repr=False)
+
+
+class RefreshScheduler(QObject):
+    """ Runs each data source on its own adaptive interval.
+
+    - A source whose data did not change (see `report`) is polled less and less
+      often, up to its `max_interval`; new data resets it to the base interval.
+    - While the window is hidden, backoff sources poll at their `max_interval`.
+    - During transitions (`set_fast`) sources with a `fast_interval` poll at that rate.
+    - Every delay gets +/- `jitter` (a fraction) so several launchers or hosts do
+      not poll in lockstep.
+    """
+
+    def __init__(self, jitter: float = 0.1, parent: QObject = None):
+        super().__init__(parent)
+        self.jitter = jitter
+        self.sources: Dict[str, RefreshSource] = {}
+        self._fast = False
+        self._hidden = False
+        self._running = False
+
+    def add_source(self, name: str, callback: Callable[[], None], interval: float,
+                   fast_interval: float = None, max_interval: float = None, backoff: float = 1.5,
+                   first_delay: float = None) -> None:
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._run(name))
+        self.sources[name] = RefreshSource(
+            name=name, callback=callback, interval=interval, fast_interval=fast_interval,
+            max_interval=max_interval, backoff=backoff, first_delay=first_delay, current=interval, timer=timer,
+        )
+
+    def start(self) -> None:
+        self._running = True
+        for source in self.sources.values():
+            delay = self._delay(source) if source.first_delay is None else source.first_delay
+            self._schedule(source, delay)
+
+    def stop(self) -> None:
+        self._running = False
+        for source in self.sources.values():
+            source.timer.stop()
+
+    def _delay(self, source: RefreshSource) -> float:
+        if self._fast and source.fast_interval is not None:
+            delay = source.fast_interval
+        elif self._hidden and source.max_interval is not None:
+            delay = source.max_interval
+        else:
+            delay = source.current
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _schedule(self, source: RefreshSource, delay: float) -> None:
+        if self._running:
+            source.timer.start(max(int(delay * 1000), 0))
+
+    def _reschedule(self, source: RefreshSource) -> None:
+        """Move the next run to `last_run + delay`, now when that is already past."""
+        elapsed = monotonic() - source.last_run if source.last_run else 0
+        self._schedule(source, self._delay(source) - elapsed)
+
+    def _run(self, name: str) -> None:
+        source = self.sources[name]
+        source.last_run = monotonic()
+        self._schedule(source, self._delay(source))
+        source.callback()
+
+    def report(self, name: str, changed: bool) -> None:
+        """Tell the scheduler whether the last refresh of `name` brought new data."""
+        source = self.sources.get(name)
+        if source is None or source.max_interval is None:
+            return
+        previous = source.current
+        if changed:
+            source.current = source.interval
+        else:
+            source.current = min(source.current * source.backoff, source.max_interval)
+        if source.current != previous and not self._fast:
+            self._reschedule(source)
+
+    def trigger(self, name: str) -> None:
+        """Refresh `name` now and restart its backoff."""
+        source = self.sources[name]
+        source.current = source.interval
+        if self._running:
+            self._run(name)
+
+    def set_fast(self, fast: bool) -> None:
+        """Poll at the fast intervals while a launch / stop / restart is in progress."""
+        if fast == self._fast:
+            return
+        self._fast = fast
+        for source in self.sources.values():
+            if source.fast_interval is not None:
+                if not fast:
+                    source.current = source.interval
+                self._reschedule(source)
+
+    def set_hidden(self, hidden: bool) -> None:
+        """Back off while the window is minimized; catch up when it is shown again."""
+        if hidden == self._hidden:
+            return
+        self._hidden = hidden
+        for source in self.sources.values():
+            if source.max_interval is not None:
+                self._reschedule(source)
@@ -0,0 +1,101 @@
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from .const import HOME_SUBFOLDER, SSH_CONTROL_PERSIST, SSH_MULTIPLEXING, SSH_SERVER_ALIVE_INTERVAL
+from .process_runner import run_process
+
+
+class SSHControlPool:
+    """ One multiplexed OpenSSH master connection per remote host.
+
+    `apply` adds ControlMaster/ControlPersist options to an ssh command line: the
+    first command to a host opens a background master and every later command
+    (docker exec sessions, service restarts, status checks) runs as a new channel
+    on it, skipping the TCP and key exchange handshakes. A master that has been
+    idle for `persist` seconds exits on its own; `close_all` ends the remaining ones
+    in the background when the launcher quits.
+
+    Multiplexing is not supported by the Windows OpenSSH client, where commands are
+    returned unchanged.
+    """
+
+    def __init__(self, control_dir: Path, persist: int = 300, server_alive_interval: int = 10,
+                 enabled: bool = True):
+        self.control_dir = control_dir
+        self.persist = persist
+        self.server_alive_interval = server_alive_interval
+        self.enabled = enabled and os.name != 'nt' and not any(c.isspace() for c in str(control_dir))
+        self._lock = threading.Lock()
+        self._masters = {}  # command key -> ssh command used to reach the host
+        self._dir_ready = False
+
+    def _ensure_dir(self) -> bool:
+        if not self._dir_ready:
+            try:
+                self.control_dir.mkdir(parents=True, exist_ok=True)
+                os.chmod(self.control_dir, 0o700)
+                self._dir_ready = True
+            except OSError:
+                self.enabled = False
+        return self._dir_ready
+
+    def _options(self) -> List[str]:
+        # %C is a hash of local host, remote host, port and user: short and unique per host
+        return [
+            '-o', 'ControlMaster=auto',
+            '-o', f'ControlPath={self.control_dir / "%C"}',
+            '-o', f'ControlPersist={self.persist}',
+            # let a master on a dead link exit instead of hanging every multiplexed command
+            '-o', f'ServerAliveInterval={self.server_alive_interval}',
+            '-o', 'ServerAliveCountMax=2',
+        ]
+
+    def apply(self, ssh_command: Optional[List[str]]) -> Optional[List[str]]:
+        """Return `ssh_command` with the connection sharing options added."""
+        if not ssh_command or not self.enabled or 'ControlPath' in ' '.join(ssh_command):
+            return ssh_command
+        with self._lock:
+            if not self._ensure_dir():
+                return ssh_command
+            self._masters[' '.join(ssh_command)] = list(ssh_command)
+        return [ssh_command[0]] + self._options() + list(ssh_command[1:])
+
+    def _has_masters(self) -> bool:
+        # every open master listens on a socket in the control dir
+        try:
+            return any(path.is_socket() for path in self.control_dir.iterdir())
+        except OSError:
+            return False
+
+    def _close_master(self, ssh_command: List[str]) -> None:
+        command = [ssh_command[0]] + self._options() + ['-O', 'exit'] + list(ssh_command[1:])
+        try:
+            run_process(command, timeout=5, name='ssh.close_master')
+        except OSError:
+            pass
+
+    def close_all(self) -> None:
+        """Ask every master opened by this launcher to exit, without waiting for them.
+
+        Commands are built for the whole inventory but most hosts never get a master
+        (probes do not open one), so nothing runs when the control dir has no socket.
+        The exits run in parallel on non-daemon threads: the window closes at once and
+        the interpreter waits for them (at most a few seconds) before exiting.
+        """
+        with self._lock:
+            commands = list(self._masters.values())
+            self._masters.clear()
+        if not commands or not self._has_masters():
+            return
+        for ssh_command in commands:
+            threading.Thread(target=self._close_master, args=(ssh_command,), name='ssh-close-master').start()
+
+
+ssh_control_pool = SSHControlPool(
+    Path.home() / HOME_SUBFOLDER / 'ssh',
+    persist=SSH_CONTROL_PERSIST,
+    server_alive_interval=SSH_SERVER_ALIVE_INTERVAL,
+    enabled=SSH_MULTIPLEXING,
+)
@@ -1,7 +1,10 @@
-import subprocess
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+from .instrumentation import timer
+from .process_runner import run_process
+from .ssh_pool import ssh_control_pool
+
 @dataclass
 class SSHConfig:
     host: str
@@ -11,7 +14,12 @@ class SSHConfig:
     ssh_args: Optional[List[str]] = None
 
 class SSHService:
-    def __init__(self):
+    def __init__(self, command_timeout: float = 120):
+        """
+        Args:
+            command_timeout: Seconds a remote command may run before it is killed
+        """
+        self.command_timeout = command_timeout
         self.ssh_command: List[str] = []
         self.config: Optional[SSHConfig] = None
 
@@ -27,13 +35,14 @@ class SSHService:
             cmd.extend(['-i', config.private_key])
             
         cmd.extend([f'{config.user}@{config.host}'])
-        self.ssh_command = cmd
+        self.ssh_command = ssh_control_pool.apply(cmd)
 
     def clear_configuration(self) -> None:
         """Clear SSH configuration."""
         self.ssh_command = []
         self.config = None
 
+    @timer()
     def execute_command(self, command: List[str], sudo: bool = False) -> Tuple[str, str, int]:
         """Execute a command on the remote host.
         
@@ -48,33 +57,15 @@ class SSHService:
             raise RuntimeError("SSH not configured")
 
         full_command = self.ssh_command.copy()
+        input_data = None
         
         if sudo and self.config and self.config.password:
             full_command.extend(['sudo', '-S'])
-            full_command.extend(command)
-            
-            process = subprocess.Popen(
-                full_command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            
-            stdout, stderr = process.communicate(input=self.config.password + '\n')
-        else:
-            full_command.extend(command)
-            
-            process = subprocess.Popen(
-                full_command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            
-            stdout, stderr = process.communicate()
+            input_data = self.config.password + '\n'
+        full_command.extend(command)
 
-        return stdout, stderr, process.returncode
+        result = run_process(full_command, input_data=input_data, timeout=self.command_timeout, name='ssh.command')
+        return result.stdout, result.stderr, result.returncode
 
     def check_connection(self, timeout: int = 3) -> bool:
         """Check if SSH connection can be established.
@@ -87,9 +78,6 @@ class SSHService:
         """
         try:
             cmd = self.ssh_command + ['-o', f'ConnectTimeout={timeout}', 'exit']
-            process = subprocess.run(cmd, capture_output=True, timeout=timeout)
-            return process.returncode == 0
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            return False
+            return run_process(cmd, timeout=timeout, name='ssh.check').ok
         except Exception:
             return False 
\ No newline at end of file
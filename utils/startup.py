@@ -0,0 +1,153 @@
+"""Startup timing and the background probes run while the window is already shown.
+
+The launcher shows its window first and loads or checks everything else after:
+pyqtgraph is imported when the plots are created, and docker and the NVIDIA GPU
+are probed in parallel off the GUI thread. `startup_profiler` records how long
+each step took; the report is logged and saved to the user folder. For a per
+module breakdown of the import time run `python -X importtime main.py`.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from time import perf_counter, time
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .process_runner import ProcessError, run_process
+
+
+@dataclass
+class StartupPhase:
+    name: str
+    start: float  # seconds since the profiler was created
+    duration: float
+
+
+class StartupProfiler:
+    """ Wall clock time of the startup phases, from the first import to the first data """
+
+    def __init__(self):
+        self.created_at = time()
+        self._origin = perf_counter()
+        self.phases: List[StartupPhase] = []
+        self.ready: Optional[float] = None
+
+    def elapsed(self) -> float:
+        return perf_counter() - self._origin
+
+    @contextmanager
+    def phase(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(StartupPhase(name, start - self._origin, perf_counter() - start))
+
+    def mark(self, name: str) -> None:
+        """Record a point in time, e.g. the window being shown."""
+        self.phases.append(StartupPhase(name, self.elapsed(), 0.0))
+
+    def set_ready(self) -> None:
+        if self.ready is None:
+            self.ready = self.elapsed()
+
+    def report(self) -> str:
+        steps = ', '.join(
+            f'{phase.name} {phase.duration * 1000:.0f}ms' if phase.duration else f'{phase.name} at {phase.start * 1000:.0f}ms'
+            for phase in sorted(self.phases, key=lambda phase: phase.start)
+        )
+        ready = f'ready after {self.ready * 1000:.0f}ms' if self.ready is not None else 'not ready yet'
+        return f'Startup: {steps}; {ready}'
+
+    def to_dict(self) -> dict:
+        return {
+            'created_at': self.created_at,
+            'ready': self.ready,
+            'phases': [asdict(phase) for phase in self.phases],
+        }
+
+    def save(self, path) -> None:
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
+        except OSError:
+            pass
+
+
+startup_profiler = StartupProfiler()
+
+
+@dataclass
+class DockerProbe:
+    """ Outcome of the docker availability check """
+    installed: bool = False
+    running: bool = False
+    version: str = ''
+    via_api: bool = False
+    log: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StartupProbes:
+    docker: DockerProbe
+    gpu_available: bool
+    gpu_output: str
+
+
+def _check_output(command: List[str], timeout: float) -> str:
+    result = run_process(command, timeout=timeout, merge_stderr=True, name=f'startup.{command[0]}')
+    if not result.ok:
+        raise ProcessError(result)
+    return result.stdout
+
+
+def probe_docker(api_client=None, timeout: float = 20) -> DockerProbe:
+    """Check that docker is installed and its daemon answers, through the Engine API when possible."""
+    probe = DockerProbe()
+    if api_client is not None:
+        try:
+            probe.version = api_client.version().get('Version', '')
+            probe.installed = probe.running = probe.via_api = True
+            return probe
+        except Exception:
+            probe.log.append('Docker Engine API not reachable, checking with the docker CLI...')
+    try:
+        probe.version = _check_output(['docker', '--version'], timeout).strip()
+        probe.installed = True
+        _check_output(['docker', 'info'], timeout)
+        probe.running = True
+    except FileNotFoundError:
+        pass  # not installed
+    except (ProcessError, OSError):
+        probe.installed = True  # installed, but the daemon does not answer
+    return probe
+
+
+def probe_nvidia_gpu(timeout: float = 20) -> Tuple[bool, str]:
+    """Return whether `nvidia-smi` lists a GPU, and its output (or the error)."""
+    try:
+        output = _check_output(['nvidia-smi', '-L'], timeout)
+        return 'GPU' in output, output.replace('\n', '')
+    except Exception as exc:
+        return False, str(exc).replace('\n', '')
+
+
+class StartupProbeThread(QThread):
+    """ Runs the docker and GPU probes in parallel, off the GUI thread """
+    probes_finished = pyqtSignal(object)  # StartupProbes
+
+    def __init__(self, api_client=None, timeout: float = 20):
+        super().__init__()
+        self.api_client = api_client
+        self.timeout = timeout
+
+    def run(self):
+        with startup_profiler.phase('probes'), \
+                ThreadPoolExecutor(max_workers=2, thread_name_prefix='startup_probe') as executor:
+            docker = executor.submit(probe_docker, self.api_client, self.timeout)
+            gpu = executor.submit(probe_nvidia_gpu, self.timeout)
+            gpu_available, gpu_output = gpu.result()
+            probes = StartupProbes(docker=docker.result(), gpu_available=gpu_available, gpu_output=gpu_output)
+        self.probes_finished.emit(probes)
@@ -0,0 +1,232 @@
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.NodeHistory import NodeHistoryBuffer
+
+
+FIELDS = NodeHistoryBuffer.SERIES_FIELDS
+
+# rollup bucket sizes (seconds) and their table suffix
+ROLLUPS = {60: '1m', 600: '10m', 3600: '1h'}
+
+
+@dataclass
+class ArchiveSeries:
+    """ Metrics of one node over a time range, at a single resolution """
+    resolution: int  # bucket size in seconds, 0 for raw samples
+    timestamps: np.ndarray  # float epoch seconds (bucket starts for rollups)
+    values: Dict[str, np.ndarray] = field(default_factory=dict)  # NaN where nothing was recorded
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def label(self) -> str:
+        return ROLLUPS.get(self.resolution, 'raw')
+
+
+class TelemetryArchive:
+    """ Node history kept on disk (SQLite), with 1m / 10m / 1h rollups.
+
+    Every node gets its own tables: the raw samples and one table per rollup
+    holding the sum, count, min and max of every metric per bucket, updated as
+    samples are appended. Long ranges are read from the coarsest rollup that
+    still gives enough points, so a 7 day view never loads the raw samples.
+
+    Writes run on a single background thread; reads run on the caller thread.
+    Data older than its `retention` (seconds per resolution, 0 for raw) is pruned
+    at most once per `prune_interval`.
+    """
+
+    def __init__(self, path: Path, retention: Dict[int, float], prune_interval: float = 3600):
+        self.path = path
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='telemetry_archive')
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS nodes ('
+            'key TEXT PRIMARY KEY, address TEXT NOT NULL, alias TEXT, last_ts REAL, pruned_at REAL)'
+        )
+        self._conn.commit()
+        self._nodes: Dict[str, Optional[float]] = {}  # key -> last archived timestamp
+
+    @staticmethod
+    def node_key(address: str) -> str:
+        return hashlib.sha1(address.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _table(key: str, resolution: int) -> str:
+        return f'node_{key}_{ROLLUPS.get(resolution, "raw")}'
+
+    def _ensure_node(self, key: str, address: str, alias: str) -> Optional[float]:
+        if key in self._nodes:
+            return self._nodes[key]
+        columns = ', '.join(f'{name} REAL' for name in FIELDS)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS {self._table(key, 0)} (ts REAL PRIMARY KEY, {columns})')
+        rollup_columns = ', '.join(
+            f'{name}_sum REAL, {name}_n INTEGER NOT NULL DEFAULT 0, {name}_min REAL, {name}_max REAL' for name in FIELDS
+        )
+        for resolution in ROLLUPS:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self._table(key, resolution)} (bucket INTEGER PRIMARY KEY, {rollup_columns})'
+            )
+        self._conn.execute(
+            'INSERT INTO nodes (key, address, alias) VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE SET alias = excluded.alias',
+            (key, address, alias)
+        )
+        row = self._conn.execute('SELECT last_ts FROM nodes WHERE key = ?', (key,)).fetchone()
+        self._nodes[key] = row[0] if row else None
+        return self._nodes[key]
+
+    def append(self, address: str, alias: str, timestamps_us: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        """Queue new samples of a node (epoch microseconds, chronological) for writing.
+
+        The arrays are owned by the archive afterwards; pass copies, not buffer views.
+        """
+        self._executor.submit(self._append, address, alias, timestamps_us, values)
+
+    def _append(self, address: str, alias: str, timestamps_us: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        key = self.node_key(address)
+        timestamps = np.asarray(timestamps_us, dtype=np.float64) / 1_000_000
+        with self._lock, self._conn:
+            last_ts = self._ensure_node(key, address, alias)
+            # samples archived before (e.g. in a previous session) are skipped
+            keep = timestamps > last_ts if last_ts is not None else np.ones(len(timestamps), dtype=bool)
+            if not keep.any():
+                return
+            timestamps = timestamps[keep]
+            columns = {name: np.asarray(values[name], dtype=np.float64)[keep] for name in FIELDS}
+            rows = np.column_stack([timestamps] + [columns[name] for name in FIELDS]).tolist()
+            rows = [[None if value != value else value for value in row] for row in rows]  # NaN -> NULL
+            self._conn.executemany(
+                f'INSERT OR IGNORE INTO {self._table(key, 0)} (ts, {", ".join(FIELDS)}) '
+                f'VALUES ({", ".join("?" * (len(FIELDS) + 1))})',
+                rows
+            )
+            for resolution in ROLLUPS:
+                self._update_rollup(key, resolution, timestamps, columns)
+            last_ts = float(timestamps[-1])
+            self._conn.execute('UPDATE nodes SET last_ts = ? WHERE key = ?', (last_ts, key))
+            self._nodes[key] = last_ts
+            self._maybe_prune(key)
+
+    def _update_rollup(self, key: str, resolution: int, timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> None:
+        buckets = (timestamps // resolution).astype(np.int64) * resolution
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        aggregates = [buckets[starts].tolist()]
+        for name in FIELDS:
+            values = columns[name]
+            finite = np.isfinite(values)
+            counts = np.add.reduceat(finite.astype(np.int64), starts)
+            sums = np.add.reduceat(np.where(finite, values, 0.0), starts)
+            mins = np.minimum.reduceat(np.where(finite, values, np.inf), starts)
+            maxs = np.maximum.reduceat(np.where(finite, values, -np.inf), starts)
+            aggregates += [
+                np.where(counts > 0, sums, np.nan).tolist(), counts.tolist(),
+                np.where(counts > 0, mins, np.nan).tolist(), np.where(counts > 0, maxs, np.nan).tolist(),
+            ]
+        rows = [[None if value != value else value for value in row] for row in zip(*aggregates)]
+        columns_sql = ', '.join(f'{name}_sum, {name}_n, {name}_min, {name}_max' for name in FIELDS)
+        updates = ', '.join(
+            f'{name}_sum = coalesce({name}_sum, 0) + coalesce(excluded.{name}_sum, 0), '
+            f'{name}_n = {name}_n + excluded.{name}_n, '
+            f'{name}_min = min(coalesce({name}_min, excluded.{name}_min), coalesce(excluded.{name}_min, {name}_min)), '
+            f'{name}_max = max(coalesce({name}_max, excluded.{name}_max), coalesce(excluded.{name}_max, {name}_max))'
+            for name in FIELDS
+        )
+        self._conn.executemany(
+            f'INSERT INTO {self._table(key, resolution)} (bucket, {columns_sql}) '
+            f'VALUES ({", ".join("?" * (4 * len(FIELDS) + 1))}) '
+            f'ON CONFLICT(bucket) DO UPDATE SET {updates}',
+            rows
+        )
+
+    def _maybe_prune(self, key: str) -> None:
+        row = self._conn.execute('SELECT pruned_at FROM nodes WHERE key = ?', (key,)).fetchone()
+        now = time()
+        if row and row[0] is not None and now - row[0] < self.prune_interval:
+            return
+        for resolution, seconds in self.retention.items():
+            column = 'bucket' if resolution else 'ts'
+            self._conn.execute(f'DELETE FROM {self._table(key, resolution)} WHERE {column} < ?', (now - seconds,))
+        self._conn.execute('UPDATE nodes SET pruned_at = ? WHERE key = ?', (now, key))
+
+    def query(self, address: str, span: float, max_points: int = 1500, end: Optional[float] = None,
+              stat: str = 'mean') -> ArchiveSeries:
+        """Metrics of `address` over the last `span` seconds (up to `end`, default now).
+
+        Raw samples are returned when there are at most `max_points` of them,
+        otherwise the finest rollup with at most `max_points` buckets; rollups are
+        gap filled with NaN so missing data shows as a break in the line.
+
+        Args:
+            stat: `mean`, `min` or `max` of each rollup bucket
+        """
+        end = time() if end is None else end
+        start = end - span
+        key = self.node_key(address)
+        with self._lock:
+            if self._ensure_node_exists(key):
+                raw_table = self._table(key, 0)
+                count = self._conn.execute(
+                    f'SELECT COUNT(*) FROM {raw_table} WHERE ts >= ? AND ts <= ?', (start, end)
+                ).fetchone()[0]
+                if count <= max_points:
+                    rows = self._conn.execute(
+                        f'SELECT ts, {", ".join(FIELDS)} FROM {raw_table} WHERE ts >= ? AND ts <= ? ORDER BY ts',
+                        (start, end)
+                    ).fetchall()
+                    return self._raw_series(rows)
+                resolution = next((res for res in sorted(ROLLUPS) if span / res <= max_points), max(ROLLUPS))
+                return self._rollup_series(key, resolution, start, end, stat)
+        return ArchiveSeries(resolution=0, timestamps=np.empty(0), values={name: np.empty(0) for name in FIELDS})
+
+    def _ensure_node_exists(self, key: str) -> bool:
+        if key in self._nodes:
+            return True
+        return self._conn.execute('SELECT 1 FROM nodes WHERE key = ?', (key,)).fetchone() is not None
+
+    @staticmethod
+    def _raw_series(rows: List[Tuple]) -> ArchiveSeries:
+        data = np.array(rows, dtype=np.float64).reshape(-1, len(FIELDS) + 1)  # NULL -> NaN
+        return ArchiveSeries(
+            resolution=0, timestamps=data[:, 0],
+            values={name: data[:, index + 1] for index, name in enumerate(FIELDS)},
+        )
+
+    def _rollup_series(self, key: str, resolution: int, start: float, end: float, stat: str) -> ArchiveSeries:
+        first = int(start // resolution) * resolution
+        grid = np.arange(first, end, resolution, dtype=np.int64)
+        if stat == 'mean':
+            columns = ', '.join(f'{name}_sum / nullif({name}_n, 0)' for name in FIELDS)
+        else:
+            columns = ', '.join(f'{name}_{stat}' for name in FIELDS)
+        rows = self._conn.execute(
+            f'SELECT bucket, {columns} FROM {self._table(key, resolution)} WHERE bucket >= ? AND bucket < ? ORDER BY bucket',
+            (first, end)
+        ).fetchall()
+        values = {name: np.full(len(grid), np.nan) for name in FIELDS}
+        if rows:
+            data = np.array(rows, dtype=np.float64)
+            index = ((data[:, 0] - first) // resolution).astype(np.int64)
+            for column, name in enumerate(FIELDS):
+                values[name][index] = data[:, column + 1]
+        return ArchiveSeries(resolution=resolution, timestamps=grid.astype(np.float64), values=values)
+
+    def close(self) -> None:
+        """Finish the pending writes and close the database."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,316 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+import threading
+import zipfile
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+if TYPE_CHECKING:
+    import requests
+
+
+GITHUB_API_URL = 'https://api.github.com/repos/NaeuralEdgeProtocol/edge_node_launcher/releases/latest'
+
+# substring identifying the release asset of each platform
+PLATFORM_ASSET_MARKERS = {
+    'Windows': 'WIN32',
+    'Linux_Ubuntu_22.04': 'Ubuntu-22.04',
+    'Linux_Ubuntu_20.04': 'Ubuntu-20.04',
+}
+
+
+class UpdateCheckError(Exception):
+    """ Raised when the release information cannot be fetched """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class ReleaseAsset:
+    name: str
+    url: str
+    size: int = 0
+    digest: Optional[str] = None  # `sha256:<hex>` when published by GitHub
+
+
+@dataclass
+class ReleaseInfo:
+    version: str
+    assets: List[ReleaseAsset] = field(default_factory=list)
+    not_modified: bool = False  # answered from the cache after a 304
+
+    @classmethod
+    def from_dict(cls, data: dict, not_modified: bool = False) -> 'ReleaseInfo':
+        return cls(
+            version=parse_version_tag(data['tag_name']),
+            assets=[
+                ReleaseAsset(
+                    name=asset['name'],
+                    url=asset['browser_download_url'],
+                    size=asset.get('size') or 0,
+                    digest=asset.get('digest'),
+                )
+                for asset in data.get('assets', [])
+            ],
+            not_modified=not_modified,
+        )
+
+    @property
+    def download_urls(self) -> Dict[str, str]:
+        urls = {}
+        for key, marker in PLATFORM_ASSET_MARKERS.items():
+            asset = self.get_asset(key)
+            if asset is not None:
+                urls[key] = asset.url
+        return urls
+
+    def get_asset(self, platform_key: str) -> Optional[ReleaseAsset]:
+        marker = PLATFORM_ASSET_MARKERS.get(platform_key)
+        return next((asset for asset in self.assets if marker and marker in asset.name), None)
+
+
+def parse_version_tag(tag: str) -> str:
+    return tag.lstrip('v').strip().replace('"', '').replace("'", '')
+
+
+def is_newer_version(current_version: str, latest_version: str) -> bool:
+    current_parts = [int(part) for part in current_version.split('.')]
+    latest_parts = [int(part) for part in parse_version_tag(latest_version).split('.')]
+    return latest_parts > current_parts
+
+
+def get_platform_asset_key() -> Optional[str]:
+    """Release asset key of this machine, None when no build is published for it."""
+    platform_system = platform.system()
+    if platform_system == 'Windows':
+        return 'Windows'
+    if platform_system == 'Linux':
+        if '22.04' in platform.version():
+            return 'Linux_Ubuntu_22.04'
+        if '20.04' in platform.version():
+            return 'Linux_Ubuntu_20.04'
+    return None
+
+
+def _retry_after(response: 'requests.Response') -> Optional[float]:
+    """Seconds to wait before asking again, from the rate limit headers."""
+    value = response.headers.get('Retry-After')
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time(), 0)
+            except (TypeError, ValueError):
+                pass
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        reset = response.headers.get('X-RateLimit-Reset')
+        if reset and reset.isdigit():
+            return max(int(reset) - time(), 0)
+    return None
+
+
+class ReleaseCache:
+    """ Latest release response cached on disk with its ETag.
+
+    Checks send `If-None-Match`, so an unchanged release costs a bodyless 304
+    (which GitHub does not count against the API rate limit).
+    """
+
+    def __init__(self, cache_file: Path, url: str = GITHUB_API_URL, timeout: float = 10):
+        self.cache_file = cache_file
+        self.url = url
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: dict) -> None:
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(data, f)
+        except OSError:
+            pass
+
+    def fetch(self) -> ReleaseInfo:
+        """Return the latest release, revalidating the cached copy with the server."""
+        import requests
+
+        with self._lock:
+            cached = self._load()
+            headers = {'Accept': 'application/vnd.github+json'}
+            if cached.get('etag') and cached.get('release'):
+                headers['If-None-Match'] = cached['etag']
+            try:
+                response = requests.get(self.url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                raise UpdateCheckError(f'Release check failed: {e}') from e
+            if response.status_code == 304:
+                cached['checked_at'] = time()
+                self._save(cached)
+                return ReleaseInfo.from_dict(cached['release'], not_modified=True)
+            if response.status_code in (403, 429) or response.status_code >= 500:
+                raise UpdateCheckError(
+                    f'Release check failed: HTTP {response.status_code}', retry_after=_retry_after(response)
+                )
+            try:
+                response.raise_for_status()
+                release = response.json()
+                info = ReleaseInfo.from_dict(release)
+            except (requests.RequestException, ValueError, KeyError) as e:
+                raise UpdateCheckError(f'Invalid release information: {e}') from e
+            self._save({'etag': response.headers.get('ETag'), 'checked_at': time(), 'release': release})
+            return info
+
+
+def _hash_file(path: str, chunk_size: int):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256
+
+
+def download_file(url: str, path: str, timeout: float = 30, chunk_size: int = 1024 * 1024, read_size: int = 64 * 1024,
+                  expected_size: int = 0, expected_digest: Optional[str] = None,
+                  stop_event: threading.Event = None, on_progress=None) -> str:
+    """Download `url` to `path`, resuming a previous partial download.
+
+    Data goes to `path + '.part'`; an interrupted download continues with an HTTP
+    Range request and the file is renamed to `path` only once complete. The SHA-256
+    is computed while writing (the part already on disk is hashed once on resume)
+    and checked against `expected_digest` (`sha256:<hex>`) when given; a mismatch
+    deletes the part so the next attempt starts clean. A finished `path` of the
+    expected size is reused as is.
+
+    Args:
+        on_progress: Called with (bytes_done, bytes_total), total is 0 when unknown
+    """
+    import requests
+
+    if expected_size and os.path.exists(path) and os.path.getsize(path) == expected_size:
+        return path
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    part_path = path + '.part'
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if expected_size and offset > expected_size:
+        offset = 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+    with requests.get(url, stream=True, headers=headers, timeout=timeout) as response:
+        if response.status_code == 416:
+            # the part file already holds everything the server has
+            sha256 = _hash_file(part_path, chunk_size)
+        else:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                offset = 0  # Range not honored, start over
+            sha256 = _hash_file(part_path, chunk_size) if offset else hashlib.sha256()
+            total = expected_size or (offset + int(response.headers.get('Content-Length') or 0))
+            done = offset
+            with open(part_path, 'ab' if offset else 'wb', buffering=chunk_size) as f:
+                # small reads lose little on a dropped connection, writes are buffered by `chunk_size`
+                for chunk in response.iter_content(chunk_size=read_size):
+                    if stop_event is not None and stop_event.is_set():
+                        raise UpdateCheckError('Download cancelled')
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    done += len(chunk)
+                    if on_progress is not None:
+                        on_progress(done, total)
+    size = os.path.getsize(part_path)
+    if expected_size and size != expected_size:
+        raise UpdateCheckError(f'Incomplete download: {size} of {expected_size} bytes')
+    if expected_digest and expected_digest.startswith('sha256:'):
+        if sha256.hexdigest() != expected_digest.split(':', 1)[1].lower():
+            os.remove(part_path)
+            raise UpdateCheckError(f'Checksum mismatch for {os.path.basename(path)}, download discarded')
+    os.replace(part_path, path)
+    return path
+
+
+def extract_executable(zip_path: str, executable_name: str, target_path: str) -> str:
+    """Extract only the `executable_name` entry of the archive, straight to `target_path`."""
+    with zipfile.ZipFile(zip_path, 'r') as archive:
+        entry = next(
+            (info for info in archive.infolist()
+             if not info.is_dir() and info.filename.replace('\\', '/').rsplit('/', 1)[-1] == executable_name),
+            None
+        )
+        if entry is None:
+            raise UpdateCheckError(f'{executable_name} not found in {os.path.basename(zip_path)}')
+        os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+        temp_path = target_path + '.tmp'
+        with archive.open(entry) as source, open(temp_path, 'wb') as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+    if os.name != 'nt':
+        os.chmod(temp_path, 0o755)
+    os.replace(temp_path, target_path)
+    return target_path
+
+
+class UpdateCheckThread(QThread):
+    """ Fetches the latest release information off the GUI thread """
+    check_finished = pyqtSignal(object)  # ReleaseInfo
+    check_failed = pyqtSignal(str, float)  # error, seconds to wait before retrying (0 if unknown)
+
+    def __init__(self, release_cache: ReleaseCache):
+        super().__init__()
+        self.release_cache = release_cache
+
+    def run(self):
+        try:
+            self.check_finished.emit(self.release_cache.fetch())
+        except UpdateCheckError as e:
+            self.check_failed.emit(str(e), e.retry_after or 0)
+        except Exception as e:
+            self.check_failed.emit(str(e), 0)
+
+
+class UpdateDownloadThread(QThread):
+    """ Downloads a release asset in the background so the update installs right away """
+    download_finished = pyqtSignal(str)  # path of the downloaded file
+    download_failed = pyqtSignal(str)
+    download_progress = pyqtSignal(int, int)  # bytes done, bytes total
+
+    def __init__(self, asset: ReleaseAsset, path: str, timeout: float = 30):
+        super().__init__()
+        self.asset = asset
+        self.path = path
+        self.timeout = timeout
+        self.stop_event = threading.Event()
+        self._last_percent = -1
+
+    def _on_progress(self, done: int, total: int):
+        percent = done * 100 // total if total else 0
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.download_progress.emit(done, total)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        try:
+            path = download_file(
+                self.asset.url, self.path, timeout=self.timeout,
+                expected_size=self.asset.size, expected_digest=self.asset.digest,
+                stop_event=self.stop_event, on_progress=self._on_progress,
+            )
+            self.download_finished.emit(path)
+        except Exception as e:
+            self.download_failed.emit(str(e))
@@ -1,64 +1,53 @@
 import os
 import sys
-import requests
-import zipfile
-import shutil
-import platform
-import subprocess
+from time import time
 from PyQt5.QtWidgets import QMessageBox
 
 from ver import __VER__ as CURRENT_VERSION
+from .const import (
+  UPDATE_RELEASE_CACHE_FILE, UPDATE_CHECK_TIMEOUT, UPDATE_CHECK_MAX_BACKOFF, UPDATE_DOWNLOAD_TIMEOUT,
+  AUTO_UPDATE_CHECK_INTERVAL,
+)
+from .docker import get_user_folder
+from .process_runner import popen
+from .update_checker import (
+  GITHUB_API_URL, ReleaseCache, UpdateCheckThread, UpdateDownloadThread,
+  extract_executable, get_platform_asset_key, is_newer_version,
+)
 
-GITHUB_API_URL = 'https://api.github.com/repos/NaeuralEdgeProtocol/edge_node_launcher/releases/latest'
 DOWNLOAD_DIR = 'downloads'
 
 class _UpdaterMixin:
-
-  @staticmethod
-  def get_latest_release_version():
-    response = requests.get(GITHUB_API_URL)
-    response.raise_for_status()
-    latest_release = response.json()
-    latest_version = latest_release['tag_name']
-    assets = latest_release['assets']
-    download_urls = {
-      'Windows': next(asset['browser_download_url'] for asset in assets if 'WIN32' in asset['name']),
-      'Linux_Ubuntu_22.04': next(asset['browser_download_url'] for asset in assets if 'Ubuntu-22.04' in asset['name']),
-      'Linux_Ubuntu_20.04': next(asset['browser_download_url'] for asset in assets if 'Ubuntu-20.04' in asset['name']),
-    }
-    return latest_version, download_urls
+  def __init__(self):
+    super().__init__()
+    self.release_cache = ReleaseCache(
+      get_user_folder() / UPDATE_RELEASE_CACHE_FILE, GITHUB_API_URL, timeout=UPDATE_CHECK_TIMEOUT
+    )
+    self.update_check_thread = None
+    self.update_download_thread = None
+    self.__update_check_failures = 0
+    self.__next_update_check = 0
+    self.__update_check_verbose = False
+    self.__offered_version = None  # ask only once per version
+    return
 
   def _compare_versions(self, current_version, latest_version):
     latest_version = latest_version.lstrip('v').strip().replace('"', '').replace("'", '')
     result = False
     self.add_log(f'Comparing versions: {current_version} -> {latest_version}')
-    current_version_parts = [int(part) for part in current_version.split('.')]
-    latest_version_parts = [int(part) for part in latest_version.split('.')]
-    if latest_version_parts > current_version_parts:
+    if is_newer_version(current_version, latest_version):
       result = True
     else:
-      if latest_version_parts < current_version_parts:
+      if is_newer_version(latest_version, current_version):
         self.add_log('Your version is newer than the latest version. Are you a time traveler or a dev?')
     return result
 
-  @staticmethod
-  def _download_update(download_url, download_dir):
-    os.makedirs(download_dir, exist_ok=True)
-    local_filename = os.path.join(download_dir, 'update.zip')
-    with requests.get(download_url, stream=True) as response:
-      response.raise_for_status()
-      with open(local_filename, 'wb') as file:
-        for chunk in response.iter_content(chunk_size=8192):
-          file.write(chunk)
-    return local_filename
-
-  @staticmethod
-  def _extract_zip(zip_path, extract_to):
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-      zip_ref.extractall(extract_to)
-
-
-  def _replace_executable(self, extracted_dir, executable_name):
+  def _replace_executable(self, zip_path, executable_name):
+    """
+    Extract the new executable from the update archive straight to its staging
+    path and replace the running one once the launcher exits.
+    """
+    extracted_dir = os.path.dirname(zip_path)
     current_executable = sys.executable
     if current_executable.endswith('python.exe'):
       raise Exception('Cannot replace the current executable as it is running in a virtual environment.')
@@ -66,13 +55,12 @@ class _UpdaterMixin:
     self.add_log(f'Preparing executable replacement of: {current_executable}')
     
     if sys.platform == "win32":
-      new_executable = os.path.join(extracted_dir, executable_name + '.exe')
       current_folder = os.path.dirname(current_executable)
       temp_executable = os.path.join(current_folder, executable_name + '_new.exe')
 
-      # Copy the new executable to a temporary location
-      shutil.copy(new_executable, temp_executable)
-      self.add_log(f'New executable copied to temporary location: {temp_executable}')
+      # Extract only the new executable, to a temporary location
+      extract_executable(zip_path, executable_name + '.exe', temp_executable)
+      self.add_log(f'New executable extracted to temporary location: {temp_executable}')
 
       # Create a batch script to replace the executable after the current process exits
       script_path = os.path.join(extracted_dir, 'replace_executable.bat')
@@ -93,20 +81,16 @@ class _UpdaterMixin:
         start "" "{current_executable}"
         """)
 
-      # Execute the batch script
-      if os.name == 'nt':
-        subprocess.Popen(['cmd', '/c', 'start', '/min', script_path], shell=True, creationflags=subprocess.CREATE_NO_WINDOW)
-      else:
-        subprocess.Popen(['cmd', '/c', 'start', '/min', script_path], shell=True)
+      # Execute the batch script, it outlives the launcher
+      popen(['cmd', '/c', 'start', '/min', script_path], shell=True)
       self.add_log(f'Batch script created and executed: {script_path}')
 
     else:
-      new_executable = os.path.join(extracted_dir, executable_name)
       temp_executable = os.path.join(extracted_dir, executable_name + '_new')
 
-      # Copy the new executable to a temporary location
-      shutil.copy(new_executable, temp_executable)
-      self.add_log(f'New executable copied to temporary location: {temp_executable}')
+      # Extract only the new executable, to a temporary location
+      extract_executable(zip_path, executable_name, temp_executable)
+      self.add_log(f'New executable extracted to temporary location: {temp_executable}')
 
       # Create a shell script to replace the executable after the current process exits
       script_path = os.path.join(extracted_dir, 'replace_executable.sh')
@@ -122,7 +106,7 @@ class _UpdaterMixin:
 
       # Make the shell script executable and run it
       os.chmod(script_path, 0o755)
-      subprocess.Popen(['sh', script_path])
+      popen(['sh', script_path])
       self.add_log(f'Shell script created and executed: {script_path}')
 
     # Exit the current application
@@ -132,39 +116,90 @@ class _UpdaterMixin:
 
 
   def check_for_updates(self, verbose=True):
+    """
+    Check for a new release in the background. A newer build for this platform is
+    downloaded in the background too and the user is asked to install it once ready.
+    """
+    if self.update_check_thread is not None and self.update_check_thread.isRunning():
+      return
+    if time() < self.__next_update_check:
+      return  # backing off after failed checks
+    self.__update_check_verbose = verbose
+    self.update_check_thread = UpdateCheckThread(self.release_cache)
+    self.update_check_thread.check_finished.connect(self.__on_update_checked)
+    self.update_check_thread.check_failed.connect(self.__on_update_check_failed)
+    self.update_check_thread.start()
+    return
+
+  def __on_update_check_failed(self, error, retry_after):
+    self.__update_check_failures += 1
+    backoff = min(AUTO_UPDATE_CHECK_INTERVAL * 2 ** self.__update_check_failures, UPDATE_CHECK_MAX_BACKOFF)
+    self.__next_update_check = time() + max(backoff, retry_after)
+    self.add_log(f"Failed to check for updates: {error}. Next check in {max(backoff, retry_after):.0f}s")
+    return
+
+  def __on_update_checked(self, release):
+    self.__update_check_failures = 0
+    self.__next_update_check = 0
+    latest_version = release.version
+    verbose = self.__update_check_verbose
+    if verbose:
+      self.add_log(f'Obtained latest version: {latest_version}{" (cached)" if release.not_modified else ""}')
     try:
-      latest_version, download_urls = self.get_latest_release_version()
-      latest_version = latest_version.lstrip('v').strip().replace('"', '').replace("'", '')
-      if verbose:
-        self.add_log(f'Obtained latest version: {latest_version}')
-      if self._compare_versions(CURRENT_VERSION, latest_version):
-        reply = QMessageBox.question(None, 'Update Available',
-                                    f'A new version v{latest_version} is available (current v{CURRENT_VERSION}). Do you want to update?',
-                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
-        if reply == QMessageBox.Yes:
-          platform_system = platform.system()
-          if platform_system == 'Windows':
-            download_url = download_urls['Windows']
-          elif platform_system == 'Linux':
-            if '22.04' in platform.version():
-              download_url = download_urls['Linux_Ubuntu_22.04']
-            elif '20.04' in platform.version():
-              download_url = download_urls['Linux_Ubuntu_20.04']
-            else:
-              QMessageBox.information(None, 'Update Not Available', f'No update available for your OS: {platform_system}.')
-              return
-          else:
-            QMessageBox.information(None, 'Update Not Available', f'No update available for your OS: {platform_system}.')
-            return
-          download_dir = os.path.join(os.getcwd(), DOWNLOAD_DIR)
-          self.add_log(f'Downloading update from {download_url} to {download_dir}...'                       )
-          zip_path = self._download_update(download_url, download_dir)
-          self.add_log(f'Extracting update from {zip_path}...')
-          self._extract_zip(zip_path, download_dir)
-          self._replace_executable(download_dir, 'EdgeNodeLauncher')
+      if verbose or not release.not_modified:
+        newer = self._compare_versions(CURRENT_VERSION, latest_version)
       else:
-        if verbose:
-          self.add_log("You are already using the latest version. Current: {}, Online: {}".format(CURRENT_VERSION, latest_version))
-    except Exception as e:
-      self.add_log(f"Failed to check for updates: {e}")
+        newer = is_newer_version(CURRENT_VERSION, latest_version)
+    except ValueError as e:
+      self.add_log(f"Failed to check for updates: invalid version {latest_version}: {e}")
+      return
+    if not newer:
+      if verbose:
+        self.add_log("You are already using the latest version. Current: {}, Online: {}".format(CURRENT_VERSION, latest_version))
+      return
+    if latest_version == self.__offered_version:
+      return
+
+    platform_key = get_platform_asset_key()
+    asset = release.get_asset(platform_key) if platform_key else None
+    if asset is None:
+      self.__offered_version = latest_version
+      QMessageBox.information(None, 'Update Not Available', f'No update available for your OS: {platform_key or sys.platform}.')
+      return
+    if self.update_download_thread is not None and self.update_download_thread.isRunning():
+      return
+    download_dir = os.path.join(os.getcwd(), DOWNLOAD_DIR)
+    zip_path = os.path.join(download_dir, f'update_{latest_version}.zip')
+    self.add_log(f'Downloading update v{latest_version} from {asset.url} to {download_dir} in the background...')
+    self.update_download_thread = UpdateDownloadThread(asset, zip_path, timeout=UPDATE_DOWNLOAD_TIMEOUT)
+    self.update_download_thread.download_finished.connect(
+      lambda path: self.__on_update_downloaded(latest_version, path)
+    )
+    self.update_download_thread.download_progress.connect(self.__on_update_download_progress)
+    self.update_download_thread.download_failed.connect(
+      lambda error: self.add_log(f'Update download failed, it resumes at the next check: {error}')
+    )
+    self.update_download_thread.start()
+    return
 
+  def __on_update_download_progress(self, done, total):
+    if total and (done * 100 // total) % 10 == 0:
+      self.add_log(f'Update download: {done * 100 // total}% ({done / 1024 / 1024:.1f} of {total / 1024 / 1024:.1f} MB)', debug=True)
+    return
+
+  def __on_update_downloaded(self, latest_version, zip_path):
+    if latest_version == self.__offered_version:
+      return
+    self.__offered_version = latest_version
+    self.add_log(f'Update v{latest_version} downloaded: {zip_path}')
+    reply = QMessageBox.question(None, 'Update Available',
+                                f'A new version v{latest_version} is available (current v{CURRENT_VERSION}). Do you want to update?',
+                                QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+    if reply != QMessageBox.Yes:
+      return
+    try:
+      self.add_log(f'Extracting update from {zip_path}...')
+      self._replace_executable(zip_path, 'EdgeNodeLauncher')
+    except Exception as e:
+      self.add_log(f"Failed to install the update: {e}")
+    return
@@ -0,0 +1,192 @@
+from datetime import datetime
+
+import numpy as np
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QHeaderView,
+    QAbstractItemView,
+    QWidget
+)
+from PyQt5.QtCore import Qt, QPointF, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QPainter, QPen, QPolygonF
+
+from utils.const import (
+    DOCKER_CONTAINER_NAME,
+    DOCKER_EXEC_TIMEOUT,
+    FLEET_MONITOR_WORKERS,
+    FLEET_POLL_INTERVAL,
+    FLEET_POLL_MAX_INTERVAL,
+    FLEET_SPARKLINE_POINTS,
+)
+from utils.fleet_monitor import FleetMonitor
+from widgets.SortableItem import SortableItem
+
+
+class Sparkline(QWidget):
+    """Small line chart without axes, drawn straight from a NumPy array."""
+
+    def __init__(self, color: str, max_value: float = 100, parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.max_value = max_value
+        self.values = np.empty(0)
+        self.setMinimumSize(100, 24)
+
+    def set_values(self, values: np.ndarray):
+        self.values = values[np.isfinite(values)]
+        self.update()
+
+    def paintEvent(self, event):
+        if len(self.values) < 2:
+            return
+        width, height = self.width() - 2, self.height() - 2
+        x = np.linspace(1, width, len(self.values))
+        y = 1 + height * (1 - np.clip(self.values / self.max_value, 0, 1))
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.color, 1.5))
+        painter.drawPolyline(QPolygonF([QPointF(px, py) for px, py in zip(x, y)]))
+        painter.end()
+
+
+class FleetDashboard(QDialog):
+    """Fleet view: the state of the edge node of every Ansible host, side by side."""
+    host_activated = pyqtSignal(str)  # Emitted when a host row is double clicked
+
+    COLUMNS = ['Host', 'Alias', 'Status', 'Up Time', 'Epoch avail', 'CPU', 'GPU', 'Version', 'CPU load', 'GPU load']
+    COL_HOST, COL_ALIAS, COL_STATUS, COL_UPTIME, COL_EPOCH, COL_CPU, COL_GPU, COL_VERSION, COL_CPU_TREND, COL_GPU_TREND = range(10)
+
+    def __init__(self, hosts_manager, parent=None):
+        super().__init__(parent)
+        self.hosts_manager = hosts_manager
+        self.monitor = FleetMonitor(
+            max_workers=FLEET_MONITOR_WORKERS,
+            interval=FLEET_POLL_INTERVAL,
+            max_interval=FLEET_POLL_MAX_INTERVAL,
+            history_points=FLEET_SPARKLINE_POINTS,
+            exec_timeout=DOCKER_EXEC_TIMEOUT,
+            parent=self,
+        )
+        self.monitor.node_updated.connect(self._on_node_updated)
+        self.rows = {}
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle('Fleet Dashboard')
+        self.resize(1200, 600)
+        layout = QVBoxLayout(self)
+
+        header = QHBoxLayout()
+        self.summary_label = QLabel('')
+        self.summary_label.setFont(QFont("Courier New", 10))
+        header.addWidget(self.summary_label)
+        header.addStretch()
+        self.refresh_button = QPushButton('Refresh all')
+        self.refresh_button.clicked.connect(self.refresh_all)
+        header.addWidget(self.refresh_button)
+        layout.addLayout(header)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setFont(QFont("Courier New", 10))
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(self.COL_CPU_TREND, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(self.COL_GPU_TREND, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicator(self.COL_HOST, Qt.AscendingOrder)
+        self.table.cellDoubleClicked.connect(self._on_row_activated)
+        layout.addWidget(self.table)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.monitor.is_running():
+            self.start()
+
+    def closeEvent(self, event):
+        self.monitor.stop()
+        super().closeEvent(event)
+
+    def shutdown(self):
+        self.monitor.shutdown()
+
+    def start(self):
+        """(Re)load the hosts and start polling them."""
+        self.hosts_manager.load_hosts()
+        hosts = {}
+        for host in self.hosts_manager.get_host_names():
+            ssh_command = self.hosts_manager.get_ssh_command(host)
+            if ssh_command:
+                hosts[host] = ssh_command.split()
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        self.rows = {}
+        for host in hosts:
+            self._add_row(host)
+        self.table.setSortingEnabled(True)
+        self.monitor.start(hosts, DOCKER_CONTAINER_NAME)
+        self._update_summary()
+
+    def refresh_all(self):
+        for host in list(self.rows):
+            self.monitor.poll_now(host)
+
+    def _add_row(self, host):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        items = [SortableItem(host, host)]
+        for _ in range(1, self.COL_CPU_TREND):
+            items.append(SortableItem())
+        for column, item in enumerate(items):
+            self.table.setItem(row, column, item)
+        items[self.COL_STATUS].set('polling...', 0)
+        self.table.setCellWidget(row, self.COL_CPU_TREND, Sparkline('#4CAF50'))
+        self.table.setCellWidget(row, self.COL_GPU_TREND, Sparkline('#2196F3'))
+        # keep the host item: its row changes whenever the table is sorted
+        self.rows[host] = items[self.COL_HOST]
+
+    def _on_node_updated(self, host, status):
+        host_item = self.rows.get(host)
+        if host_item is None:
+            return
+        self.table.setSortingEnabled(False)
+        row = host_item.row()
+        item = lambda column: self.table.item(row, column)
+
+        checked = datetime.now().strftime('%H:%M:%S')
+        if status.error is None:
+            item(self.COL_STATUS).set('running', 2)
+            item(self.COL_STATUS).setForeground(QColor("#4CAF50"))
+            item(self.COL_STATUS).setToolTip(f'Polled at {checked} in {status.poll_seconds:.1f}s')
+        else:
+            item(self.COL_STATUS).set('error' if status.running or status.timed_out else 'down', 1)
+            item(self.COL_STATUS).setForeground(QColor("#FF5252"))
+            item(self.COL_STATUS).setToolTip(f'{checked}: {status.error}')
+
+        item(self.COL_ALIAS).set(status.alias, status.alias)
+        item(self.COL_UPTIME).set(status.uptime, status.uptime)
+        epoch_avail = status.epoch_avail
+        item(self.COL_EPOCH).set(f'{epoch_avail * 100:.2f}%' if epoch_avail is not None else '', epoch_avail)
+        item(self.COL_CPU).set(f'{status.cpu_load:.1f}%' if status.cpu_load is not None else '', status.cpu_load)
+        item(self.COL_GPU).set(f'{status.gpu_load:.1f}%' if status.gpu_load is not None else '', status.gpu_load)
+        item(self.COL_VERSION).set(status.version, status.version)
+
+        self.table.cellWidget(row, self.COL_CPU_TREND).set_values(status.history.window('cpu_load'))
+        self.table.cellWidget(row, self.COL_GPU_TREND).set_values(status.history.window('gpu_load'))
+        self.table.setSortingEnabled(True)
+        self._update_summary()
+
+    def _update_summary(self):
+        statuses = [status for host, status in self.monitor.status.items() if host in self.rows]
+        running = sum(1 for status in statuses if status.running and status.error is None)
+        self.summary_label.setText(f'{running}/{len(self.rows)} nodes running')
+
+    def _on_row_activated(self, row, column):
+        self.host_activated.emit(self.table.item(row, self.COL_HOST).text())
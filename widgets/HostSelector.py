@@ -5,33 +5,20 @@ from PyQt5.QtWidgets import (
     QComboBox,
     QLabel,
     QPushButton,
-    QCheckBox
+    QCheckBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView
 )
-from PyQt5.QtCore import pyqtSignal, QThread, Qt
+from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtGui import QFont, QColor
-import subprocess
+from datetime import datetime
 
 from models.AnsibleHosts import AnsibleHostsManager
-
-class SSHCheckThread(QThread):
-    status_updated = pyqtSignal(str, bool)  # host, is_online
-
-    def __init__(self, host, ssh_command):
-        super().__init__()
-        self.host = host
-        self.ssh_command = ssh_command.split()  # Split into list of arguments
-
-    def run(self):
-        try:
-            # Try to connect with a timeout of 3 seconds
-            cmd = self.ssh_command + ['-o', 'ConnectTimeout=3', 'exit']
-            subprocess.run(cmd, capture_output=True, timeout=3)
-            self.status_updated.emit(self.host, True)
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            self.status_updated.emit(self.host, False)
-        except Exception as e:
-            print(f"SSH check error for {self.host}: {str(e)}")
-            self.status_updated.emit(self.host, False)
+from utils.const import FLEET_SCAN_WORKERS, FLEET_SCAN_TIMEOUT
+from utils.fleet_scanner import FleetScanner
+from widgets.SortableItem import SortableItem
 
 class StatusIndicator(QLabel):
     def __init__(self, parent=None):
@@ -55,12 +42,18 @@ class StatusIndicator(QLabel):
 class HostSelector(QWidget):
     host_selected = pyqtSignal(str)  # Emitted when a host is selected
     mode_changed = pyqtSignal(bool)  # Emitted when mode is changed (True for multi-host)
+    host_status_changed = pyqtSignal(str, bool)  # Emitted for every finished host check
+
+    STATUS_COLUMNS = ['Host', 'Status', 'Latency', 'Checked']
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.hosts_manager = AnsibleHostsManager()
-        self.status_threads = {}  # Keep track of status check threads
-        self.status_indicators = {}  # Keep track of status indicators
+        self.scanner = FleetScanner(max_workers=FLEET_SCAN_WORKERS, timeout=FLEET_SCAN_TIMEOUT, parent=self)
+        self.scanner.host_checked.connect(self._on_host_checked)
+        self.scanner.scan_finished.connect(self._update_scan_summary)
+        self.host_status = {}  # host -> is_online, from the last finished check
+        self.status_rows = {}  # host -> host name item of its row in the status table (rows move when sorted)
         self.initUI()
 
     def initUI(self):
@@ -109,6 +102,23 @@ class HostSelector(QWidget):
         
         host_layout.addLayout(controls_layout)
         layout.addLayout(host_layout)
+
+        # Fleet status, filled in as the host checks finish
+        self.scan_summary = QLabel("")
+        self.scan_summary.setFont(QFont("Courier New", 9))
+        layout.addWidget(self.scan_summary)
+
+        self.status_table = QTableWidget(0, len(self.STATUS_COLUMNS))
+        self.status_table.setHorizontalHeaderLabels(self.STATUS_COLUMNS)
+        self.status_table.setFont(QFont("Courier New", 9))
+        self.status_table.verticalHeader().setVisible(False)
+        self.status_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.status_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.status_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.status_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.status_table.setMaximumHeight(200)
+        self.status_table.cellDoubleClicked.connect(self._on_status_row_activated)
+        layout.addWidget(self.status_table)
         
         self.setLayout(layout)
         
@@ -121,6 +131,8 @@ class HostSelector(QWidget):
         self.host_combo.setVisible(False)
         self.refresh_button.setVisible(False)
         self.current_status.setVisible(False)
+        self.scan_summary.setVisible(False)
+        self.status_table.setVisible(False)
         
         # Load hosts
         self.refresh_hosts()
@@ -138,26 +150,95 @@ class HostSelector(QWidget):
             if index >= 0:
                 self.host_combo.setCurrentIndex(index)
         
-        # Start checking status for all hosts
+        self._reset_status_table(host_names)
+
+        # Check all hosts with a bounded number of concurrent ssh processes
+        hosts = {}
         for host in host_names:
-            self.check_host_status(host)
+            ssh_command = self.hosts_manager.get_ssh_command(host)
+            if ssh_command:
+                hosts[host] = ssh_command.split()
+        self.scanner.scan(hosts)
+        self._update_scan_summary()
 
     def check_host_status(self, host_name):
-        """Check if a host is online."""
-        if host_name in self.status_threads and self.status_threads[host_name].isRunning():
-            self.status_threads[host_name].terminate()
-        
+        """Check if a host is online. The result is reported by `host_status_changed`."""
         ssh_command = self.hosts_manager.get_ssh_command(host_name)
         if ssh_command:
-            thread = SSHCheckThread(host_name, ssh_command)
-            thread.status_updated.connect(self._on_status_updated)
-            self.status_threads[host_name] = thread
-            thread.start()
+            self._set_status_row(host_name, 'checking...')
+            self.scanner.check(host_name, ssh_command.split())
+
+    def is_checking(self, host_name):
+        """True while a status check of the host is queued or running."""
+        return self.scanner.is_checking(host_name)
+
+    def shutdown(self):
+        """Stop pending host checks."""
+        self.scanner.shutdown()
 
-    def _on_status_updated(self, host_name, is_online):
-        """Handle status update from the check thread."""
+    def _reset_status_table(self, host_names):
+        self.status_table.setSortingEnabled(False)
+        self.status_table.setRowCount(0)
+        self.status_rows = {}
+        self.host_status = {host: value for host, value in self.host_status.items() if host in host_names}
+        for host in host_names:
+            self._set_status_row(host, 'checking...')
+        self.status_table.setSortingEnabled(True)
+
+    def _set_status_row(self, host_name, status, latency=None, checked=''):
+        """Set the status of a host row, `latency` in seconds."""
+        sorting = self.status_table.isSortingEnabled()
+        self.status_table.setSortingEnabled(False)  # rows must not move while they are written
+        host_item = self.status_rows.get(host_name)
+        if host_item is None:
+            row = self.status_table.rowCount()
+            self.status_table.insertRow(row)
+            host_item = QTableWidgetItem(host_name)
+            self.status_table.setItem(row, 0, host_item)
+            self.status_table.setItem(row, 1, QTableWidgetItem(''))
+            self.status_table.setItem(row, 2, SortableItem(''))
+            self.status_table.setItem(row, 3, QTableWidgetItem(''))
+            self.status_rows[host_name] = host_item
+        row = self.status_table.row(host_item)
+        self.status_table.item(row, 1).setText(status)
+        self.status_table.item(row, 2).set(
+            f'{latency * 1000:.0f} ms' if latency is not None else '', latency
+        )
+        self.status_table.item(row, 3).setText(checked)
+        if status == 'online':
+            self.status_table.item(row, 1).setForeground(QColor("#4CAF50"))
+        elif status == 'offline':
+            self.status_table.item(row, 1).setForeground(QColor("#FF5252"))
+        self.status_table.setSortingEnabled(sorting)
+
+    def _on_host_checked(self, host_name, is_online, latency):
+        """Handle a finished host check (delivered on the GUI thread)."""
+        self.host_status[host_name] = is_online
+        self._set_status_row(
+            host_name,
+            'online' if is_online else 'offline',
+            latency=latency,
+            checked=datetime.now().strftime('%H:%M:%S'),
+        )
         if host_name == self.host_combo.currentText():
             self.current_status.set_status(is_online)
+        self._update_scan_summary()
+        self.host_status_changed.emit(host_name, is_online)
+
+    def _update_scan_summary(self):
+        total = len(self.status_rows)
+        checked = sum(1 for host in self.status_rows if host in self.host_status and not self.scanner.is_checking(host))
+        online = sum(1 for host in self.status_rows if self.host_status.get(host))
+        self.scan_summary.setText(f'Hosts: {online}/{total} online, {checked}/{total} checked')
+
+    def _on_status_row_activated(self, row, column):
+        self.select_host(self.status_table.item(row, 0).text())
+
+    def select_host(self, host_name):
+        """Make `host_name` the current host."""
+        index = self.host_combo.findText(host_name)
+        if index >= 0:
+            self.host_combo.setCurrentIndex(index)
 
     def get_current_host(self):
         """Get the currently selected host name."""
@@ -177,6 +258,8 @@ class HostSelector(QWidget):
         self.host_combo.setVisible(is_multi_host)
         self.refresh_button.setVisible(is_multi_host)
         self.current_status.setVisible(is_multi_host)
+        self.scan_summary.setVisible(is_multi_host)
+        self.status_table.setVisible(is_multi_host)
         self.mode_changed.emit(is_multi_host)
 
     def get_ssh_command(self, host_name: str) -> str:
@@ -342,4 +425,19 @@ class HostSelector(QWidget):
         self.mode_checkbox.setStyleSheet(checkbox_style)
         self.host_combo.setStyleSheet(combobox_style)
         self.refresh_button.setStyleSheet(button_style)
+        self.scan_summary.setStyleSheet(f"color: {text_color};")
+        self.status_table.setStyleSheet(f"""
+            QTableWidget {{
+                color: {text_color};
+                background-color: {bg_color};
+                border: 1px solid {border_color};
+                gridline-color: {border_color};
+            }}
+            QHeaderView::section {{
+                color: {text_color};
+                background-color: {hover_color};
+                border: none;
+                padding: 2px;
+            }}
+        """)
         self.host_label.setStyleSheet(f"color: {text_color};") 
\ No newline at end of file
@@ -0,0 +1,108 @@
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QHeaderView,
+    QAbstractItemView
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+from utils.instrumentation import instrumentation
+from utils.startup import startup_profiler
+from widgets.SortableItem import SortableItem
+
+
+class PerformancePanel(QDialog):
+    """Debug view of the operation timings collected by `utils.instrumentation`."""
+
+    COLUMNS = ['Operation', 'Calls', 'Errors', 'p50', 'p95', 'p99', 'Max', 'Total']
+    TIME_COLUMNS = ['p50', 'p95', 'p99', 'max', 'total']
+
+    def __init__(self, report_path, refresh_interval: int = 2000, parent=None):
+        super().__init__(parent)
+        self.report_path = report_path
+        self.timer = QTimer(self)
+        self.timer.setInterval(refresh_interval)
+        self.timer.timeout.connect(self.refresh)
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle('Performance')
+        self.resize(900, 500)
+        layout = QVBoxLayout(self)
+
+        self.startup_label = QLabel('')
+        self.startup_label.setFont(QFont("Courier New", 10))
+        self.startup_label.setWordWrap(True)
+        layout.addWidget(self.startup_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setFont(QFont("Courier New", 10))
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        layout.addWidget(self.table)
+
+        self.gauges_label = QLabel('')
+        self.gauges_label.setFont(QFont("Courier New", 10))
+        layout.addWidget(self.gauges_label)
+
+        buttons = QHBoxLayout()
+        self.status_label = QLabel('')
+        buttons.addWidget(self.status_label)
+        buttons.addStretch()
+        reset_button = QPushButton('Reset')
+        reset_button.clicked.connect(self.reset)
+        buttons.addWidget(reset_button)
+        save_button = QPushButton('Save JSON report')
+        save_button.clicked.connect(self.save)
+        buttons.addWidget(save_button)
+        layout.addLayout(buttons)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
+
+    def refresh(self):
+        self.startup_label.setText(startup_profiler.report())
+        summary = instrumentation.summary()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(summary))
+        for row, (name, stats) in enumerate(summary.items()):
+            items = [SortableItem(name, name), SortableItem(str(stats['count']), stats['count']),
+                     SortableItem(str(stats['errors']), stats['errors'])]
+            items += [SortableItem(self._format_seconds(stats[key]), stats[key]) for key in self.TIME_COLUMNS]
+            for column, item in enumerate(items):
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        gauges = ', '.join(
+            f"{name} {gauge['value']:g} (max {gauge['max']:g})" for name, gauge in instrumentation.gauges().items()
+        )
+        self.gauges_label.setText(gauges)
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def save(self):
+        instrumentation.save(self.report_path, startup=startup_profiler.to_dict())
+        self.status_label.setText(f'Saved to {self.report_path}')
+
+    @staticmethod
+    def _format_seconds(seconds: float) -> str:
+        return f'{seconds * 1000:.1f}ms' if seconds < 1 else f'{seconds:.2f}s'
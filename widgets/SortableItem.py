@@ -0,0 +1,20 @@
+from PyQt5.QtWidgets import QTableWidgetItem
+from PyQt5.QtCore import Qt
+
+
+class SortableItem(QTableWidgetItem):
+    """Table item sorted by the value stored in `Qt.UserRole` (numbers, not their text)."""
+
+    def __init__(self, text: str = '', sort_value=None):
+        super().__init__(text)
+        self.set(text, sort_value)
+
+    def set(self, text: str, sort_value=None):
+        self.setText(text)
+        self.setData(Qt.UserRole, sort_value if sort_value is not None else -1)
+
+    def __lt__(self, other):
+        try:
+            return self.data(Qt.UserRole) < other.data(Qt.UserRole)
+        except TypeError:
+            return super().__lt__(other)